@@ -5,7 +5,7 @@ from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import TypedDict
 
-from _hydrogenlib_core.utils import InstanceMapping
+from _hydrogenlib_core.utils import InstanceStorage
 
 
 class ExtraMode(str, enum.Enum):
@@ -65,20 +65,26 @@ class Field:
         self.type = type
         self.default = default
 
-        self._mapping = InstanceMapping()
+        self.__instance_storage__ = InstanceStorage(name)  # 值保存在模型实例上
+        self._load = self.__instance_storage__.load  # 读取的快速路径
         self._validator = None
 
+    def __set_name__(self, owner, name):
+        self._load = self.__instance_storage__.bind(owner, name).load
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
-
-        return self._mapping.get(instance, self.default)
+        try:
+            return self._load(instance)
+        except AttributeError:
+            return self.default
 
     def __set__(self, instance, value):
         if self.validator:
             value = self.validator(value)
 
-        self._mapping[instance] = self.validate(value)
+        self.__instance_storage__.set(instance, self.validate(value))
 
 
 class BaseModelConfig(TypedDict):
@@ -32,6 +32,7 @@ class BaseModel:
 
             # 无事发生时
             setattr(cls, field.name, field)  # 将描述符填充到类中
+            field.__set_name__(cls, field.name)  # 绑定实例存储
             model.fields[field.name] = field  # 还有这个
 
         for field in annotations:
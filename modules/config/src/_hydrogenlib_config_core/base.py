@@ -67,6 +67,7 @@ class ConfigBase:
 
             cls.__config_alias__[field_info.key] = name  # 纪录别名和配置名的映射
             setattr(cls, name, field)  # 写入到类中
+            field.__set_name__(cls, name)  # setattr 不会调用 __set_name__, 手动绑定实例存储
             cls.__config_fields__[name] = field  # 在 fields 中纪录
 
 
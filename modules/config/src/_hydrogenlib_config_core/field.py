@@ -5,7 +5,7 @@ import dataclasses
 from typing import Any, Callable
 
 from _hydrogenlib_core.typefunc import AutoSlots
-from _hydrogenlib_core.utils import InstanceMapping
+from _hydrogenlib_core.utils import InstanceStorage
 from .type_registry import validate
 
 
@@ -34,18 +34,23 @@ class FieldInfo:
 
 class Field(AutoSlots):
     info: FieldInfo
-    values: InstanceMapping[Any, Any]
+    __instance_storage__: InstanceStorage  # 值保存在容器实例上, 描述符只负责访问和验证
+    _load: Callable  # InstanceStorage.load, 读取的快速路径
 
     def __init__(self, field_info: FieldInfo):
         super().__init__()
         self.info = field_info
-        self.values = InstanceMapping()
+        self.__instance_storage__ = InstanceStorage(field_info.name)
+        self._load = self.__instance_storage__.load
+
+    def __set_name__(self, owner, name):
+        self._load = self.__instance_storage__.bind(owner, name).load
 
     def value(self, instance, value=...):
         if value is ...:
-            return self.values.get(instance)
+            return self.__instance_storage__.get(instance)
         else:
-            self.values[instance] = value
+            self.__instance_storage__.set(instance, value)
             return None
 
     @property
@@ -64,8 +69,10 @@ class Field(AutoSlots):
     def __get__(self, instance, owner):
         if instance is None:
             return self
-
-        return self.value(instance)
+        try:
+            return self._load(instance)
+        except AttributeError:
+            return None
 
     def __set__(self, instance, value):
         info = self.info
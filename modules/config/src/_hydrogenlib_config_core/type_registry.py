@@ -8,12 +8,12 @@ from typing import Callable, overload, Any, Generator
 
 from _hydrogenlib_core.data_structures import Stack
 from _hydrogenlib_core.typefunc import split_type, get_origin
-from _hydrogenlib_core.utils import InstanceMapping
+from _hydrogenlib_core.utils import IdentityMap
 
-IMP = InstanceMapping
+IMP = IdentityMap
 type Validator[DataType, TargetType, *subtypes] = Callable[[DataType, TargetType, tuple[*subtypes]], TargetType]
 type TypeRegistryDataStructure = \
-    InstanceMapping[type, InstanceMapping[type, dict[tuple[type, ...], ValidatorMetadata]]]
+    IdentityMap[type, IdentityMap[type, dict[tuple[type, ...], ValidatorMetadata]]]
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
@@ -35,7 +35,7 @@ class TypeRegistry:
     __slots__ = ("_registry", "_validators_no_source_type", "_default_validator")
 
     def __init__(self):
-        self._validators_no_source_type: InstanceMapping[
+        self._validators_no_source_type: IdentityMap[
             type,
             dict[tuple[type, ...], ValidatorMetadata]
         ]
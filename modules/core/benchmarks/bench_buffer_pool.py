@@ -0,0 +1,118 @@
+"""
+每次分配新缓冲区与从 BufferPool 借用缓冲区的耗时对比 (每次操作的纳秒数)
+
+- alloc: bytearray(size) 与 acquire + release
+- recv: sock.recv(size) 与 sock.recv_into(租约)
+- struct: Struct.pack 与 Struct.pack_into(租约)
+pooled 表示每次操作都借出并归还; held lease 表示一直持有同一个租约反复使用 (完全不分配),
+这是 asyncsocket.recv_into / pack_into 推荐的用法。小缓冲区每次借还比直接分配慢, 池只在持有租约或大缓冲区时有收益。
+
+    python benchmarks/bench_buffer_pool.py [ops]
+"""
+import gc
+import socket
+import struct
+import sys
+import time
+
+from _hydrogenlib_core.utils.object_pool import BufferPool
+
+
+def timed(func, ops):
+    gc.collect()
+    start = time.perf_counter_ns()
+    func()
+    return (time.perf_counter_ns() - start) / ops
+
+
+def bench_alloc(pool, size, ops):
+    def fresh():
+        for _ in range(ops):
+            bytearray(size)
+
+    def pooled():
+        acquire = pool.acquire
+        for _ in range(ops):
+            acquire(size).release()
+
+    return timed(fresh, ops), timed(pooled, ops), float('nan')
+
+
+def bench_recv(pool, size, ops):
+    a, b = socket.socketpair()
+    payload = b'x' * size
+
+    def fresh():
+        for _ in range(ops):
+            a.sendall(payload)
+            b.recv(size)
+
+    def pooled():
+        acquire = pool.acquire
+        for _ in range(ops):
+            a.sendall(payload)
+            lease = acquire(size)
+            b.recv_into(lease.view)
+            lease.release()
+
+    def held():
+        # 连接整个生命周期持有一个租约, 每次接收都复用
+        lease = pool.acquire(size)
+        view = lease.view
+        for _ in range(ops):
+            a.sendall(payload)
+            b.recv_into(view)
+        lease.release()
+
+    try:
+        return timed(fresh, ops), timed(pooled, ops), timed(held, ops)
+    finally:
+        a.close()
+        b.close()
+
+
+def bench_struct(pool, ops):
+    s = struct.Struct('<iIdq16s')
+    values = (1, 2, 3.0, 4, b'abcdefgh')
+
+    def fresh():
+        pack = s.pack
+        for _ in range(ops):
+            pack(*values)
+
+    def pooled():
+        pack_into, acquire, size = s.pack_into, pool.acquire, s.size
+        for _ in range(ops):
+            lease = acquire(size)
+            pack_into(lease.view, 0, *values)
+            lease.release()
+
+    def held():
+        pack_into = s.pack_into
+        lease = pool.acquire(s.size)
+        view = lease.view
+        for _ in range(ops):
+            pack_into(view, 0, *values)
+        lease.release()
+
+    return timed(fresh, ops), timed(pooled, ops), timed(held, ops)
+
+
+def main(ops=200_000):
+    pool = BufferPool()
+    rows = []
+    for size in (512, 4096, 65536):
+        rows.append((f'alloc {size}', *bench_alloc(pool, size, ops)))
+    for size in (512, 4096, 65536):
+        rows.append((f'recv {size}', *bench_recv(pool, size, ops // 10)))
+    rows.append(('struct pack', *bench_struct(pool, ops)))
+
+    print(f"ops={ops}, ns/op")
+    print(f"{'operation':16}{'allocate':>12}{'pooled':>12}{'held lease':>12}")
+    for name, fresh, pooled, held in rows:
+        print(f"{name:16}{fresh:>12.1f}{pooled:>12.1f}{held:>12.1f}")
+    print(pool.stats)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
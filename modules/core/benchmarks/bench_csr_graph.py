@@ -0,0 +1,75 @@
+"""
+CSRGraph 与 GraphBase (dict-of-sets) 的内存与遍历性能对比
+
+    python benchmarks/bench_csr_graph.py [vertices] [edges_per_vertex]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from _hydrogenlib_core.data_structures import CSRGraph, GraphBase
+
+
+def make_edges(n, degree, seed=0):
+    rnd = random.Random(seed)
+    return [(i, rnd.randrange(n)) for i in range(n) for _ in range(degree)]
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return graph, elapsed, current, peak
+
+
+def traverse(graph):
+    start = time.perf_counter()
+    count = 0
+    for v in graph.vertices:
+        for _ in graph.children(v):
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def traverse_ids(graph: CSRGraph):
+    start = time.perf_counter()
+    count = 0
+    for i in range(graph.num_vertices):
+        for _ in graph.children_ids(i):
+            count += 1
+    return count, time.perf_counter() - start
+
+
+def main(n=200_000, degree=5):
+    edges = make_edges(n, degree)
+
+    def build_dict():
+        g = GraphBase()
+        for left, right in edges:
+            g.add_edge(left, right)
+        return g
+
+    dict_graph, dict_build, dict_mem, dict_peak = measure(build_dict)
+    csr_graph, csr_build, csr_mem, csr_peak = measure(lambda: CSRGraph.from_edges(edges))
+
+    print(f"vertices={n} edges={len(edges)}")
+    print(f"{'':12}{'build(s)':>10}{'memory(MB)':>12}{'peak(MB)':>10}{'traverse(s)':>13}")
+
+    for name, graph, build, mem, peak in (
+            ('dict-of-set', dict_graph, dict_build, dict_mem, dict_peak),
+            ('csr', csr_graph, csr_build, csr_mem, csr_peak),
+    ):
+        _, t = traverse(graph)
+        print(f"{name:12}{build:>10.3f}{mem / 2 ** 20:>12.1f}{peak / 2 ** 20:>10.1f}{t:>13.3f}")
+
+    _, t = traverse_ids(csr_graph)
+    print(f"{'csr (ids)':12}{'':>10}{csr_graph.nbytes / 2 ** 20:>12.1f}{'':>10}{t:>13.3f}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
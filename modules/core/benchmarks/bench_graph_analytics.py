@@ -0,0 +1,40 @@
+"""
+graph_analytics 在随机稀疏图上的耗时
+
+    python benchmarks/bench_graph_analytics.py [vertices] [edges]
+"""
+import random
+import sys
+import time
+
+from _hydrogenlib_core.data_structures import (
+    CSRGraph, bfs_levels, in_degree_centrality, out_degree_centrality, pagerank
+)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(vertices=1_000_000, edges=5_000_000):
+    rnd = random.Random(0)
+    build = time.perf_counter()
+    graph = CSRGraph.from_edges(
+        ((rnd.randrange(vertices), rnd.randrange(vertices)) for _ in range(edges)), range(vertices)
+    )
+    print(f"vertices={vertices} edges={graph.num_edges} build={time.perf_counter() - build:.3f}s")
+
+    rows = [
+        ('pagerank', timed(lambda: pagerank(graph))),
+        ('in_degree_centrality', timed(lambda: in_degree_centrality(graph))),
+        ('out_degree_centrality', timed(lambda: out_degree_centrality(graph))),
+        ('bfs_levels(3 sources)', timed(lambda: bfs_levels(graph, [0, 1, 2]))),
+    ]
+    for name, seconds in rows:
+        print(f"{name:24}{seconds:>10.4f}s")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
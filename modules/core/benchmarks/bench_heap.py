@@ -0,0 +1,73 @@
+"""
+IndexedHeap 与 Heap 的性能对比
+
+Heap 没有句柄, 修改优先级只能 remove (O(n) 查找) + insert;
+IndexedHeap 通过句柄在 O(log n) 内完成 update / remove。
+
+    python benchmarks/bench_heap.py [size] [operations]
+"""
+import random
+import sys
+import time
+
+from _hydrogenlib_core.data_structures import Heap, IndexedHeap
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(size=100_000, operations=2_000):
+    rnd = random.Random(0)
+    values = [rnd.random() for _ in range(size)]
+
+    heap = Heap()
+    indexed = IndexedHeap()
+    handles = []
+
+    rows = [
+        ('push', timed(lambda: [heap.insert(v) for v in values]),
+         timed(lambda: handles.extend(indexed.push(v) for v in values))),
+        ('heapify', timed(lambda: Heap(list(values))),
+         timed(lambda: IndexedHeap.heapify(values))),
+        ('nsmallest(100)', timed(lambda: list(zip(range(100), heap.iter()))),
+         timed(lambda: list(indexed.nsmallest(100)))),
+    ]
+
+    targets = rnd.sample(range(size), operations)
+
+    def heap_update():
+        for i in targets:
+            old = values[i]
+            heap.remove(old)
+            heap.insert(old / 2)
+
+    def indexed_update():
+        for i in targets:
+            handle = handles[i]
+            indexed.update(handle, handle.priority / 2)
+
+    rows.append((f'update x{operations}', timed(heap_update), timed(indexed_update)))
+
+    def heap_remove():
+        for v in rnd.sample(heap.heap, operations):
+            heap.remove(v)
+
+    def indexed_remove():
+        for handle in rnd.sample([h for h in handles if h.valid], operations):
+            indexed.remove(handle)
+
+    rows.append((f'remove x{operations}', timed(heap_remove), timed(indexed_remove)))
+    rows.append(('pop all', timed(lambda: [heap.extract_min() for _ in range(len(heap))]),
+                 timed(lambda: [indexed.pop() for _ in range(len(indexed))])))
+
+    print(f"size={size}")
+    print(f"{'':18}{'Heap(s)':>10}{'IndexedHeap(s)':>16}")
+    for name, a, b in rows:
+        print(f"{name:18}{a:>10.4f}{b:>16.4f}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
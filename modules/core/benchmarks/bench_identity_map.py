@@ -0,0 +1,85 @@
+"""
+InstanceMapping 与 IdentityMap 各操作的耗时对比 (每次操作的纳秒数)
+
+    python benchmarks/bench_identity_map.py [entries]
+"""
+import gc
+import sys
+import time
+
+from _hydrogenlib_core.utils.instance_mapping import IdentityMap, InstanceMapping
+
+
+class Obj:
+    pass
+
+
+def timed(func, ops):
+    gc.collect()
+    start = time.perf_counter_ns()
+    func()
+    return (time.perf_counter_ns() - start) / ops
+
+
+def run(cls, entries):
+    objs = [Obj() for _ in range(entries)]
+    missing = [Obj() for _ in range(entries)]
+    mapping = cls()
+    results = {}
+
+    def set_new():
+        for o in objs:
+            mapping[o] = 1
+
+    def set_existing():
+        for o in objs:
+            mapping[o] = 2
+
+    def getitem():
+        for o in objs:
+            mapping[o]
+
+    def get_missing():
+        for o in missing:
+            mapping.get(o)
+
+    def contains():
+        for o in objs:
+            o in mapping
+
+    def iterate_items():
+        for _ in mapping.items():
+            pass
+
+    def delete():
+        for o in objs[: entries // 2]:
+            del mapping[o]
+
+    results['set (new)'] = timed(set_new, entries)
+    results['set (existing)'] = timed(set_existing, entries)
+    results['__getitem__'] = timed(getitem, entries)
+    results['get (missing)'] = timed(get_missing, entries)
+    results['__contains__'] = timed(contains, entries)
+    results['items()'] = timed(iterate_items, entries)
+    results['__delitem__'] = timed(delete, entries // 2)
+
+    def collect_dead():
+        del objs[:]  # 剩下的键全部被回收, 条目由弱引用回调删除
+        len(mapping)
+
+    results['dead-key cleanup'] = timed(collect_dead, entries - entries // 2)
+    return results, len(mapping)
+
+
+def main(entries=200_000):
+    old, old_left = run(InstanceMapping, entries)
+    new, new_left = run(IdentityMap, entries)
+    print(f"entries={entries}, ns/op")
+    print(f"{'operation':20}{'InstanceMapping':>18}{'IdentityMap':>14}{'speedup':>10}")
+    for name in old:
+        print(f"{name:20}{old[name]:>18.1f}{new[name]:>14.1f}{old[name] / new[name]:>9.1f}x")
+    print(f"{'entries left':20}{old_left:>18}{new_left:>14}  (after all keys were collected)")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
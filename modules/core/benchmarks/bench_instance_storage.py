@@ -0,0 +1,143 @@
+"""
+描述符属性读写的耗时对比 (每次操作的纳秒数)
+
+before: 值保存在描述符持有的 IdentityMap 中 (改动前 Field / lazy_property 的做法)
+after: 值通过 InstanceStorage 保存在实例上 (__dict__ 或生成的槽); 普通属性作为参照
+
+    python benchmarks/bench_instance_storage.py [instances] [rounds]
+"""
+import gc
+import sys
+import time
+
+from _hydrogenlib_core.utils import IdentityMap, InstanceStorage, InstanceStorageMeta, lazy_attribute, lazy_property
+
+
+class MapField:
+    """
+    改动前的写法: 以实例为键的 IdentityMap
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self.values = IdentityMap()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self.values.get(instance, self.default)
+
+    def __set__(self, instance, value):
+        if not isinstance(value, int):
+            raise TypeError(value)
+        self.values[instance] = value
+
+
+class StorageField:
+    """
+    改动后的写法: 描述符只负责验证和访问
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self.__instance_storage__ = InstanceStorage()
+
+    def __set_name__(self, owner, name):
+        self._load = self.__instance_storage__.bind(owner, name).load
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return self._load(instance)
+        except AttributeError:
+            return self.default
+
+    def __set__(self, instance, value):
+        if not isinstance(value, int):
+            raise TypeError(value)
+        self.__instance_storage__.set(instance, value)
+
+
+class Plain:
+    def __init__(self):
+        self.x = 0
+
+
+class Before:
+    x = MapField(0)
+
+
+class AfterDict:
+    x = StorageField(0)
+
+
+class AfterSlot(metaclass=InstanceStorageMeta):
+    __slots__ = ('__weakref__',)
+    x = StorageField(0)
+
+
+class LazyBefore:
+    @property
+    def x(self):
+        return 0
+
+
+def _compute(self):
+    return 0
+
+
+class LazyAfter:
+    x = lazy_property(_compute)
+
+
+class LazyAttribute:
+    x = lazy_attribute(_compute)
+
+
+def timed(func, ops):
+    gc.collect()
+    start = time.perf_counter_ns()
+    func()
+    return (time.perf_counter_ns() - start) / ops
+
+
+def run(cls, instances, rounds):
+    objs = [cls() for _ in range(instances)]
+    ops = instances * rounds
+
+    def write():
+        for _ in range(rounds):
+            for o in objs:
+                o.x = 1
+
+    def read():
+        for _ in range(rounds):
+            for o in objs:
+                o.x
+
+    write_ns = timed(write, ops) if cls not in (LazyBefore, LazyAfter, LazyAttribute) else float('nan')
+    return write_ns, timed(read, ops)
+
+
+def main(instances=10_000, rounds=50):
+    rows = [
+        ('plain attribute', Plain),
+        ('IdentityMap field', Before),
+        ('storage (dict)', AfterDict),
+        ('storage (slot)', AfterSlot),
+        ('property (uncached)', LazyBefore),
+        ('lazy_property', LazyAfter),
+        ('lazy_attribute', LazyAttribute),
+    ]
+    print(f"instances={instances}, rounds={rounds}, ns/op")
+    print(f"{'attribute':20}{'write':>10}{'read':>10}")
+    for name, cls in rows:
+        write, read = run(cls, instances, rounds)
+        print(f"{name:20}{write:>10.1f}{read:>10.1f}")
+    for name, cls in rows[2:4]:
+        print(f"{name} mode: {cls.__dict__['x'].__instance_storage__.mode}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
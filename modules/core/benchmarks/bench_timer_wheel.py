@@ -0,0 +1,58 @@
+"""
+时间轮挂起大量定时器时的内存占用与速度
+
+object 存储每个任务一个 TaskData + Task; compact 存储使用结构数组 (CompactWheelCore),
+add_keyed 不创建任何包装对象。
+
+    python benchmarks/bench_timer_wheel.py [timers]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from _hydrogenlib_core.utils.timer_wheel import HierarchicalWheel
+
+
+def on_timeout(key):
+    pass
+
+
+def measure(name, fill, timers):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    wheel, handles = fill(timers)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:22}{size / timers:>10.1f} B/timer{elapsed:>10.3f}s")
+    return wheel, handles
+
+
+def object_tasks(timers):
+    wheel = HierarchicalWheel()
+    return wheel, [wheel.add_task(on_timeout, (i,), delay=30_000 + i % 60_000) for i in range(timers)]
+
+
+def compact_tasks(timers):
+    wheel = HierarchicalWheel(storage='compact')
+    return wheel, [wheel.add_task(on_timeout, (i,), delay=30_000 + i % 60_000) for i in range(timers)]
+
+
+def compact_keyed(timers):
+    wheel = HierarchicalWheel(storage='compact')
+    return wheel, [wheel.add_keyed(on_timeout, i, delay=30_000 + i % 60_000) for i in range(timers)]
+
+
+def main(timers=1_000_000):
+    print(f"timers={timers} (memory includes the int keys and the returned handles)")
+    for name, fill in (('object add_task', object_tasks),
+                       ('compact add_task', compact_tasks),
+                       ('compact add_keyed', compact_keyed)):
+        wheel, handles = measure(name, fill, timers)
+        del wheel, handles
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -1,5 +1,14 @@
 from .graph import *
+from .graph_algorithms import *
+from .interning import *
+from .disjoint_set import *
+from .reachability import *
+from .graph_analytics import *
+from .incremental_order import *
+from .shortest_path import *
+from .csr_graph import *
 from .heap import *
+from .count_min_sketch import *
+from .priority_queue import *
 from .stack import *
 from .vis_structure import *
-
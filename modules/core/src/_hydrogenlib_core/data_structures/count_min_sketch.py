@@ -0,0 +1,64 @@
+from typing import Hashable
+
+_MASK64 = 0xFFFF_FFFF_FFFF_FFFF
+_SEEDS = (
+    0x9E37_79B9_7F4A_7C15, 0xC2B2_AE3D_27D4_EB4F, 0x1656_67B1_9E37_79F9, 0x27D4_EB2F_1656_67C5,
+    0xFF51_AFD7_ED55_8CCD, 0xC4CE_B9FE_1A85_EC53, 0x94D0_49BB_1331_11EB, 0xBF58_476D_1CE4_E5B9,
+)  # 乘法哈希使用的奇数常量
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class CountMinSketch:
+    """
+    Count-Min 频率草图: 用 depth 行、每行 width 个小计数器近似统计元素出现的次数, 估计值只会偏大
+
+    计数器保存在 bytearray 中, 上限为 max_count; 采用保守更新 (只增加最小的计数器)。
+    累计加入 sample_size 次后所有计数器减半 (老化), 使频率反映最近的访问。
+    """
+    __slots__ = ('width', 'depth', 'max_count', 'sample_size', '_shift', '_tables', '_additions')
+
+    def __init__(self, width: int = 1024, depth: int = 4, max_count: int = 15, sample_size: int = None):
+        if not 1 <= depth <= len(_SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(_SEEDS)}")
+        bits = max(4, (width - 1).bit_length())  # 宽度取 2 的幂
+        self.width = 1 << bits
+        self.depth = depth
+        self.max_count = min(max_count, 255)
+        self.sample_size = sample_size or 10 * self.width
+        self._shift = 64 - bits
+        self._tables = [bytearray(self.width) for _ in range(depth)]
+        self._additions = 0
+
+    def _indexes(self, item):
+        h = hash(item) & _MASK64
+        shift = self._shift
+        return [((h * seed) & _MASK64) >> shift for seed in _SEEDS[:self.depth]]
+
+    def increment(self, item: Hashable):
+        indexes = self._indexes(item)
+        tables = self._tables
+        low = min(table[i] for table, i in zip(tables, indexes))
+        if low < self.max_count:
+            for table, i in zip(tables, indexes):
+                if table[i] == low:
+                    table[i] = low + 1
+
+        self._additions += 1
+        if self._additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, item: Hashable) -> int:
+        return min(table[i] for table, i in zip(self._tables, self._indexes(item)))
+
+    def age(self):
+        """
+        所有计数器减半
+        """
+        for table in self._tables:
+            table[:] = table.translate(_HALVE)
+        self._additions //= 2
+
+    def clear(self):
+        for table in self._tables:
+            table[:] = bytes(self.width)
+        self._additions = 0
@@ -0,0 +1,286 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Hashable, Iterable
+
+from .graph import GraphBase, WeightedGraph
+
+
+class CSRGraph[T: Hashable](GraphBase[T]):
+    """
+    压缩稀疏行 (CSR) 存储的不可变有向图
+
+    顶点被映射为 0..n-1 的整数编号, 第 i 个顶点的出边目标为
+    ``targets[offsets[i]:offsets[i + 1]]`` (按编号升序, 无重复边)。
+    相比 ``GraphBase`` 的 dict-of-sets, 每条边只占用一个 8 字节整数。
+
+    保持 ``vertices`` / ``edges`` / ``children`` / ``topological_sorted`` 等接口不变,
+    所有修改操作都会抛出 ``TypeError``。
+    """
+
+    def __init__(self, vertices: Iterable[T] = (), offsets: array = None, targets: array = None, weights=None):
+        self._vertices = tuple(vertices)
+        self._index = {v: i for i, v in enumerate(self._vertices)}
+
+        self.offsets = offsets if offsets is not None else array('q', bytes(8 * (len(self._vertices) + 1)))
+        self.targets = targets if targets is not None else array('q')
+        self.weights = weights  # type: array | list | None
+        self._rows = None  # int_view 的缓存
+
+        if len(self.offsets) != len(self._vertices) + 1:
+            raise ValueError('offsets must have len(vertices) + 1 items')
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple], vertices: Iterable[T] = ()):
+        """
+        从边列表批量构建图
+        :param edges: (left, right) 或 (left, right, weight) 形式的边
+        :param vertices: 额外的 (可能孤立的) 顶点, 决定编号的先后顺序
+        """
+        index = {}
+        verts = []
+
+        for v in vertices:
+            if v not in index:
+                index[v] = len(verts)
+                verts.append(v)
+
+        src = array('q')
+        dst = array('q')
+        wts = None
+
+        for edge in edges:
+            left, right = edge[0], edge[1]
+
+            i = index.get(left)
+            if i is None:
+                i = index[left] = len(verts)
+                verts.append(left)
+
+            j = index.get(right)
+            if j is None:
+                j = index[right] = len(verts)
+                verts.append(right)
+
+            if len(edge) > 2:
+                if wts is None:
+                    wts = [None] * len(src)  # 之前的边没有权重
+                wts.append(edge[2])
+            elif wts is not None:
+                wts.append(None)
+
+            src.append(i)
+            dst.append(j)
+
+        offsets, targets, weights = cls._compress(len(verts), src, dst, wts)
+        return cls(verts, offsets, targets, weights)
+
+    @classmethod
+    def from_graph(cls, graph: GraphBase[T]):
+        """
+        从已有的 GraphBase / WeightedGraph 构建图, WeightedGraph 的权重会被保留
+        """
+        if isinstance(graph, CSRGraph):
+            return graph  # 不可变, 无需复制
+
+        verts = list(graph.vertices)
+        index = {v: i for i, v in enumerate(verts)}
+
+        src = array('q')
+        dst = array('q')
+        wts = [] if isinstance(graph, WeightedGraph) else None
+
+        for i, v in enumerate(verts):
+            if wts is not None:
+                for child, weight in graph.graph[v].items():
+                    src.append(i)
+                    dst.append(index[child])
+                    wts.append(weight)
+            else:
+                for child in graph.children(v):
+                    src.append(i)
+                    dst.append(index[child])
+
+        offsets, targets, weights = cls._compress(len(verts), src, dst, wts)
+        return cls(verts, offsets, targets, weights)
+
+    @staticmethod
+    def _compress(n, src, dst, wts):
+        """
+        将 (src, dst) 边对压缩为 offsets/targets, 同一行内按目标编号排序并去重
+        重复边的权重以最后出现的为准 (与 dict 覆盖的语义一致)
+        """
+        offsets = array('q', bytes(8 * (n + 1)))
+
+        if wts is None:
+            keys = sorted({s * n + d for s, d in zip(src, dst)})
+            targets = array('q', [k % n for k in keys])
+            for k in keys:
+                offsets[k // n + 1] += 1
+            weights = None
+
+        else:
+            keys = [s * n + d for s, d in zip(src, dst)]
+            targets = array('q')
+            weights = []
+            last = -1
+
+            for k in sorted(range(len(keys)), key=keys.__getitem__):  # 稳定排序, 重复边保持插入顺序
+                key = keys[k]
+                if key == last:
+                    weights[-1] = wts[k]
+                    continue
+
+                last = key
+                targets.append(key % n)
+                offsets[key // n + 1] += 1
+                weights.append(wts[k])
+
+            try:
+                weights = array('d', weights)
+            except TypeError:
+                pass  # 存在非数值权重, 保留为列表
+
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        return offsets, targets, weights
+
+    # 整数编号接口
+
+    def index_of(self, vertex: T) -> int:
+        return self._index[vertex]
+
+    def vertex_at(self, index: int) -> T:
+        return self._vertices[index]
+
+    def children_ids(self, index: int) -> memoryview:
+        """
+        返回编号为 index 的顶点的出边目标编号 (零拷贝视图)
+        """
+        return memoryview(self.targets)[self.offsets[index]:self.offsets[index + 1]]
+
+    @property
+    def interned(self) -> bool:
+        return True  # 顶点天然是整数编号
+
+    def int_view(self) -> tuple[tuple[T, ...], list[array]]:
+        """
+        返回 (按编号排列的顶点, 每个顶点的出边目标编号), 供整数化的遍历算法使用
+        """
+        if self._rows is None:
+            offsets, targets = self.offsets, self.targets
+            self._rows = [targets[offsets[i]:offsets[i + 1]] for i in range(len(self._vertices))]
+        return self._vertices, self._rows
+
+    # GraphBase 接口
+
+    @property
+    def vertices(self) -> tuple[T, ...]:
+        return self._vertices
+
+    @property
+    def edges(self) -> list[tuple[T, T]]:
+        verts = self._vertices
+        offsets = self.offsets
+        targets = self.targets
+        return [
+            (verts[i], verts[targets[k]])
+            for i in range(len(verts))
+            for k in range(offsets[i], offsets[i + 1])
+        ]
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self._vertices)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        offsets / targets / weights 数组占用的字节数 (不含顶点对象本身)
+        """
+        size = self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets)
+        if isinstance(self.weights, array):
+            size += self.weights.itemsize * len(self.weights)
+        return size
+
+    def children(self, vertex: T) -> tuple[T, ...]:
+        i = self._index.get(vertex)
+        if i is None:
+            return ()
+        verts = self._vertices
+        return tuple(verts[t] for t in self.targets[self.offsets[i]:self.offsets[i + 1]])
+
+    def weighted_children(self, vertex: T):
+        i = self._index.get(vertex)
+        if i is None:
+            return ()
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        verts = self._vertices
+        children = (verts[t] for t in self.targets[lo:hi])
+        if self.weights is None:
+            return ((child, None) for child in children)
+        return zip(children, self.weights[lo:hi])
+
+    def out_degree(self, vertex: T) -> int:
+        i = self._index[vertex]
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def exists(self, vertex):
+        return vertex in self._index
+
+    def _edge_position(self, left, right):
+        i = self._index.get(left)
+        j = self._index.get(right)
+        if i is None or j is None:
+            return None
+
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        k = bisect_left(self.targets, j, lo, hi)  # 行内有序, 二分查找
+        if k < hi and self.targets[k] == j:
+            return k
+        return None
+
+    def has_edge(self, left: T, right: T) -> bool:
+        return self._edge_position(left, right) is not None
+
+    def get_weight(self, left: T, right: T) -> Any:
+        if self.weights is None:
+            return None
+        k = self._edge_position(left, right)
+        return None if k is None else self.weights[k]
+
+    def to_graph(self) -> GraphBase[T]:
+        """
+        转换回可修改的 GraphBase (带权重时为 WeightedGraph)
+        """
+        verts = self._vertices
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        if weights is None:
+            g = GraphBase()
+            g.add_vertex(*verts)
+            for i, v in enumerate(verts):
+                g.graph[v].update(verts[t] for t in targets[offsets[i]:offsets[i + 1]])
+        else:
+            g = WeightedGraph()
+            g.add_vertex(*verts)
+            for i, v in enumerate(verts):
+                row = g.graph[v]
+                for k in range(offsets[i], offsets[i + 1]):
+                    row[verts[targets[k]]] = weights[k]
+        return g
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{self.__class__.__name__} is immutable")
+
+    add_vertex = add_edge = add_weighted_edge = remove_edge = _immutable
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(vertices={self.num_vertices}, edges={self.num_edges})"
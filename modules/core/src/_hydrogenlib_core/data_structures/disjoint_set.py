@@ -0,0 +1,156 @@
+from array import array
+from typing import Hashable, Iterable, Iterator
+
+
+class DisjointSet[T: Hashable]:
+    """
+    并查集 (路径压缩 + 按秩合并), find / union 均摊 O(α(n))
+    """
+    __slots__ = ('_parent', '_rank', '_count')
+
+    def __init__(self, items: Iterable[T] = ()):
+        self._parent = {}  # type: dict[T, T]
+        self._rank = {}  # type: dict[T, int]
+        self._count = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item: T) -> bool:
+        """
+        加入一个单独成集合的元素, 元素已存在时返回 False
+        """
+        if item in self._parent:
+            return False
+        self._parent[item] = item
+        self._rank[item] = 0
+        self._count += 1
+        return True
+
+    def find(self, item: T) -> T:
+        """
+        返回元素所在集合的代表元素
+        """
+        parent = self._parent
+        root = item
+        while (p := parent[root]) != root:
+            root = p
+        while (p := parent[item]) != root:  # 路径压缩
+            parent[item] = root
+            item = p
+        return root
+
+    def union(self, a: T, b: T) -> bool:
+        """
+        合并 a, b 所在的集合 (不存在的元素会先被加入), 原本就在同一集合时返回 False
+        """
+        self.add(a)
+        self.add(b)
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+
+        rank = self._rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        self._count -= 1
+        return True
+
+    def connected(self, a: T, b: T) -> bool:
+        if a not in self._parent or b not in self._parent:
+            return a == b and a in self._parent
+        return self.find(a) == self.find(b)
+
+    @property
+    def count(self) -> int:
+        """
+        集合的个数
+        """
+        return self._count
+
+    def groups(self) -> list[list[T]]:
+        result = {}
+        for item in self._parent:
+            result.setdefault(self.find(item), []).append(item)
+        return list(result.values())
+
+    def __contains__(self, item):
+        return item in self._parent
+
+    def __len__(self):
+        return len(self._parent)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._parent)
+
+
+class IntDisjointSet:
+    """
+    元素为 0..n-1 的整数的并查集, parent 存放在 array('q') 中, rank 存放在 bytearray 中
+    """
+    __slots__ = ('_parent', '_rank', '_count')
+
+    def __init__(self, size: int = 0):
+        self._parent = array('q', range(size))
+        self._rank = bytearray(size)
+        self._count = size
+
+    def resize(self, size: int):
+        """
+        扩充到 size 个元素, 新元素各自成为一个集合
+        """
+        old = len(self._parent)
+        if size > old:
+            self._parent.extend(range(old, size))
+            self._rank.extend(bytes(size - old))
+            self._count += size - old
+
+    def add(self) -> int:
+        """
+        加入一个新元素, 返回它的编号
+        """
+        i = len(self._parent)
+        self.resize(i + 1)
+        return i
+
+    def find(self, i: int) -> int:
+        parent = self._parent
+        root = i
+        while (p := parent[root]) != root:
+            root = p
+        while (p := parent[i]) != root:
+            parent[i] = root
+            i = p
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+
+        rank = self._rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1  # 秩不会超过 log2(n), 一个字节足够
+        self._count -= 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def groups(self) -> list[list[int]]:
+        result = {}
+        for i in range(len(self._parent)):
+            result.setdefault(self.find(i), []).append(i)
+        return list(result.values())
+
+    def __len__(self):
+        return len(self._parent)
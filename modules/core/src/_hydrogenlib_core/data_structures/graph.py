@@ -1,16 +1,33 @@
-from typing import Any, Iterable, Hashable
+from graphlib import CycleError
+from typing import Any, Iterable, Iterator, Hashable
 
-from .stack import Stack
-from .vis_structure import Visited
+from .graph_algorithms import tarjan_scc, simple_cycles, bfs, dfs
+from .disjoint_set import DisjointSet, IntDisjointSet
+from .incremental_order import IncrementalTopologicalOrder
+from .interning import VertexInterner, build_int_view
+from .reachability import ReachabilityIndex
+from .shortest_path import (
+    dijkstra, astar, bidirectional_dijkstra, bellman_ford, all_pairs_shortest_paths, reconstruct_path
+)
 
 
 class GraphBase[T: Hashable]:
-    def __init__(self, graph=None):
+    _order = None  # type: IncrementalTopologicalOrder | None
+    _interner = None  # type: VertexInterner | None
+    _adjacency = None  # type: list[list[int]] | None
+    _reachability = None  # type: ReachabilityIndex | None
+    _version = 0  # 每次修改顶点或边时加一
+
+    def __init__(self, graph=None, interned=False):
         """ initializes a directed graph object
             If no dictionary or None is given,
-            an empty dictionary will be used
+            an empty dictionary will be used.
+            With interned=True, vertices are also numbered 0..n-1 and an
+            integer adjacency list is kept up to date for the traversal algorithms
         """
         self.graph = graph or {}  # type: dict[T, set[T]]
+        if interned:
+            self._build_int_view()
 
     @classmethod
     def from_dict(cls, dct):
@@ -34,9 +51,54 @@ class GraphBase[T: Hashable]:
                     edges.append((vertex, neighbour))
         return edges
 
+    def _build_int_view(self):
+        interner = VertexInterner(self.graph)
+        intern = interner.intern
+        self._adjacency = [[intern(w) for w in self.children(v)] for v in list(interner)]
+        self._adjacency.extend([] for _ in range(len(interner) - len(self._adjacency)))
+        self._interner = interner
+
+    def _intern_vertex(self, vertex):
+        if (i := self._interner.get(vertex)) is None:
+            i = self._interner.intern(vertex)
+            self._adjacency.append([])
+        return i
+
+    @property
+    def interned(self) -> bool:
+        return self._interner is not None
+
+    @property
+    def interner(self) -> VertexInterner | None:
+        return self._interner
+
+    def index_of(self, vertex: T) -> int:
+        """ returns the integer id of vertex (interned graphs only) """
+        if self._interner is None:
+            raise TypeError("graph is not interned")
+        return self._interner.id_of(vertex)
+
+    def int_view(self) -> tuple[list[T], list[list[int]]]:
+        """ returns (vertices by id, integer adjacency list);
+            the interned view is shared and must not be modified
+        """
+        if self._interner is None:
+            return build_int_view(self)
+        return self._interner.vertices, self._adjacency
+
+    def _modified(self, edge=None):
+        """ bumps the version; edge is the (left, right) pair just added, if any """
+        self._version += 1
+        if self._reachability is not None:
+            self._reachability.graph_modified(edge)
+
     def children(self, vertex):
         return self.graph.get(vertex, set())
 
+    def weighted_children(self, vertex) -> Iterable[tuple[T, Any]]:
+        """ returns (child, weight) pairs; unweighted edges have weight None """
+        return ((child, None) for child in self.children(vertex))
+
     def add_vertex(self, *vertexs: T):
         """ If the vertex "vertex" is not in
             self.graph_dict, a key "vertex" with an empty
@@ -45,85 +107,121 @@ class GraphBase[T: Hashable]:
         for vertex in vertexs:
             if vertex not in self.graph:
                 self.graph[vertex] = set()
+                if self._order is not None:
+                    self._order.add_vertex(vertex)
+                if self._interner is not None:
+                    self._intern_vertex(vertex)
+                self._modified((vertex, vertex))
+
+    def _check_self_loop(self, left, right):
+        """ in incremental order mode, rejects a self-loop before its vertices are added;
+            an edge touching a new vertex can't close any other cycle, so insert_edge
+            only raises after add_vertex when both vertices already existed
+        """
+        if self._order is not None and left == right:
+            raise CycleError('edge would create a cycle', [left, left])
 
     def add_edge(self, left: T, right: T):
         """ assumes that edge is of type tuple (vertex1, vertex2);
             adds a directed edge from vertex1 to vertex2.
+            In incremental order mode, raises CycleError
+            (leaving the graph unchanged) if the edge would close a cycle.
         """
+        self._check_self_loop(left, right)
         self.add_vertex(left, right)
+        if right in self.graph[left]:
+            return
+        if self._order is not None:
+            self._order.insert_edge(left, right)
         self.graph[left].add(right)
+        if self._interner is not None:
+            self._adjacency[self._interner.id_of(left)].append(self._interner.id_of(right))
+        self._modified((left, right))
+
+    def try_add_edge(self, left: T, right: T) -> bool:
+        """ like add_edge, but reports a would-be cycle by returning False """
+        try:
+            self.add_edge(left, right)
+        except CycleError:
+            return False
+        return True
 
     def remove_edge(self, left, right):
         """ assumes that edge is of type tuple with two vertices """
         if self.exists(left) and right in self.children(left):
             self.graph[left].remove(right)
+            if self._order is not None:
+                self._order.remove_edge(left, right)
+            if self._interner is not None:
+                self._adjacency[self._interner.id_of(left)].remove(self._interner.id_of(right))
+            self._modified()
+
+    def enable_incremental_order(self):
+        """ keeps a topological order up to date on every add_edge (Pearce-Kelly);
+            raises CycleError if the graph already has a cycle
+        """
+        if self._order is None:
+            self._order = IncrementalTopologicalOrder(self)
+        return self._order
+
+    def disable_incremental_order(self):
+        self._order = None
+
+    @property
+    def incremental_order(self) -> IncrementalTopologicalOrder | None:
+        return self._order
 
     def exists(self, vertex):
         return vertex in self.graph
 
-    @property
-    def circles(self):
-        sck = Stack()
-        vis = Visited()
-        circle_vis = Visited()
-
-        result = set()
-
-        def func(current):
-            sck.push(current)
-            vis[current] = True
-
-            for child in self.children(current):
-                # print(f"Node {current} -> {child}")
-                # print(sck)
-                if vis[child]:  # 环的出现
-                    # print(f'Find circle {child}')
-                    ls = []
-                    finded = False
-                    for node in sck:
-                        # print(f'Foreach Circle Node: {node}, finded={finded}')
-                        if finded or node == child:
-                            finded = True
-                            circle_vis[node] = True
-                            ls.append(node)
-                    # ls.append(child)
-                    # ls = ls[::-1]
-                    result.add(tuple(ls))
-                else:
-                    func(child)
-
-            vis[current] = False
-            sck.pop()
-
-        for vertex in self.vertices:
-            if circle_vis[vertex]:
-                continue  # 跳过已经遍历过的节点
-            func(vertex)
-
-        # func(1)
-
-        return result
+    def bfs(self, source: T) -> Iterator[T]:
+        """ breadth-first traversal from source """
+        return bfs(self, source)
 
-    def topological_sorted(self):
-        visited = Visited()
-        stack = Stack()
+    def dfs(self, source: T) -> Iterator[T]:
+        """ depth-first (preorder) traversal from source """
+        return dfs(self, source)
 
-        def dfs(vertex):
-            visited[vertex] = True
-            for neighbour in self.graph.get(vertex, []):
-                if not visited[neighbour]:
-                    dfs(neighbour)
-            stack.push(vertex)
+    def reachability_index(self, **options) -> ReachabilityIndex:
+        """ returns the cached reachability index, building it on first use
+            (or when options for ReachabilityIndex are given);
+            it is rebuilt lazily after changes that can affect reachability
+        """
+        if self._reachability is None or options:
+            self._reachability = ReachabilityIndex(self, **options)
+        return self._reachability
 
-        for vertex in self.vertices:
-            if not visited[vertex]:
-                dfs(vertex)
+    def reaches(self, source: T, target: T) -> bool:
+        """ returns whether target can be reached from source (transitively depends on) """
+        return self.reachability_index().reachable(source, target)
 
-        return stack[::-1]
+    def strongly_connected_components(self) -> list[list[T]]:
+        """ returns the strongly connected components,
+            in reverse topological order
+        """
+        return tarjan_scc(self)
+
+    def cycles(self, max_cycles: int = None, max_length: int = None) -> Iterator[tuple[T, ...]]:
+        """ enumerates the elementary cycles of the graph (Johnson's algorithm),
+            stopping after max_cycles cycles and skipping cycles longer than max_length
+        """
+        return map(tuple, simple_cycles(self, max_cycles, max_length))
+
+    @property
+    def circles(self):
+        return set(self.cycles())
+
+    def topological_sorted(self):
+        """ returns the vertices in topological order;
+            vertices of the same cycle are kept together
+        """
+        if self._order is not None:
+            return self._order.order()
+        return [v for component in reversed(tarjan_scc(self)) for v in reversed(component)]
 
     def __str__(self):
         res = "vertices: "
-        for k in self.graph:
+        for k in self.vertices:
             res += str(k) + " "
         res += "\nedges: "
         for edge in self.edges:
@@ -132,48 +230,186 @@ class GraphBase[T: Hashable]:
 
 
 class UndirectedGraph[T: Hashable](GraphBase[T]):
-    def __init__(self, graph=None):
-        super().__init__(graph)
+    _components = None  # type: DisjointSet | IntDisjointSet | None
+
+    def __init__(self, graph=None, interned=False):
+        super().__init__(graph, interned)
 
         for k in list(self.graph):
-            for i in self.children(k):
+            for i in list(self.children(k)):
                 self.add_edge(k, i)
 
+    def add_vertex(self, *vertexs: T):
+        super().add_vertex(*vertexs)
+        if self._components is not None:
+            if self._interner is not None:
+                self._components.resize(len(self._interner))
+            else:
+                for vertex in vertexs:
+                    self._components.add(vertex)
+
     def add_edge(self, left, right):
         """ assumes that edge is of type set, tuple or list;
             between two vertices can be multiple edges!
         """
         super().add_edge(left, right)
         super().add_edge(right, left)
+        if self._components is not None:
+            if self._interner is not None:
+                self._components.union(self._interner.id_of(left), self._interner.id_of(right))
+            else:
+                self._components.union(left, right)
 
     def remove_edge(self, left, right):
         super().remove_edge(left, right)
         super().remove_edge(right, left)
+        self._components = None  # 并查集不支持删除, 下次查询时重建
+
+    def _component_index(self):
+        if self._components is None:
+            if self._interner is not None:
+                components = IntDisjointSet(len(self._interner))
+                for i, row in enumerate(self._adjacency):
+                    for j in row:
+                        components.union(i, j)
+            else:
+                components = DisjointSet(self.graph)
+                for v, children in self.graph.items():
+                    for w in children:
+                        components.union(v, w)
+            self._components = components
+        return self._components
+
+    def connected(self, left: T, right: T) -> bool:
+        """ returns whether left and right are in the same connected component;
+            the union-find index is built on first use and maintained by add_edge
+        """
+        if self._interner is None:
+            return self._component_index().connected(left, right)
+        i, j = self._interner.get(left), self._interner.get(right)
+        if i is None or j is None:
+            return False
+        return self._component_index().connected(i, j)
+
+    def component_of(self, vertex: T) -> T:
+        """ returns the representative vertex of vertex's component """
+        components = self._component_index()
+        if self._interner is None:
+            return components.find(vertex)
+        return self._interner.vertex_of(components.find(self._interner.id_of(vertex)))
+
+    @property
+    def component_count(self) -> int:
+        return self._component_index().count
+
+    def connected_components(self) -> list[list[T]]:
+        groups = self._component_index().groups()
+        if self._interner is None:
+            return groups
+        vertices = self._interner.vertices
+        return [[vertices[i] for i in group] for group in groups]
+
+    def enable_incremental_order(self):
+        raise TypeError("UndirectedGraph has no topological order")
 
 
 class WeightedGraph(GraphBase):
+    _parents = None  # type: dict[Any, dict[Any, Any]] | None
+
     @property
     def circles(self):
         raise NotImplementedError("WeightedGraph can't scan circles")
 
-    def __init__(self, graph=None):
+    def __init__(self, graph=None, interned=False):
         super().__init__(graph)
         self.graph: dict[Any, dict[Any, Any]] = {}
+        if interned:
+            self._build_int_view()
 
     def add_vertex(self, *vertexs):
         for vertex in vertexs:
             if vertex not in self.graph:
                 self.graph[vertex] = {}
+                if self._order is not None:
+                    self._order.add_vertex(vertex)
+                if self._interner is not None:
+                    self._intern_vertex(vertex)
+                self._modified((vertex, vertex))
 
     def add_edge(self, left, right):
         """ Adds a weighted edge between vertex1 and vertex2 """
-        self.add_vertex(left, right)
         self.add_weighted_edge(left, right, None)
 
     def add_weighted_edge(self, vertex1, vertex2, weight):
         """ Adds a weighted edge between vertex1 and vertex2 """
+        self._check_self_loop(vertex1, vertex2)
         self.add_vertex(vertex1, vertex2)
+        new = vertex2 not in self.graph[vertex1]
+        if new:
+            if self._order is not None:
+                self._order.insert_edge(vertex1, vertex2)
+            if self._interner is not None:
+                self._adjacency[self._interner.id_of(vertex1)].append(self._interner.id_of(vertex2))
         self.graph[vertex1][vertex2] = weight
+        self._parents = None
+        if new:
+            self._modified((vertex1, vertex2))
+
+    def remove_edge(self, left, right):
+        if self.exists(left) and right in self.graph[left]:
+            del self.graph[left][right]
+            self._parents = None
+            if self._order is not None:
+                self._order.remove_edge(left, right)
+            if self._interner is not None:
+                self._adjacency[self._interner.id_of(left)].remove(self._interner.id_of(right))
+            self._modified()
+
+    def weighted_children(self, vertex):
+        return self.graph.get(vertex, {}).items()
+
+    def weighted_parents(self, vertex):
+        """ returns (parent, weight) pairs, from a reverse index rebuilt after changes """
+        if self._parents is None:
+            parents = {}
+            for v, row in self.graph.items():
+                for w, weight in row.items():
+                    parents.setdefault(w, {})[v] = weight
+            self._parents = parents
+        return self._parents.get(vertex, {}).items()
+
+    def shortest_paths(self, source, default_weight=1):
+        """ returns (distances, predecessors) from source;
+            uses Bellman-Ford if any weight is negative, Dijkstra otherwise
+        """
+        if any(weight is not None and weight < 0 for row in self.graph.values() for weight in row.values()):
+            return bellman_ford(self, source, default_weight)
+        return dijkstra(self, source, default_weight=default_weight)
+
+    def shortest_path(self, source, target, method='dijkstra', heuristic=None, default_weight=1):
+        """ returns (distance, path) from source to target, or None if unreachable
+            method: 'dijkstra', 'astar' (needs heuristic), 'bidirectional' or 'bellman_ford'
+        """
+        match method:
+            case 'bidirectional':
+                return bidirectional_dijkstra(self, source, target, default_weight)
+            case 'dijkstra':
+                dist, pred = dijkstra(self, source, target, default_weight)
+            case 'astar':
+                if heuristic is None:
+                    raise ValueError("astar requires a heuristic")
+                dist, pred = astar(self, source, target, heuristic, default_weight)
+            case 'bellman_ford':
+                dist, pred = bellman_ford(self, source, default_weight)
+            case _:
+                raise ValueError(f"Unknown method {method!r}")
+
+        if target not in dist:
+            return None
+        return dist[target], reconstruct_path(pred, source, target)
+
+    def all_pairs_shortest_paths(self, method='auto', default_weight=1):
+        return all_pairs_shortest_paths(self, method, default_weight)
 
     def get_weight(self, vertex1, vertex2):
         """ Returns the weight of the edge between vertex1 and vertex2 """
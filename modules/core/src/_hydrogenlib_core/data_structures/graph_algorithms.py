@@ -0,0 +1,325 @@
+from itertools import islice
+from typing import Hashable, Iterator
+
+from .interning import IntStack, IntVisited, build_int_view
+
+# 所有算法都只依赖 graph.vertices 与 graph.children(vertex),
+# 因此 GraphBase / UndirectedGraph / CSRGraph 都可以直接使用
+# 全部使用显式栈实现, 不受递归深度限制
+
+
+def tarjan_scc[T: Hashable](graph) -> list[list[T]]:
+    """
+    Tarjan 强连通分量算法 (迭代版本), O(V + E)
+    :return: 强连通分量列表, 按逆拓扑序排列 (汇点所在分量在前)
+    """
+    vertices, adjacency = build_int_view(graph)
+    return [[vertices[v] for v in component] for component in tarjan_scc_ids(adjacency)]
+
+
+def tarjan_scc_ids(adjacency) -> list[list[int]]:
+    """
+    在整数邻接表上运行 Tarjan 算法, 分量中是顶点编号, 顺序与 tarjan_scc 相同
+    """
+    n = len(adjacency)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    result = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(adjacency[root]))]
+
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if index[w] < 0:  # 树边, 先深入
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, iter(adjacency[w])))
+                    break
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:  # v 的所有出边处理完毕
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+
+                if low[v] == index[v]:  # v 是分量的根
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component.append(w)
+                        if w == v:
+                            break
+                    result.append(component)
+
+    return result
+
+
+def kosaraju_scc[T: Hashable](graph) -> list[list[T]]:
+    """
+    Kosaraju 强连通分量算法 (迭代版本), O(V + E)
+    :return: 强连通分量列表, 按拓扑序排列 (源点所在分量在前)
+    """
+    vertices, adjacency = build_int_view(graph)
+    n = len(adjacency)
+    reverse = [[] for _ in range(n)]  # type: list[list[int]]
+    visited = bytearray(n)
+    order = []  # 按完成时间排列
+
+    for root in range(n):
+        if visited[root]:
+            continue
+
+        visited[root] = 1
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                reverse[w].append(v)
+                if not visited[w]:
+                    visited[w] = 1
+                    work.append((w, iter(adjacency[w])))
+                    break
+            else:
+                work.pop()
+                order.append(v)
+
+    assigned = bytearray(n)
+    result = []
+    for root in reversed(order):
+        if assigned[root]:
+            continue
+
+        assigned[root] = 1
+        component = [root]
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            for w in reverse[v]:
+                if not assigned[w]:
+                    assigned[w] = 1
+                    component.append(w)
+                    stack.append(w)
+        result.append([vertices[v] for v in component])
+
+    return result
+
+
+def _traversal_start(graph, source):
+    vertices, adjacency = graph.int_view()
+    return vertices, adjacency, graph.index_of(source)
+
+
+def bfs[T: Hashable](graph, source: T) -> Iterator[T]:
+    """
+    从 source 开始的广度优先遍历
+    顶点已被整数化 (interned 图 / CSRGraph) 时在整数上遍历, 否则使用集合记录访问状态
+    """
+    if not _is_interned(graph):
+        children = graph.children
+        visited = {source}
+        frontier = [source]
+        while frontier:
+            yield from frontier
+            next_frontier = []
+            for v in frontier:
+                for w in children(v):
+                    if w not in visited:
+                        visited.add(w)
+                        next_frontier.append(w)
+            frontier = next_frontier
+        return
+
+    vertices, adjacency, start = _traversal_start(graph, source)
+    visited = IntVisited(len(adjacency))
+    flags = visited.flags
+    flags[start] = 1
+    frontier = [start]
+    while frontier:
+        yield from map(vertices.__getitem__, frontier)
+        next_frontier = []
+        for v in frontier:
+            for w in adjacency[v]:
+                if not flags[w]:
+                    flags[w] = 1
+                    next_frontier.append(w)
+        frontier = next_frontier
+
+
+def dfs[T: Hashable](graph, source: T) -> Iterator[T]:
+    """
+    从 source 开始的深度优先遍历 (前序)
+    """
+    if not _is_interned(graph):
+        children = graph.children
+        visited = set()
+        stack = [source]
+        while stack:
+            v = stack.pop()
+            if v in visited:
+                continue
+            visited.add(v)
+            yield v
+            stack.extend(w for w in children(v) if w not in visited)
+        return
+
+    vertices, adjacency, start = _traversal_start(graph, source)
+    visited = IntVisited(len(adjacency))
+    flags = visited.flags
+    stack = IntStack((start,))
+    push, pop = stack.push, stack.pop
+    while stack:
+        v = pop()
+        if flags[v]:
+            continue
+        flags[v] = 1
+        yield vertices[v]
+        for w in adjacency[v]:
+            if not flags[w]:
+                push(w)
+
+
+def _is_interned(graph):
+    return getattr(graph, 'interned', False)
+
+
+def _johnson_circuits(adjacency, start):
+    """
+    Johnson 算法中以 start 为起点的基本回路搜索 (迭代版本)
+    :param adjacency: 限制在当前强连通分量内的邻接表
+    """
+    path = [start]
+    blocked = {start}
+    blocked_map = {}  # type: dict[Hashable, set]
+    closed = [False]
+    stack = [(start, iter(adjacency[start]))]
+
+    while stack:
+        v, it = stack[-1]
+        for w in it:
+            if w == start:
+                yield path[:]
+                closed[-1] = True
+            elif w not in blocked:
+                path.append(w)
+                closed.append(False)
+                stack.append((w, iter(adjacency[w])))
+                blocked.add(w)
+                break
+        else:
+            stack.pop()
+            v = path.pop()
+            if closed.pop():
+                if closed:
+                    closed[-1] = True
+
+                # 解除阻塞
+                unblock = [v]
+                while unblock:
+                    u = unblock.pop()
+                    if u in blocked:
+                        blocked.discard(u)
+                        unblock.extend(blocked_map.pop(u, ()))
+            else:
+                for w in adjacency[v]:
+                    blocked_map.setdefault(w, set()).add(v)
+
+
+def _bounded_circuits(adjacency, start, max_length):
+    """
+    以 start 为起点、长度不超过 max_length 的基本回路搜索
+    Johnson 的阻塞剪枝在限制长度时不再成立, 这里只做深度受限的搜索
+    """
+    path = [start]
+    on_path = {start}
+    stack = [iter(adjacency[start])]
+
+    while stack:
+        for w in stack[-1]:
+            if w == start:
+                yield path[:]
+            elif w not in on_path and len(path) < max_length:
+                path.append(w)
+                on_path.add(w)
+                stack.append(iter(adjacency[w]))
+                break
+        else:
+            stack.pop()
+            on_path.discard(path.pop())
+
+
+class _Adjacency:
+    __slots__ = ('vertices', 'adjacency')
+
+    def __init__(self, adjacency):
+        self.adjacency = adjacency
+        self.vertices = adjacency.keys()
+
+    def children(self, vertex):
+        return self.adjacency[vertex]
+
+
+def _iter_simple_cycles(graph, max_length):
+    children = graph.children
+    components = []
+
+    for component in tarjan_scc(graph):
+        for v in component:
+            if v in children(v):  # 自环
+                yield [v]
+
+        if len(component) > 1:
+            components.append(component)
+
+    if max_length is not None and max_length < 2:
+        return
+
+    while components:
+        component = components.pop()
+        members = set(component)
+        adjacency = {v: [w for w in children(v) if w in members and w != v] for v in component}
+        start = component[0]
+
+        if max_length is None:
+            yield from _johnson_circuits(adjacency, start)
+        else:
+            yield from _bounded_circuits(adjacency, start, max_length)
+
+        # 移除 start 后, 剩余部分重新划分强连通分量
+        del adjacency[start]
+        for v in adjacency:
+            adjacency[v] = [w for w in adjacency[v] if w != start]
+
+        for sub in tarjan_scc(_Adjacency(adjacency)):
+            if len(sub) > 1:
+                components.append(sub)
+
+
+def simple_cycles[T: Hashable](graph, max_cycles: int = None, max_length: int = None) -> Iterator[list[T]]:
+    """
+    Johnson 算法枚举有向图中的所有基本回路
+    每个回路以顶点列表形式给出, 不重复首个顶点; 自环给出为单元素列表
+    :param graph: 图对象
+    :param max_cycles: 最多枚举的回路数量, None 表示不限制
+    :param max_length: 回路的最大长度 (顶点数), None 表示不限制
+    """
+    cycles = _iter_simple_cycles(graph, max_length)
+    if max_cycles is not None:
+        cycles = islice(cycles, max_cycles)
+    return cycles
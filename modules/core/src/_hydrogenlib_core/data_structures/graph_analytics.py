@@ -0,0 +1,270 @@
+from array import array
+from typing import Hashable
+
+from .csr_graph import CSRGraph
+from .interning import build_int_view
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖, 没有时退回纯 Python 实现
+    np = None
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # scipy 是可选依赖, 仅用于稀疏矩阵乘法
+    sparse = None
+
+# 所有函数先把图导出为 CSR 形式 (indptr, indices, weights):
+# 第 i 个顶点的出边目标为 indices[indptr[i]:indptr[i + 1]], 顶点编号与 int_view 一致
+
+
+def to_csr_arrays(graph, weighted=False, default_weight=1):
+    """
+    把图导出为 CSR 数组
+    :param weighted: 为 True 时同时导出权重 (权重为 None 的边视为 default_weight)
+    :return: (按编号排列的顶点, indptr, indices, weights)
+             numpy 可用时为 int64 / float64 数组, 否则为 array('q') / array('d');
+             weighted 为 False 时 weights 为 None
+    """
+    if isinstance(graph, CSRGraph):
+        return _csr_graph_arrays(graph, weighted, default_weight)
+
+    vertices, adjacency = build_int_view(graph)
+    n = len(adjacency)
+
+    if not weighted:
+        indptr = array('q', bytes(8 * (n + 1)))
+        indices = array('q')
+        for i, row in enumerate(adjacency):
+            indices.extend(row)
+            indptr[i + 1] = len(indices)
+        weights = None
+    else:
+        index = {v: i for i, v in enumerate(vertices)}
+        indptr = array('q', bytes(8 * (n + 1)))
+        indices = array('q')
+        weights = array('d')
+        for i, v in enumerate(vertices):
+            for w, weight in graph.weighted_children(v):
+                indices.append(index[w])
+                weights.append(default_weight if weight is None else weight)
+            indptr[i + 1] = len(indices)
+
+    if np is not None:
+        indptr = np.frombuffer(indptr, dtype=np.int64)
+        indices = np.frombuffer(indices, dtype=np.int64)
+        if weights is not None:
+            weights = np.frombuffer(weights, dtype=np.float64)
+
+    return vertices, indptr, indices, weights
+
+
+def _csr_graph_arrays(graph, weighted, default_weight):
+    # CSRGraph 已经是 CSR 存储, 直接复用它的数组
+    indptr, indices = graph.offsets, graph.targets
+    weights = None
+    if weighted:
+        weights = graph.weights
+        if weights is None:
+            weights = array('d', [default_weight]) * len(indices)
+        elif not isinstance(weights, array):
+            weights = array('d', (default_weight if w is None else w for w in weights))
+
+    if np is not None:
+        indptr = np.frombuffer(indptr, dtype=np.int64)
+        indices = np.frombuffer(indices, dtype=np.int64)
+        if weights is not None:
+            weights = np.frombuffer(weights, dtype=np.float64)
+
+    return graph.vertices, indptr, indices, weights
+
+
+def to_sparse_matrix(graph, weighted=False, default_weight=1):
+    """
+    把图导出为 scipy.sparse.csr_array 邻接矩阵, A[i, j] 为 i -> j 的边权 (无权时为 1)
+    :return: (按编号排列的顶点, 邻接矩阵)
+    """
+    if sparse is None:
+        raise ImportError("to_sparse_matrix requires scipy")
+
+    vertices, indptr, indices, weights = to_csr_arrays(graph, weighted, default_weight)
+    n = len(vertices)
+    if weights is None:
+        weights = np.ones(len(indices))
+    return vertices, sparse.csr_array((weights, indices, indptr), shape=(n, n))
+
+
+def pagerank[T: Hashable](graph, alpha=0.85, personalization: dict[T, float] = None,
+                          weighted=False, default_weight=1, tol=1e-6, max_iter=100) -> dict[T, float]:
+    """
+    PageRank (幂迭代)
+    有 scipy 时每轮为一次稀疏矩阵-向量乘法, 只有 numpy 时用 bincount 做散射累加, 都没有时退回纯 Python
+    没有出边的顶点 (悬挂点) 的分数按 personalization 重新分配
+    :param personalization: 随机跳转的分布, 为 None 时为均匀分布
+    :param weighted: 为 True 时按边权比例转移
+    :raise RuntimeError: max_iter 轮内没有收敛
+    """
+    vertices, indptr, indices, weights = to_csr_arrays(graph, weighted, default_weight)
+    n = len(vertices)
+    if n == 0:
+        return {}
+
+    if personalization is None:
+        jump = [1 / n] * n
+    else:
+        total = sum(personalization.values())
+        if total <= 0:
+            raise ValueError("personalization must have a positive sum")
+        jump = [personalization.get(v, 0) / total for v in vertices]
+
+    if np is None:
+        ranks = _pagerank_python(n, indptr, indices, weights, alpha, jump, tol, max_iter)
+    else:
+        ranks = _pagerank_numpy(n, indptr, indices, weights, alpha, np.array(jump), tol, max_iter).tolist()
+
+    return dict(zip(vertices, ranks))
+
+
+def _pagerank_numpy(n, indptr, indices, weights, alpha, jump, tol, max_iter):
+    degree = np.diff(indptr)
+    sources = np.repeat(np.arange(n), degree)
+    if weights is None:
+        weights = np.ones(len(indices))
+
+    out_weight = np.bincount(sources, weights=weights, minlength=n)
+    dangling = out_weight == 0
+    scale = np.divide(1, out_weight, out=np.zeros(n), where=~dangling)
+    transition = weights * scale[sources]  # 按行归一化后的转移概率
+
+    if sparse is not None:
+        # 转置矩阵 M[j, i] = P(i -> j), 每轮 x' = M @ x
+        matrix = sparse.csr_array((transition, (indices, sources)), shape=(n, n))
+        step = matrix.__matmul__
+    else:
+        def step(x):
+            return np.bincount(indices, weights=transition * x[sources], minlength=n)
+
+    x = jump.copy()
+    for _ in range(max_iter):
+        previous = x
+        x = alpha * (step(x) + previous[dangling].sum() * jump) + (1 - alpha) * jump
+        if np.abs(x - previous).sum() < n * tol:
+            return x
+
+    raise RuntimeError(f"pagerank did not converge in {max_iter} iterations")
+
+
+def _pagerank_python(n, indptr, indices, weights, alpha, jump, tol, max_iter):
+    out_weight = [0.0] * n
+    for i in range(n):
+        lo, hi = indptr[i], indptr[i + 1]
+        out_weight[i] = hi - lo if weights is None else sum(weights[lo:hi])
+
+    x = list(jump)
+    for _ in range(max_iter):
+        dangling = sum(x[i] for i in range(n) if out_weight[i] == 0)
+        new = [0.0] * n
+        for i in range(n):
+            if out_weight[i] == 0:
+                continue
+            share = x[i] / out_weight[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                new[indices[k]] += share if weights is None else share * weights[k]
+
+        new = [alpha * (new[i] + dangling * jump[i]) + (1 - alpha) * jump[i] for i in range(n)]
+        error = sum(abs(new[i] - x[i]) for i in range(n))
+        x = new
+        if error < n * tol:
+            return x
+
+    raise RuntimeError(f"pagerank did not converge in {max_iter} iterations")
+
+
+def _degree_centrality(graph, inbound):
+    vertices, indptr, indices, _ = to_csr_arrays(graph)
+    n = len(vertices)
+    if n <= 1:
+        return dict.fromkeys(vertices, 1.0)
+
+    scale = 1 / (n - 1)
+    if np is not None:
+        degree = np.bincount(indices, minlength=n) if inbound else np.diff(indptr)
+        return dict(zip(vertices, (degree * scale).tolist()))
+
+    if inbound:
+        degree = [0] * n
+        for j in indices:
+            degree[j] += 1
+    else:
+        degree = [indptr[i + 1] - indptr[i] for i in range(n)]
+    return {v: d * scale for v, d in zip(vertices, degree)}
+
+
+def in_degree_centrality[T: Hashable](graph) -> dict[T, float]:
+    """
+    入度中心性: 入度 / (n - 1)
+    """
+    return _degree_centrality(graph, True)
+
+
+def out_degree_centrality[T: Hashable](graph) -> dict[T, float]:
+    """
+    出度中心性: 出度 / (n - 1)
+    """
+    return _degree_centrality(graph, False)
+
+
+def bfs_levels[T: Hashable](graph, sources, max_level: int = None) -> dict[T, int]:
+    """
+    多源 BFS 层数: 每个可达顶点到最近的源点的边数, 源点为 0 层
+    numpy 可用时每一层整体处理: 一次性收集当前层所有顶点的出边, 再用布尔掩码筛掉已访问的顶点
+    :param max_level: 只扩展到这一层为止
+    """
+    vertices, indptr, indices, _ = to_csr_arrays(graph)
+    index = {v: i for i, v in enumerate(vertices)}
+    start = sorted({index[s] for s in sources})
+
+    if np is None:
+        levels = _bfs_levels_python(len(vertices), indptr, indices, start, max_level)
+        return {vertices[i]: level for i, level in levels.items()}
+
+    level = np.full(len(vertices), -1, dtype=np.int64)
+    frontier = np.array(start, dtype=np.int64)
+    depth = 0
+    while len(frontier):
+        level[frontier] = depth
+        if depth == max_level:
+            break
+        depth += 1
+
+        # 把每个前沿顶点的 [indptr[i], indptr[i + 1]) 区间拼接成一个下标数组
+        starts = indptr[frontier]
+        lengths = indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            break
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        neighbours = indices[offsets + np.arange(total)]
+
+        neighbours = neighbours[level[neighbours] < 0]
+        frontier = np.unique(neighbours)
+
+    reached = np.flatnonzero(level >= 0)
+    return dict(zip([vertices[i] for i in reached.tolist()], level[reached].tolist()))
+
+
+def _bfs_levels_python(n, indptr, indices, start, max_level):
+    levels = dict.fromkeys(start, 0)
+    frontier = start
+    depth = 0
+    while frontier and depth != max_level:
+        depth += 1
+        next_frontier = []
+        for i in frontier:
+            for k in range(indptr[i], indptr[i + 1]):
+                j = indices[k]
+                if j not in levels:
+                    levels[j] = depth
+                    next_frontier.append(j)
+        frontier = next_frontier
+    return levels
@@ -1,53 +1,83 @@
-class Heap:
-    """
-    默认大顶堆
-    """
-    def __init__(self, lst=None, reversed=False):
-        self.heap = lst or []
-        self.iter_reversed = reversed
+import heapq
+from itertools import count
+from typing import Any, Iterable, Iterator
 
-    def _parent(self, i):
-        return (i - 1) // 2
 
-    def _left_child(self, i):
-        return 2 * i + 1
+def _iter_sorted(heap: list, key=None) -> Iterator:
+    """
+    按从小到大的顺序惰性遍历一个合法的二叉堆, 不复制、不修改原堆
+    以堆中的下标为节点做一次最佳优先搜索, 取出 k 个元素的代价为 O(k log k)
+    """
+    if not heap:
+        return
 
-    def _right_child(self, i):
-        return 2 * i + 2
+    frontier = [(heap[0] if key is None else key(heap[0]), 0)]
+    size = len(heap)
+    while frontier:
+        _, i = heapq.heappop(frontier)
+        yield heap[i]
+        for child in (2 * i + 1, 2 * i + 2):
+            if child < size:
+                heapq.heappush(frontier, (heap[child] if key is None else key(heap[child]), child))
 
-    def _swap(self, i, j):
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
 
-    def _heapify_down(self, index):
-        left = self._left_child(index)
-        right = self._right_child(index)
-        smallest = index
+def _sift_up(heap: list, pos: int):
+    """
+    把 heap[pos] 向上移动到合适的位置
+    """
+    item = heap[pos]
+    while pos > 0:
+        parent_pos = (pos - 1) >> 1
+        parent = heap[parent_pos]
+        if not item < parent:
+            break
+        heap[pos] = parent
+        pos = parent_pos
+    heap[pos] = item
 
-        if left < len(self.heap) and self.heap[left] < self.heap[smallest]:
-            smallest = left
 
-        if right < len(self.heap) and self.heap[right] < self.heap[smallest]:
-            smallest = right
+def _sift_down(heap: list, pos: int):
+    """
+    把 heap[pos] 向下移动到合适的位置
+    """
+    size = len(heap)
+    item = heap[pos]
+    child = 2 * pos + 1
+    while child < size:
+        right = child + 1
+        if right < size and heap[right] < heap[child]:
+            child = right
+        if not heap[child] < item:
+            break
+        heap[pos] = heap[child]
+        pos = child
+        child = 2 * pos + 1
+    heap[pos] = item
 
-        if smallest != index:
-            self._swap(index, smallest)
-            self._heapify_down(smallest)
 
-    def _heapify_up(self, index):
-        parent = self._parent(index)
-        if index > 0 and self.heap[parent] > self.heap[index]:
-            self._swap(index, parent)
-            self._heapify_up(parent)
+class Heap:
+    """
+    小顶堆 (基于 heapq), reversed 为 True 时按从大到小的顺序迭代
+    """
+    def __init__(self, lst=None, reversed=False):
+        self.heap = lst or []
+        self.iter_reversed = reversed
+        heapq.heapify(self.heap)
 
     def insert(self, value):
-        self.heap.append(value)
-        self._heapify_up(len(self.heap) - 1)
+        heapq.heappush(self.heap, value)
 
     def remove(self, value):
-        index = self.heap.index(value)
-        self._swap(index, len(self.heap) - 1)
-        self.heap.pop()
-        self._heapify_down(index)
+        heap = self.heap
+        index = heap.index(value)
+        last = heap.pop()
+        if index < len(heap):
+            heap[index] = last
+            # 替换上来的元素可能需要上浮或下沉
+            if index > 0 and last < heap[(index - 1) // 2]:
+                _sift_up(heap, index)
+            else:
+                _sift_down(heap, index)
 
     def append(self, value):
         self.insert(value)
@@ -55,12 +85,15 @@ class Heap:
     def extract_min(self):
         if not self.heap:
             raise IndexError("Heap is empty.")
-        min_val = self.heap[0]
-        last_val = self.heap.pop()
-        if self.heap:
-            self.heap[0] = last_val
-            self._heapify_down(0)
-        return min_val
+        return heapq.heappop(self.heap)
+
+    def pushpop(self, value):
+        return heapq.heappushpop(self.heap, value)
+
+    def replace(self, value):
+        if not self.heap:
+            raise IndexError("Heap is empty.")
+        return heapq.heapreplace(self.heap, value)
 
     def peek(self):
         if not self.heap:
@@ -68,21 +101,269 @@ class Heap:
         return self.heap[0]
 
     def copy(self):
-        return self.__class__(self.heap.copy())
+        return self.__class__(self.heap.copy(), self.iter_reversed)
 
     def iter(self):
-        copy = self.copy()
-        while copy:
-            yield copy.heap[0]
-            last = copy.heap.pop()
-            if copy:
-                copy.heap[0] = last
-                copy._heapify_down(0)
+        return _iter_sorted(self.heap)
 
     iter_reversed = False
 
     def __iter__(self):
-        return self.iter() if not self.iter_reversed else reversed(tuple(self.iter()))
+        return self.iter() if not self.iter_reversed else reversed(sorted(self.heap))
 
     def __len__(self):
         return len(self.heap)
+
+
+class HeapHandle(list):
+    """
+    IndexedHeap 中元素的句柄, 布局为 [priority, seq, item, index]
+
+    直接继承 list, 堆内比较走 list 的 C 实现 (先比较 priority, 再比较唯一的 seq),
+    永远不会比较到 item 本身。
+    """
+    __slots__ = ()
+
+    @property
+    def priority(self):
+        return self[0]
+
+    @property
+    def item(self):
+        return self[2]
+
+    @property
+    def index(self) -> int:
+        return self[3]
+
+    @property
+    def valid(self) -> bool:
+        """
+        句柄对应的元素仍在堆中
+        """
+        return self[3] >= 0
+
+    def __repr__(self):
+        return f"HeapHandle(item={self[2]!r}, priority={self[0]!r})"
+
+    __hash__ = object.__hash__  # 按身份哈希, 便于放入集合或作为字典键
+
+    def __eq__(self, other):
+        return self is other
+
+
+class IndexedHeap[T]:
+    """
+    可索引的小顶堆
+
+    push 返回 HeapHandle, 通过句柄可以在 O(log n) 内修改优先级 (update) 或删除 (remove)。
+    优先级相同的元素按插入顺序出堆。
+    """
+
+    def __init__(self):
+        self._heap = []  # type: list[HeapHandle]
+        self._seq = count()
+
+    @classmethod
+    def heapify(cls, iterable: Iterable[T], key=None) -> 'IndexedHeap[T]':
+        """
+        O(n) 批量建堆
+        :param key: 计算优先级的函数, 为 None 时以元素本身作为优先级
+        """
+        heap = cls()
+        heap.extend(iterable, key)
+        return heap
+
+    def _sift_up(self, pos):
+        heap = self._heap
+        entry = heap[pos]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if not entry < parent:
+                break
+            heap[pos] = parent
+            parent[3] = pos
+            pos = parent_pos
+        heap[pos] = entry
+        entry[3] = pos
+
+    def _sift_down(self, pos):
+        heap = self._heap
+        size = len(heap)
+        entry = heap[pos]
+        child = 2 * pos + 1
+        while child < size:
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            smaller = heap[child]
+            if not smaller < entry:
+                break
+            heap[pos] = smaller
+            smaller[3] = pos
+            pos = child
+            child = 2 * pos + 1
+        heap[pos] = entry
+        entry[3] = pos
+
+    def _new_handle(self, item, priority):
+        return HeapHandle((item if priority is None else priority, next(self._seq), item, -1))
+
+    def push(self, item: T, priority=None) -> HeapHandle:
+        """
+        加入元素, priority 为 None 时以元素本身作为优先级
+        """
+        handle = self._new_handle(item, priority)
+        handle[3] = len(self._heap)
+        self._heap.append(handle)
+        self._sift_up(handle[3])
+        return handle
+
+    def extend(self, iterable: Iterable[T], key=None) -> list[HeapHandle]:
+        """
+        批量加入元素, 追加的数量较多时整体重新建堆 (O(n + k))
+        """
+        heap = self._heap
+        start = len(heap)
+        handles = [self._new_handle(item, None if key is None else key(item)) for item in iterable]
+        heap.extend(handles)
+
+        if len(handles) > start:
+            for i in range(start, len(heap)):
+                heap[i][3] = i
+            for i in reversed(range(len(heap) // 2)):
+                self._sift_down(i)
+        else:
+            for i in range(start, len(heap)):
+                heap[i][3] = i
+                self._sift_up(i)
+
+        return handles
+
+    def pop(self) -> T:
+        """
+        弹出优先级最小的元素
+        """
+        return self.pop_handle()[2]
+
+    def pop_handle(self) -> HeapHandle:
+        heap = self._heap
+        if not heap:
+            raise IndexError("Heap is empty.")
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self._sift_down(0)
+        else:
+            top = last
+        top[3] = -1
+        return top
+
+    def peek(self) -> T:
+        if not self._heap:
+            raise IndexError("Heap is empty.")
+        return self._heap[0][2]
+
+    def peek_handle(self) -> HeapHandle:
+        if not self._heap:
+            raise IndexError("Heap is empty.")
+        return self._heap[0]
+
+    def pushpop(self, item: T, priority=None) -> tuple[T, HeapHandle | None]:
+        """
+        先加入再弹出, 比分开调用更快
+        :return: (弹出的元素, 新元素的句柄); 新元素严格最小时直接弹出, 堆不变, 句柄为 None
+        """
+        heap = self._heap
+        key = item if priority is None else priority
+        if not heap or key < heap[0][0]:
+            return item, None
+
+        handle = self._new_handle(item, priority)
+        top = heap[0]
+        heap[0] = handle
+        self._sift_down(0)
+        top[3] = -1
+        return top[2], handle
+
+    def replace(self, item: T, priority=None) -> tuple[T, HeapHandle]:
+        """
+        先弹出再加入, 堆不能为空
+        :return: (弹出的元素, 新元素的句柄)
+        """
+        heap = self._heap
+        if not heap:
+            raise IndexError("Heap is empty.")
+
+        handle = self._new_handle(item, priority)
+        top = heap[0]
+        heap[0] = handle
+        self._sift_down(0)
+        top[3] = -1
+        return top[2], handle
+
+    def update(self, handle: HeapHandle, priority) -> None:
+        """
+        修改元素的优先级 (decrease-key / increase-key), O(log n)
+        """
+        pos = handle[3]
+        if pos < 0 or self._heap[pos] is not handle:
+            raise ValueError(f"{handle!r} is not in this heap")
+
+        old = handle[0]
+        handle[0] = priority
+        if priority < old:
+            self._sift_up(pos)
+        else:
+            self._sift_down(pos)
+
+    def remove(self, handle: HeapHandle) -> T:
+        """
+        删除句柄对应的元素, O(log n)
+        """
+        heap = self._heap
+        pos = handle[3]
+        if pos < 0 or heap[pos] is not handle:
+            raise ValueError(f"{handle!r} is not in this heap")
+
+        last = heap.pop()
+        if last is not handle:
+            heap[pos] = last
+            last[3] = pos
+            if pos > 0 and last < heap[(pos - 1) >> 1]:
+                self._sift_up(pos)
+            else:
+                self._sift_down(pos)
+
+        handle[3] = -1
+        return handle[2]
+
+    def nsmallest(self, n: int = None) -> Iterator[T]:
+        """
+        惰性地按从小到大的顺序产出最多 n 个元素, 不复制、不修改堆
+        迭代期间不能修改堆
+        """
+        items = (handle[2] for handle in _iter_sorted(self._heap))
+        if n is None:
+            return items
+        return (item for _, item in zip(range(n), items))
+
+    def clear(self):
+        for handle in self._heap:
+            handle[3] = -1
+        self._heap.clear()
+
+    def __contains__(self, handle: Any):
+        pos = handle[3] if isinstance(handle, HeapHandle) else -1
+        return 0 <= pos < len(self._heap) and self._heap[pos] is handle
+
+    def __iter__(self):
+        return self.nsmallest()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
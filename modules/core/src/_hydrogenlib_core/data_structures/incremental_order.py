@@ -0,0 +1,155 @@
+from graphlib import CycleError
+from typing import Hashable
+
+from .graph_algorithms import tarjan_scc
+
+
+class IncrementalTopologicalOrder[T: Hashable]:
+    """
+    Pearce-Kelly 动态拓扑序
+
+    维护图的一个拓扑序, 插入边时只重排受影响的区间 (ord[right] .. ord[left]) 内
+    能够到达/被到达的顶点, 代价与受影响区域的大小成正比, 而不是整张图。
+    一条边会构成环时在插入前抛出 ``CycleError``, 图保持不变。
+    """
+
+    def __init__(self, graph):
+        self._graph = graph
+        self._ord = {}  # type: dict[T, int]
+        self._pos = []  # type: list[T]
+        self._parents = {}  # type: dict[T, set[T]]
+
+        components = tarjan_scc(graph)
+        for component in components:
+            if len(component) > 1 or component[0] in graph.children(component[0]):
+                raise CycleError('graph already contains a cycle', component + component[:1])
+
+        for component in reversed(components):
+            self.add_vertex(component[0])
+
+        for v in self._pos:
+            for child in graph.children(v):
+                self._parents[child].add(v)
+
+    def add_vertex(self, vertex: T):
+        if vertex in self._ord:
+            return
+        self._ord[vertex] = len(self._pos)
+        self._pos.append(vertex)
+        self._parents[vertex] = set()
+
+    def index(self, vertex: T) -> int:
+        """
+        返回顶点在当前拓扑序中的位置
+        """
+        return self._ord[vertex]
+
+    def order(self) -> list[T]:
+        return self._pos.copy()
+
+    def precedes(self, left: T, right: T) -> bool:
+        return self._ord[left] < self._ord[right]
+
+    def would_create_cycle(self, left: T, right: T) -> bool:
+        """
+        只查询, 不修改拓扑序; 不在序中的顶点没有边, 只有自环会构成环
+        """
+        if left == right:
+            return True
+        if left not in self._ord or right not in self._ord:
+            return False
+        lower, upper = self._ord[right], self._ord[left]
+        return lower < upper and self._forward(right, upper)[1] is not None
+
+    def insert_edge(self, left: T, right: T):
+        """
+        在图中加入 left -> right 之前调用, 必要时重排拓扑序
+        :raise CycleError: 这条边会构成环
+        """
+        self.add_vertex(left)
+        self.add_vertex(right)
+
+        if left == right:
+            raise CycleError('edge would create a cycle', [left, left])
+
+        lower, upper = self._ord[right], self._ord[left]
+        if lower < upper:  # 违反当前顺序, 需要局部重排
+            forward, cycle = self._forward(right, upper)
+            if cycle is not None:
+                raise CycleError('edge would create a cycle', [left] + cycle)
+
+            backward = self._backward(left, lower)
+            self._reorder(backward, forward)
+
+        self._parents[right].add(left)
+
+    def remove_edge(self, left: T, right: T):
+        """
+        删除边不会破坏拓扑序, 只需更新前驱表
+        """
+        parents = self._parents.get(right)
+        if parents is not None:
+            parents.discard(left)
+
+    def _forward(self, start, upper):
+        """
+        从 start 出发, 收集 ord 小于 upper 的可达顶点
+        遇到 ord == upper 的顶点 (即边的起点) 说明存在环, 返回环路径
+        """
+        ord_ = self._ord
+        children = self._graph.children
+        came_from = {start: None}
+        stack = [start]
+
+        while stack:
+            v = stack.pop()
+            for w in children(v):
+                position = ord_[w]
+                if position == upper:
+                    path = [w, v]
+                    while (v := came_from[v]) is not None:
+                        path.append(v)
+                    path.reverse()
+                    return None, path
+                if position < upper and w not in came_from:
+                    came_from[w] = v
+                    stack.append(w)
+
+        return list(came_from), None
+
+    def _backward(self, start, lower):
+        """
+        从 start 出发沿前驱方向, 收集 ord 大于 lower 的可达顶点
+        """
+        ord_ = self._ord
+        parents = self._parents
+        visited = {start}
+        stack = [start]
+
+        while stack:
+            v = stack.pop()
+            for w in parents[v]:
+                if w not in visited and ord_[w] > lower:
+                    visited.add(w)
+                    stack.append(w)
+
+        return list(visited)
+
+    def _reorder(self, backward, forward):
+        ord_ = self._ord
+        pos = self._pos
+
+        backward.sort(key=ord_.__getitem__)
+        forward.sort(key=ord_.__getitem__)
+        vertices = backward + forward
+        slots = sorted(ord_[v] for v in vertices)  # 复用这两组顶点原本占用的位置
+
+        for v, i in zip(vertices, slots):
+            ord_[v] = i
+            pos[i] = v
+
+    def __len__(self):
+        return len(self._pos)
+
+    def __iter__(self):
+        return iter(self._pos)
@@ -0,0 +1,161 @@
+from array import array
+from typing import Hashable, Iterable
+
+
+class VertexInterner[T: Hashable]:
+    """
+    将任意可哈希的顶点映射为稠密的整数编号 (0, 1, 2, ...)
+    每个顶点只在第一次出现时哈希一次, 之后的遍历都在整数上进行
+    """
+    __slots__ = ('_ids', '_vertices')
+
+    def __init__(self, vertices: Iterable[T] = ()):
+        self._ids = {}  # type: dict[T, int]
+        self._vertices = []  # type: list[T]
+        for v in vertices:
+            self.intern(v)
+
+    def intern(self, vertex: T) -> int:
+        """
+        返回顶点的编号, 首次出现时分配新编号
+        """
+        i = self._ids.get(vertex)
+        if i is None:
+            i = self._ids[vertex] = len(self._vertices)
+            self._vertices.append(vertex)
+        return i
+
+    def id_of(self, vertex: T) -> int:
+        return self._ids[vertex]
+
+    def get(self, vertex: T, default=None) -> int | None:
+        return self._ids.get(vertex, default)
+
+    def vertex_of(self, i: int) -> T:
+        return self._vertices[i]
+
+    @property
+    def vertices(self) -> list[T]:
+        """
+        按编号排列的顶点列表 (只读)
+        """
+        return self._vertices
+
+    def __contains__(self, vertex):
+        return vertex in self._ids
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def __iter__(self):
+        return iter(self._vertices)
+
+
+class IntVisited:
+    """
+    整数顶点的访问标记, 每个顶点占用 bytearray 中的一个字节
+    接口与 Visited 一致, 但只接受 0..size-1 的整数
+    """
+    __slots__ = ('_flags',)
+
+    def __init__(self, size: int):
+        self._flags = bytearray(size)
+
+    @property
+    def flags(self) -> bytearray:
+        return self._flags
+
+    def add(self, i: int):
+        self._flags[i] = 1
+
+    def remove(self, i: int):
+        self._flags[i] = 0
+
+    def clear(self):
+        self._flags[:] = bytes(len(self._flags))
+
+    def resize(self, size: int):
+        if size > len(self._flags):
+            self._flags.extend(bytes(size - len(self._flags)))
+
+    def __len__(self):
+        return self._flags.count(1)
+
+    def __iter__(self):
+        flags = self._flags
+        return (i for i in range(len(flags)) if flags[i])
+
+    def __repr__(self):
+        return f"IntVisited({list(self)})"
+
+    def __contains__(self, i):
+        return bool(self._flags[i])
+
+    def __getitem__(self, i):
+        return bool(self._flags[i])
+
+    def __setitem__(self, i, value):
+        self._flags[i] = 1 if value else 0
+
+
+class IntStack:
+    """
+    整数栈, 基于 array('q'), 接口与 Stack 一致
+    """
+    __slots__ = ('_stack',)
+
+    def __init__(self, stack: Iterable[int] = ()):
+        self._stack = array('q', stack)
+
+    def push(self, data: int):
+        self._stack.append(data)
+
+    def pop(self) -> int | None:
+        return self._stack.pop() if self._stack else None
+
+    def size(self) -> int:
+        return len(self._stack)
+
+    def is_empty(self) -> bool:
+        return not self._stack
+
+    def peek(self) -> int:
+        return self._stack[-1]
+
+    @property
+    def top(self) -> int:
+        return self._stack[-1]
+
+    def copy(self) -> 'IntStack':
+        return self.__class__(self._stack)
+
+    def as_tuple(self) -> tuple[int, ...]:
+        return tuple(self._stack)
+
+    def __iter__(self):
+        return iter(self._stack)
+
+    def __getitem__(self, item):
+        return self._stack[item]
+
+    def __len__(self):
+        return len(self._stack)
+
+    def __repr__(self):
+        return f"IntStack({self._stack.tolist()})"
+
+
+def build_int_view(graph) -> tuple[list, list[list[int]]]:
+    """
+    为任意图对象构建整数视图: (按编号排列的顶点, 整数邻接表)
+    图对象已经整数化 (interned 图 / CSRGraph) 时直接使用它维护的视图
+    """
+    if getattr(graph, 'interned', False):
+        return graph.int_view()
+
+    interner = VertexInterner(graph.vertices)
+    intern = interner.intern
+    children = graph.children
+    adjacency = [[intern(w) for w in children(v)] for v in list(interner.vertices)]
+    adjacency.extend([] for _ in range(len(interner) - len(adjacency)))  # children 中出现的额外顶点
+    return interner.vertices, adjacency
@@ -0,0 +1,190 @@
+import asyncio
+import collections
+import queue
+import threading
+import time
+from itertools import count
+
+from .heap import Heap
+
+
+class _PriorityStorage[T]:
+    """
+    基于 Heap 的存储, 元素以 (priority, seq, item) 保存, 优先级相同时按放入顺序取出
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._heap = Heap()
+        self._seq = count()
+
+    def _put(self, item, priority):
+        self._heap.insert((item if priority is None else priority, next(self._seq), item))
+
+    def _get(self):
+        return self._heap.extract_min()[2]
+
+    def _get_many(self, max_items):
+        heap = self._heap
+        return [heap.extract_min()[2] for _ in range(min(max_items, len(heap)))]
+
+    def qsize(self) -> int:
+        return len(self._heap)
+
+    def empty(self) -> bool:
+        return not self._heap.heap
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= len(self._heap)
+
+
+class PriorityQueue[T](_PriorityStorage[T]):
+    """
+    线程安全的阻塞优先队列, 优先级数值小的先出队
+    与 queue.Queue 一致, 非阻塞或超时时抛出 queue.Empty / queue.Full
+    每次放入/取出只唤醒能够继续执行的等待者
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+
+    @staticmethod
+    def _wait(condition, predicate, block, timeout, error):
+        if predicate():
+            return
+        if not block:
+            raise error
+
+        if timeout is None:
+            while not predicate():
+                condition.wait()
+            return
+
+        if timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise error
+            condition.wait(remaining)
+
+    def put(self, item: T, priority=None, block=True, timeout=None):
+        """
+        放入元素, priority 为 None 时以元素本身作为优先级
+        """
+        with self._not_full:
+            self._wait(self._not_full, lambda: not self.full(), block, timeout, queue.Full)
+            self._put(item, priority)
+            self._not_empty.notify()
+
+    def put_nowait(self, item: T, priority=None):
+        self.put(item, priority, block=False)
+
+    def get(self, block=True, timeout=None) -> T:
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: self._heap.heap, block, timeout, queue.Empty)
+            item = self._get()
+            self._not_full.notify()
+            return item
+
+    def get_nowait(self) -> T:
+        return self.get(block=False)
+
+    def get_many(self, max_items: int, block=True, timeout=None) -> list[T]:
+        """
+        等待至少一个元素可用, 然后一次性取出最多 max_items 个元素
+        """
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: self._heap.heap, block, timeout, queue.Empty)
+            items = self._get_many(max_items)
+            self._not_full.notify(len(items))
+            return items
+
+    def qsize(self) -> int:
+        with self._mutex:
+            return super().qsize()
+
+
+class AsyncPriorityQueue[T](_PriorityStorage[T]):
+    """
+    asyncio 版本的优先队列, 接口与 PriorityQueue 相同 (方法为协程)
+    非阻塞或超时时抛出 asyncio.QueueEmpty / asyncio.QueueFull
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self._getters = collections.deque()  # type: collections.deque[asyncio.Future]
+        self._putters = collections.deque()  # type: collections.deque[asyncio.Future]
+
+    @staticmethod
+    def _wakeup(waiters, n=1):
+        while waiters and n > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                n -= 1
+
+    async def _wait(self, waiters, predicate, block, timeout, error):
+        if predicate():
+            return
+        if not block:
+            raise error
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while not predicate():
+            waiter = loop.create_future()
+            waiters.append(waiter)
+            try:
+                async with asyncio.timeout_at(deadline):
+                    await waiter
+            except TimeoutError:
+                self._discard(waiters, waiter, predicate)
+                raise error from None
+            except BaseException:
+                self._discard(waiters, waiter, predicate)
+                raise
+
+    def _discard(self, waiters, waiter, predicate):
+        waiter.cancel()
+        try:
+            waiters.remove(waiter)
+        except ValueError:  # 已经被唤醒, 把机会让给下一个等待者
+            if predicate():
+                self._wakeup(waiters)
+
+    async def put(self, item: T, priority=None, block=True, timeout=None):
+        await self._wait(self._putters, lambda: not self.full(), block, timeout, asyncio.QueueFull)
+        self._put(item, priority)
+        self._wakeup(self._getters)
+
+    def put_nowait(self, item: T, priority=None):
+        if self.full():
+            raise asyncio.QueueFull
+        self._put(item, priority)
+        self._wakeup(self._getters)
+
+    async def get(self, block=True, timeout=None) -> T:
+        await self._wait(self._getters, lambda: self._heap.heap, block, timeout, asyncio.QueueEmpty)
+        item = self._get()
+        self._wakeup(self._putters)
+        return item
+
+    def get_nowait(self) -> T:
+        if self.empty():
+            raise asyncio.QueueEmpty
+        item = self._get()
+        self._wakeup(self._putters)
+        return item
+
+    async def get_many(self, max_items: int, block=True, timeout=None) -> list[T]:
+        await self._wait(self._getters, lambda: self._heap.heap, block, timeout, asyncio.QueueEmpty)
+        items = self._get_many(max_items)
+        self._wakeup(self._putters, len(items))
+        return items
@@ -0,0 +1,185 @@
+import random
+from typing import Hashable
+
+from .graph_algorithms import tarjan_scc_ids
+from .interning import build_int_view
+
+
+class ReachabilityIndex[T: Hashable]:
+    """
+    可达性索引: 预先计算后, reachable(a, b) 回答 "a 能否沿有向边到达 b"
+
+    先把强连通分量缩成一个点, 得到 DAG, 并按拓扑序为分量编号 (能到达的分量编号一定更大)。
+    分量数不超过 bitset_limit 时计算位集传递闭包, 查询 O(1);
+    否则为每个分量计算 labels 组区间标签 (GRAIL), 区间不包含时直接判定不可达,
+    落在 DFS 树的子树区间内时直接判定可达, 其余情况用标签剪枝的 DFS 确认。
+
+    图被修改后 (GraphBase 的 _version 变化) 索引会在下次查询时重建;
+    通过 GraphBase.reaches 使用时, 加入已经可达的边或新顶点不会使索引失效。
+    """
+
+    def __init__(self, graph, bitset_limit=100_000, labels=2, seed=0):
+        self.graph = graph
+        self.bitset_limit = bitset_limit
+        self.labels = labels
+        self.seed = seed
+        self._build()
+
+    @property
+    def method(self) -> str:
+        return 'bitset' if self._closure is not None else 'interval'
+
+    @property
+    def stale(self) -> bool:
+        return getattr(self.graph, '_version', 0) != self._version
+
+    def _build(self):
+        self._version = getattr(self.graph, '_version', 0)
+        vertices, adjacency = build_int_view(self.graph)
+        components = tarjan_scc_ids(adjacency)  # 逆拓扑序
+        count = len(components)
+
+        # 分量按拓扑序编号: tarjan 输出的第 k 个分量编号为 count - 1 - k
+        component_of = [0] * len(adjacency)
+        for k, component in enumerate(components):
+            for v in component:
+                component_of[v] = count - 1 - k
+
+        successors = [set() for _ in range(count)]  # type: list[set[int]]
+        for v, row in enumerate(adjacency):
+            c = component_of[v]
+            for w in row:
+                if (d := component_of[w]) != c:
+                    successors[c].add(d)
+
+        self._component = dict(zip(vertices, component_of))
+        self._successors = [sorted(s) for s in successors]
+        self._closure = None
+        self._intervals = None
+
+        if count <= self.bitset_limit:
+            self._build_closure(count)
+        else:
+            self._build_intervals(count)
+
+    def _build_closure(self, count):
+        # closure[c] 的第 i 位表示分量 c 能到达分量 c + i (只保存编号不小于 c 的部分)
+        closure = [0] * count
+        successors = self._successors
+        for c in range(count - 1, -1, -1):  # 从汇点开始
+            bits = 1
+            for d in successors[c]:
+                bits |= closure[d] << (d - c)
+            closure[c] = bits
+        self._closure = closure
+
+    def _build_intervals(self, count):
+        # 每组标签: 随机顺序 DFS 的后序编号 rank 与所有后代中的最小编号 low,
+        # a 能到达 b 时 [low(b), rank(b)] 一定包含于 [low(a), rank(a)];
+        # first 为进入 DFS 树子树时的编号, rank(b) 落在 [first(a), rank(a)] 时 b 是 a 在树中的后代, 必然可达
+        rnd = random.Random(self.seed)
+        successors = self._successors
+        has_parent = bytearray(count)
+        for row in successors:
+            for d in row:
+                has_parent[d] = 1
+        roots = [c for c in range(count) if not has_parent[c]]
+
+        intervals = []
+        for _ in range(self.labels):
+            low = [0] * count
+            rank = [0] * count
+            first = [0] * count
+            visited = bytearray(count)
+            counter = 0
+            rnd.shuffle(roots)
+            for root in roots:
+                visited[root] = 1
+                first[root] = counter
+                work = [(root, iter(rnd.sample(successors[root], len(successors[root]))))]
+                while work:
+                    c, it = work[-1]
+                    for d in it:
+                        if not visited[d]:
+                            visited[d] = 1
+                            first[d] = counter
+                            work.append((d, iter(rnd.sample(successors[d], len(successors[d])))))
+                            break
+                    else:
+                        work.pop()
+                        rank[c] = counter
+                        counter += 1
+                        m = rank[c]
+                        for d in successors[c]:
+                            if low[d] < m:
+                                m = low[d]
+                        low[c] = m
+            intervals.append((low, rank, first))
+        self._intervals = intervals
+
+    def _contains(self, a, b):
+        for low, rank, _ in self._intervals:
+            if low[b] < low[a] or rank[b] > rank[a]:
+                return False
+        return True
+
+    def _tree_descendant(self, a, b):
+        for _, rank, first in self._intervals:
+            if first[a] <= rank[b] <= rank[a]:
+                return True
+        return False
+
+    def _query(self, a, b):
+        component = self._component
+        ca, cb = component.get(a), component.get(b)
+        if ca is None or cb is None:
+            return a == b
+        if cb < ca:
+            return False
+        if self._closure is not None:
+            return (self._closure[ca] >> (cb - ca)) & 1 == 1
+
+        if ca == cb:
+            return True
+        if not self._contains(ca, cb):
+            return False
+        if self._tree_descendant(ca, cb):
+            return True
+
+        successors = self._successors
+        visited = {ca}
+        stack = [ca]
+        while stack:
+            c = stack.pop()
+            for d in successors[c]:
+                if d == cb:
+                    return True
+                if d < cb and d not in visited and self._contains(d, cb):
+                    if self._tree_descendant(d, cb):
+                        return True
+                    visited.add(d)
+                    stack.append(d)
+        return False
+
+    def reachable(self, source: T, target: T) -> bool:
+        """
+        source 能否到达 target (每个顶点都能到达自己)
+        """
+        if self.stale:
+            self._build()
+        return self._query(source, target)
+
+    def rebuild(self):
+        self._build()
+
+    def graph_modified(self, edge=None):
+        """
+        由图在修改后调用: edge 为刚加入的 (left, right) 且 left 原本就能到达 right 时,
+        传递闭包不变, 索引继续有效; 其余修改使索引在下次查询时重建
+        """
+        version = getattr(self.graph, '_version', 0)
+        if edge is not None and self._version + 1 == version and self._query(*edge):
+            self._version = version
+
+    def __len__(self):
+        return len(self._component)
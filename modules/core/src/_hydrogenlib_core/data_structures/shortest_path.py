@@ -0,0 +1,315 @@
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Hashable
+
+try:
+    import numpy as np
+except ImportError:  # numpy 是可选依赖, 仅用于 floyd_warshall
+    np = None
+
+# 所有算法通过 graph.weighted_children(vertex) 读取 (child, weight) 对,
+# 权重为 None 的边 (例如 WeightedGraph.add_edge 添加的边) 视为 default_weight
+
+
+class NegativeCycleError(ValueError):
+    def __init__(self, message, cycle=None):
+        super().__init__(message, cycle)
+        self.cycle = cycle
+
+
+def reconstruct_path[T: Hashable](predecessors: dict[T, T], source: T, target: T) -> list[T] | None:
+    """
+    根据前驱表重建 source -> target 的路径, 不可达时返回 None
+    """
+    if target != source and target not in predecessors:
+        return None
+
+    path = [target]
+    while target != source:
+        target = predecessors[target]
+        path.append(target)
+    path.reverse()
+    return path
+
+
+def dijkstra[T: Hashable](graph, source: T, target: T = None, default_weight=1) -> tuple[dict[T, float], dict[T, T]]:
+    """
+    Dijkstra 单源最短路 (二叉堆 + 惰性删除), 要求权重非负
+    :param target: 给出时, 在 target 出堆后立即停止
+    :return: (距离表, 前驱表)
+    """
+    dist = {source: 0}
+    pred = {}
+    done = set()
+    tie = count()
+    heap = [(0, next(tie), source)]
+    weighted_children = graph.weighted_children
+
+    while heap:
+        d, _, v = heappop(heap)
+        if v in done:
+            continue
+        done.add(v)
+        if v == target:
+            break
+
+        for w, weight in weighted_children(v):
+            if weight is None:
+                weight = default_weight
+            elif weight < 0:
+                raise ValueError(f"dijkstra can't handle negative weight {v!r} -> {w!r}: {weight}")
+
+            nd = d + weight
+            if w not in done and (w not in dist or nd < dist[w]):
+                dist[w] = nd
+                pred[w] = v
+                heappush(heap, (nd, next(tie), w))
+
+    return dist, pred
+
+
+def astar[T: Hashable](graph, source: T, target: T, heuristic: Callable[[T, T], float],
+                       default_weight=1) -> tuple[dict[T, float], dict[T, T]]:
+    """
+    A* 点对点最短路, heuristic(vertex, target) 必须是一致的 (单调的):
+    对每条边 v -> w 有 heuristic(v, target) <= weight + heuristic(w, target), 且 heuristic(target, target) == 0。
+    已确定的顶点不会重新打开, 只满足可采纳 (不高估剩余距离) 的启发函数可能得到非最短路径
+    :return: (距离表, 前驱表); 只有 source 到 target 路径上的距离是最终值,
+        表中其余顶点可能还在边界 (已发现但未确定) 上, 它们的距离不一定最短
+    """
+    dist = {source: 0}
+    pred = {}
+    done = set()
+    tie = count()
+    heap = [(heuristic(source, target), next(tie), source)]
+    weighted_children = graph.weighted_children
+
+    while heap:
+        _, _, v = heappop(heap)
+        if v in done:
+            continue
+        if v == target:
+            break
+        done.add(v)
+        d = dist[v]
+
+        for w, weight in weighted_children(v):
+            if weight is None:
+                weight = default_weight
+            nd = d + weight
+            if w not in dist or nd < dist[w]:
+                dist[w] = nd
+                pred[w] = v
+                heappush(heap, (nd + heuristic(w, target), next(tie), w))
+
+    return dist, pred
+
+
+def _reverse_children(graph):
+    if (weighted_parents := getattr(graph, 'weighted_parents', None)) is not None:
+        return weighted_parents
+
+    reverse = {}
+    for v in graph.vertices:
+        for w, weight in graph.weighted_children(v):
+            reverse.setdefault(w, []).append((v, weight))
+    return lambda vertex: reverse.get(vertex, ())
+
+
+def bidirectional_dijkstra[T: Hashable](graph, source: T, target: T, default_weight=1) -> tuple[float, list[T]] | None:
+    """
+    双向 Dijkstra 点对点最短路, 从两端同时搜索, 两个搜索圈相遇后停止
+    :return: (距离, 路径), 不可达时返回 None
+    """
+    if source == target:
+        return 0, [source]
+
+    directions = (graph.weighted_children, _reverse_children(graph))
+    dists = ({source: 0}, {target: 0})
+    preds = ({}, {})
+    done = (set(), set())
+    tie = count()
+    heaps = ([(0, next(tie), source)], [(0, next(tie), target)])
+
+    best = None
+    meet = None
+
+    while heaps[0] and heaps[1]:
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1  # 扩展较小的一侧
+        if best is not None and heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        d, _, v = heappop(heaps[side])
+        if v in done[side]:
+            continue
+        done[side].add(v)
+
+        dist, other = dists[side], dists[1 - side]
+        for w, weight in directions[side](v):
+            if weight is None:
+                weight = default_weight
+            elif weight < 0:
+                raise ValueError(f"dijkstra can't handle negative weight on {w!r}: {weight}")
+
+            nd = d + weight
+            if w not in dist or nd < dist[w]:
+                dist[w] = nd
+                preds[side][w] = v
+                heappush(heaps[side], (nd, next(tie), w))
+
+            if w in other and (best is None or nd + other[w] < best):
+                best = nd + other[w]
+                meet = w
+
+    if best is None:
+        return None
+
+    path = reconstruct_path(preds[0], source, meet)
+    v = meet
+    while v != target:
+        v = preds[1][v]
+        path.append(v)
+    return best, path
+
+
+def bellman_ford[T: Hashable](graph, source: T, default_weight=1) -> tuple[dict[T, float], dict[T, T]]:
+    """
+    Bellman-Ford 单源最短路 (队列优化), 支持负权边
+    :raise NegativeCycleError: 从 source 可达一个负权环
+    """
+    dist = {source: 0}
+    pred = {}
+    relaxed = {source: 0}  # 每个顶点的路径边数, 达到顶点数时说明存在负环
+    queue = [source]
+    queued = {source}
+    limit = sum(1 for _ in graph.vertices)
+    weighted_children = graph.weighted_children
+
+    while queue:
+        next_queue = []
+        for v in queue:
+            queued.discard(v)
+            d = dist[v]
+            for w, weight in weighted_children(v):
+                if weight is None:
+                    weight = default_weight
+                nd = d + weight
+                if w not in dist or nd < dist[w]:
+                    dist[w] = nd
+                    pred[w] = v
+                    relaxed[w] = relaxed[v] + 1
+                    if relaxed[w] >= limit:
+                        raise NegativeCycleError('graph contains a negative cycle', _find_cycle(pred, w))
+                    if w not in queued:
+                        queued.add(w)
+                        next_queue.append(w)
+        queue = next_queue
+
+    return dist, pred
+
+
+def _find_cycle(pred, vertex):
+    """
+    沿前驱表寻找负环, 前驱链在回到源点前结束时返回 None
+    """
+    seen = set()
+    while vertex not in seen:  # 沿前驱走, 直到进入环内
+        seen.add(vertex)
+        vertex = pred.get(vertex)
+        if vertex is None:
+            return None
+
+    cycle = [vertex]
+    v = pred[vertex]
+    while v != vertex:
+        cycle.append(v)
+        v = pred[v]
+    cycle.reverse()
+    return cycle
+
+
+def floyd_warshall(graph, default_weight=1):
+    """
+    Floyd-Warshall 全源最短路 (NumPy 向量化, 每轮对整个矩阵做一次广播), 适合稠密图
+    :return: (顶点列表, 距离矩阵, 前驱矩阵)
+             pred[i, j] 是 i -> j 最短路径上 j 的前一个顶点的编号, 不可达时为 -1
+    :raise NegativeCycleError: 存在负权环
+    """
+    if np is None:
+        raise ImportError("floyd_warshall requires numpy")
+
+    vertices = list(graph.vertices)
+    index = {v: i for i, v in enumerate(vertices)}
+    n = len(vertices)
+
+    dist = np.full((n, n), np.inf)
+    pred = np.full((n, n), -1, dtype=np.int64)
+
+    for i, v in enumerate(vertices):
+        for w, weight in graph.weighted_children(v):
+            j = index[w]
+            weight = default_weight if weight is None else weight
+            if weight < dist[i, j]:
+                dist[i, j] = weight
+                pred[i, j] = i
+
+    diagonal = np.arange(n)
+    dist[diagonal, diagonal] = np.minimum(dist[diagonal, diagonal], 0)
+    pred[diagonal, diagonal] = np.where(dist[diagonal, diagonal] == 0, diagonal, pred[diagonal, diagonal])
+
+    for k in range(n):
+        through = dist[:, k, None] + dist[None, k, :]
+        better = through < dist
+        if better.any():
+            dist = np.where(better, through, dist)
+            pred = np.where(better, pred[k][None, :], pred)
+
+    if (dist[diagonal, diagonal] < 0).any():
+        i = int(np.flatnonzero(dist[diagonal, diagonal] < 0)[0])
+        raise NegativeCycleError('graph contains a negative cycle', [vertices[i]])
+
+    return vertices, dist, pred
+
+
+def all_pairs_shortest_paths[T: Hashable](graph, method='auto', default_weight=1) -> tuple[
+    dict[T, dict[T, float]], dict[T, dict[T, T]]
+]:
+    """
+    全源最短路
+    :param method: 'floyd_warshall' (需要 numpy), 'dijkstra' (逐源 Dijkstra), 'bellman_ford' (逐源 Bellman-Ford, 支持负权边),
+                   'auto' 在 numpy 可用且图较稠密时使用 floyd_warshall; 有负权边时不使用 dijkstra,
+                   改用 floyd_warshall (numpy 可用时) 或 bellman_ford
+    :return: (dist[source][target], pred[source][target])
+    :raise NegativeCycleError: 图中有负权环 (floyd_warshall / bellman_ford)
+    """
+    if method == 'auto':
+        n = m = 0
+        negative = False
+        for v in graph.vertices:
+            n += 1
+            for _, weight in graph.weighted_children(v):
+                m += 1
+                if (default_weight if weight is None else weight) < 0:
+                    negative = True
+        if np is not None and (negative or m * 8 >= n * n):
+            method = 'floyd_warshall'
+        else:
+            method = 'bellman_ford' if negative else 'dijkstra'
+
+    if method in ('dijkstra', 'bellman_ford'):
+        single_source = dijkstra if method == 'dijkstra' else bellman_ford
+        dist, pred = {}, {}
+        for v in graph.vertices:
+            dist[v], pred[v] = single_source(graph, v, default_weight=default_weight)
+        return dist, pred
+
+    if method != 'floyd_warshall':
+        raise ValueError(f"Unknown method {method!r}")
+
+    vertices, matrix, pred_matrix = floyd_warshall(graph, default_weight)
+    dist, pred = {}, {}
+    for i, v in enumerate(vertices):
+        reachable = np.flatnonzero(np.isfinite(matrix[i]))
+        dist[v] = {vertices[j]: matrix[i, j].item() for j in reachable}
+        pred[v] = {vertices[j]: vertices[pred_matrix[i, j]] for j in reachable if j != i}
+    return dist, pred
@@ -5,14 +5,16 @@ from typing import Any
 
 
 class Descriptor:
-    __instance_mapping__: InstanceMapping = None
+    __instance_storage__: InstanceStorage = None  # DescriptorInstance 保存在所属实例上
     __dspt_name__ = None
     __dspt_return_self__ = True
+    __dspt_direct_get__ = True  # 没有重写 __dspt_get__ 时, __get__ 直接读取存储, 不经过中间的方法调用
 
     def __init__(self):
-        from .utils.instance_mapping import InstanceMapping
-        if self.__instance_mapping__ is None:
-            self.__instance_mapping__ = InstanceMapping()
+        from .utils.instance_mapping import InstanceStorage
+        if self.__instance_storage__ is None:
+            self.__instance_storage__ = InstanceStorage()
+        self._load = self.__instance_storage__.load
 
     def __init_subclass__(cls, **kwargs):
         if instance_class := getattr(cls, 'Instance', None):
@@ -20,12 +22,17 @@ class Descriptor:
                 return instance_class()
 
             cls.__dspt_new__ = new
+        cls.__dspt_direct_get__ = cls.__dspt_get__ is Descriptor.__dspt_get__
 
     def __instance__(self, inst, owner):
-        if inst not in self.__instance_mapping__:
-            self.__instance_mapping__[inst] = x = self.__dspt_new__(inst)
-            x.__dspt_init__(inst, owner, self.__dspt_name__, self)
-        return self.__instance_mapping__[inst]
+        try:
+            return self._load(inst)
+        except AttributeError:
+            pass
+        x = self.__dspt_new__(inst)
+        self.__instance_storage__.set(inst, x)
+        x.__dspt_init__(inst, owner, self.__dspt_name__, self)
+        return x
 
     def __dspt_get__(self, inst, owner) -> Any:
         """
@@ -70,8 +77,13 @@ class Descriptor:
         """
         if instance is None and self.__dspt_return_self__:
             return self
-        else:
+        if not self.__dspt_direct_get__:
             return self.__dspt_get__(instance, owner)
+        try:
+            x = self._load(instance)
+        except AttributeError:
+            x = self.__instance__(instance, owner)
+        return x.__dspt_get__(instance, owner, self)
 
     def __set__(self, instance, value):
         """
@@ -95,6 +107,7 @@ class Descriptor:
         :param name: 描述符的名称。
         """
         self.__dspt_name__ = name
+        self._load = self.__instance_storage__.bind(owner, name).load
         self.__dspt_init__(name, owner)
 
 
@@ -139,4 +152,4 @@ def get_descriptor_instance(descriptor, instance, owner=None):
 
 
 if typing.TYPE_CHECKING:
-    from .utils.instance_mapping import InstanceMapping
+    from .utils.instance_mapping import InstanceStorage
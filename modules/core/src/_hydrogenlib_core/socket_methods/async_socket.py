@@ -6,6 +6,7 @@ from collections.abc import Buffer
 from typing import Any, Union, IO
 
 from . import socket_consts
+from ..utils.object_pool.buffer_pool import BufferLease
 
 
 class asyncsocketio:
@@ -18,6 +19,9 @@ class asyncsocketio:
     async def read(self, size: int = -1):
         return await self._sock.recv(size)
 
+    async def readinto(self, buffer: Buffer):
+        return await self._sock.recv_into(buffer)
+
     def close(self, closefd=True):
         if not closefd:  # 如果仅仅只是关闭文件描述符，则不关闭socket
             self._sock.close()
@@ -88,7 +92,12 @@ class asyncsocket:
             self.sock, size
         )
 
-    async def recv_into(self, buffer):
+    async def recv_into(self, buffer: Buffer | BufferLease) -> int:
+        """
+        接收到 buffer 中, 返回收到的字节数
+        连接整个生命周期持有一个 BufferLease (或它的 view) 反复传入, 稳定运行时不分配新的缓冲区;
+        收到的数据是 lease.view[:n]
+        """
         return await self.loop.sock_recv_into(
             self.sock, buffer
         )
@@ -96,7 +105,10 @@ class asyncsocket:
     async def recvfrom(self, bufsize: int):
         return await self.loop.sock_recvfrom(self.sock, bufsize)
 
-    async def recvfrom_into(self, buf: Buffer, n: int):
+    async def recvfrom_into(self, buf: Buffer | BufferLease, n: int = 0):
+        """
+        recv_into 的 recvfrom 版本, 返回 (字节数, 地址)
+        """
         return await self.loop.sock_recvfrom_into(self.sock, buf, n)
 
     async def sendfile(self, file: IO[bytes], offset: int = 0, count: int = 0, *, fallback=None):
@@ -1,4 +1,4 @@
-from _hydrogenlib_core.utils import InstanceMapping
+from _hydrogenlib_core.utils import IdentityMap
 
 
 class SyncResourceContextManager:
@@ -24,7 +24,7 @@ class SyncResourceContextManager:
 
 class SyncResource:
     def __init__(self, lock):
-        self._data = InstanceMapping()
+        self._data = IdentityMap()
         self._lock = lock
 
     def __get__(self, instance, owner) -> SyncResourceContextManager:
@@ -1 +1,3 @@
 from .instance_mapping import InstanceMapping, InstanceMappingItem
+from .identity_map import IdentityMap
+from .storage import InstanceStorage, InstanceStorageMeta, storage_key
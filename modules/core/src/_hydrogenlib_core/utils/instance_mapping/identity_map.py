@@ -0,0 +1,215 @@
+from collections.abc import ItemsView, KeysView, MutableMapping, ValuesView
+from typing import Any, Iterator
+from weakref import KeyedRef, ref
+
+_MISSING = object()
+
+
+class IdentityMapKeys(KeysView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_items(0)
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+
+class IdentityMapValues(ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_items(1)
+
+    def __contains__(self, value):
+        return any(v is value or v == value for v in self)
+
+
+class IdentityMapItems(ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._mapping._iter_items(2)
+
+    def __contains__(self, item):
+        key, value = item
+        found = self._mapping.get(key, _MISSING)
+        return found is not _MISSING and (found is value or found == value)
+
+
+def _dead_callback(self_ref):
+    # 所有条目共用的弱引用回调: 只把失效的引用记下来, 由下一次访问批量清理
+    def callback(key_ref, self_ref=self_ref):
+        self = self_ref()
+        if self is not None:
+            self._pending.append(key_ref)
+
+    return callback
+
+
+class IdentityMap[K, V](MutableMapping[K, V]):
+    """
+    以对象身份 (id) 为键的映射, 键对象被回收后条目自动删除, 用于代替 InstanceMapping
+
+    值与键分别保存在两个以 id 为键的字典中; 可弱引用的键保存为 KeyedRef (不可弱引用的键保存强引用),
+    每个条目不分配额外的包装对象。所有弱引用共用同一个回调, 回调只记录失效的引用,
+    下一次访问时批量删除 (会核对引用本身, id 被新对象复用时不会误删)。
+    keys / values / items 返回视图而不是列表。
+    """
+    __slots__ = ('_values', '_refs', '_pending', '_callback', '_iterating', '__weakref__')
+
+    def __init__(self, other=None):
+        self._values = {}  # type: dict[int, V]
+        self._refs = {}  # type: dict[int, KeyedRef | K]
+        self._pending = []  # type: list[KeyedRef]
+        self._iterating = 0
+        self._callback = _dead_callback(ref(self))
+        if other is not None:
+            self.update(other)
+
+    # 内部操作
+
+    def _purge(self):
+        if self._iterating:
+            return  # 遍历结束后再清理
+        pending, self._pending = self._pending, []
+        refs, values = self._refs, self._values
+        for key_ref in pending:
+            key = key_ref.key
+            if refs.get(key) is key_ref:
+                del refs[key]
+                del values[key]
+
+    def _iter_items(self, kind) -> Iterator:
+        """
+        kind: 0 键, 1 值, 2 (键, 值)
+        """
+        if self._pending:
+            self._purge()
+        self._iterating += 1
+        try:
+            # _refs 与 _values 总是同时插入和删除, 两者的顺序一致; 先复制, 遍历中的修改不影响本次遍历
+            if kind == 1:
+                yield from list(self._values.values())
+                return
+            refs = list(self._refs.values())
+            if kind == 0:
+                for r in refs:
+                    obj = r() if type(r) is KeyedRef else r
+                    if obj is not None:  # 跳过已被回收的键
+                        yield obj
+            else:
+                for r, value in zip(refs, list(self._values.values())):
+                    obj = r() if type(r) is KeyedRef else r
+                    if obj is not None:
+                        yield obj, value
+        finally:
+            self._iterating -= 1
+            if not self._iterating and self._pending:
+                self._purge()
+
+    @staticmethod
+    def to_key(value) -> int:
+        return id(value)
+
+    # 映射接口
+
+    def __getitem__(self, key: K) -> V:
+        if self._pending:
+            self._purge()
+        return self._values[id(key)]
+
+    def get(self, key, default=None, is_key_id=False) -> Any:
+        """
+        :param is_key_id: 传入的 key 是否已经是 id 值
+        """
+        if self._pending:
+            self._purge()
+        return self._values.get(key if is_key_id else id(key), default)
+
+    def __setitem__(self, key: K, value: V):
+        if self._pending:
+            self._purge()
+        i = id(key)
+        r = self._refs.get(i)
+        if r is None or type(r) is KeyedRef and r() is not key:  # 新键, 或遍历期间尚未清理的失效条目
+            try:
+                self._refs[i] = KeyedRef(key, self._callback, i)
+            except TypeError:  # 不可弱引用的对象, 保存强引用使 id 保持有效
+                self._refs[i] = key
+        self._values[i] = value
+
+    def set(self, key, value):
+        self[key] = value
+
+    def __delitem__(self, key: K):
+        if self._pending:
+            self._purge()
+        i = id(key)
+        del self._values[i]
+        del self._refs[i]
+
+    def delete(self, key, is_key_id=False):
+        if self._pending:
+            self._purge()
+        i = key if is_key_id else id(key)
+        del self._values[i]
+        del self._refs[i]
+
+    def pop(self, key, default=_MISSING, is_key_id=False):
+        if self._pending:
+            self._purge()
+        i = key if is_key_id else id(key)
+        if i in self._values:
+            del self._refs[i]
+            return self._values.pop(i)
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def setdefault(self, key, default=None):
+        if self._pending:
+            self._purge()
+        i = id(key)
+        if i in self._values:
+            return self._values[i]
+        self[key] = default
+        return default
+
+    def __contains__(self, key):
+        if self._pending:
+            self._purge()
+        return id(key) in self._values
+
+    def __len__(self):
+        if self._pending:
+            self._purge()
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[K]:
+        return self._iter_items(0)
+
+    def keys(self) -> IdentityMapKeys:
+        return IdentityMapKeys(self)
+
+    def values(self) -> IdentityMapValues:
+        return IdentityMapValues(self)
+
+    def items(self) -> IdentityMapItems:
+        return IdentityMapItems(self)
+
+    def clear(self):
+        self._values.clear()
+        self._refs.clear()
+        self._pending.clear()
+
+    def to_dict(self) -> dict[int, V]:
+        """
+        返回 {id: 值} 字典
+        """
+        if self._pending:
+            self._purge()
+        return dict(self._values)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self.items())!r})"
@@ -0,0 +1,178 @@
+from operator import attrgetter
+from types import MemberDescriptorType
+from typing import Any
+
+from .identity_map import IdentityMap
+
+_MISSING = object()
+
+
+def storage_key(name: str) -> str:
+    """
+    描述符 name 在实例上保存值时使用的键 (槽名 / __dict__ 键), 不会与普通属性名冲突
+    """
+    return f'_{name}__storage'
+
+
+class InstanceStorage:
+    """
+    描述符的实例存储: 每个实例的值保存在实例自身上, 描述符只负责访问
+
+    bind(owner, name) 时按所属类选择存储方式:
+    - slot: 类的 __slots__ 中有 storage_key(name) 槽 (可由 InstanceStorageMeta 自动生成), 通过槽的成员描述符读写
+    - dict: 实例有 __dict__, 值保存在 __dict__[storage_key(name)]
+    - mapping: 既没有槽也没有 __dict__ (或尚未 bind) 时, 退回到以实例为键的 IdentityMap
+
+    值随实例一起回收, 不需要弱引用回调。get / set / delete / contains 在 bind 时替换为对应方式的实现。
+
+    load(instance) 是读取的快速路径: 没有值时抛出 AttributeError 而不是返回默认值;
+    slot / dict 方式下它是 operator.attrgetter, 读取不经过任何 Python 函数。
+    描述符应在 bind 之后把 load 保存在自己身上, 在 __get__ 中直接调用:
+
+        try:
+            return self._load(instance)
+        except AttributeError:
+            return default
+    """
+    __slots__ = ('name', 'key', 'mode', 'get', 'set', 'delete', 'contains', 'load', '_member', '_mapping')
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self.key = None if name is None else storage_key(name)
+        self._member = None
+        self._mapping = None
+        self._use_mapping()
+
+    def bind(self, owner: type, name: str = None) -> 'InstanceStorage':
+        """
+        按 owner 的实例布局选择存储方式, 通常在描述符的 __set_name__ 中调用
+        已经保存在 IdentityMap 中的值会被丢弃, 应在创建实例之前 bind
+        """
+        if name is not None:
+            self.name = name
+            self.key = storage_key(name)
+        if self.key is None:
+            raise ValueError("InstanceStorage needs a name to bind")
+
+        member = next((vars(klass)[self.key] for klass in owner.__mro__ if self.key in vars(klass)), None)
+        getattr_hook = hasattr(owner, '__getattr__')  # 有 __getattr__ 时 attrgetter 不会抛出 AttributeError
+        if type(member) is MemberDescriptorType:
+            self._use_slot(member, getattr_hook)
+        elif owner.__dictoffset__:
+            self._use_dict(getattr_hook)
+        else:
+            self._use_mapping()
+        return self
+
+    # 各存储方式的实现 (闭包直接引用槽描述符 / 键, 减少每次访问的属性查找)
+
+    def _use_slot(self, member, getattr_hook=False):
+        self.mode = 'slot'
+        self._member = member
+        self._mapping = None
+        member_get, member_delete, name = member.__get__, member.__delete__, self.name
+
+        def get(instance, default=None):
+            try:
+                return member_get(instance)
+            except AttributeError:
+                return default
+
+        def delete(instance):
+            try:
+                member_delete(instance)
+            except AttributeError:
+                raise KeyError(name) from None
+
+        def contains(instance):
+            try:
+                member_get(instance)
+            except AttributeError:
+                return False
+            return True
+
+        self.get, self.set, self.delete, self.contains = get, member.__set__, delete, contains
+        self.load = member_get if getattr_hook else attrgetter(self.key)  # 槽的成员描述符在类上, 没有值时抛出 AttributeError
+
+    def _use_dict(self, getattr_hook=False):
+        self.mode = 'dict'
+        self._member = None
+        self._mapping = None
+        key, name = self.key, self.name
+
+        def get(instance, default=None):
+            return instance.__dict__.get(key, default)
+
+        def set(instance, value):
+            instance.__dict__[key] = value
+
+        def delete(instance):
+            try:
+                del instance.__dict__[key]
+            except KeyError:
+                raise KeyError(name) from None
+
+        def contains(instance):
+            return key in instance.__dict__
+
+        self.get, self.set, self.delete, self.contains = get, set, delete, contains
+        if getattr_hook:
+            def load(instance):
+                try:
+                    return instance.__dict__[key]
+                except KeyError:
+                    raise AttributeError(name) from None
+
+            self.load = load
+        else:
+            self.load = attrgetter(key)  # 类上没有同名属性, 直接读到 __dict__ 中的值
+
+    def _use_mapping(self):
+        self.mode = 'mapping'
+        self._member = None
+        self._mapping = mapping = IdentityMap()
+        self.get = mapping.get
+        self.set = mapping.set
+        self.delete = mapping.delete
+        self.contains = mapping.__contains__
+        mapping_get, name = mapping.get, self.name
+
+        def load(instance):
+            value = mapping_get(instance, _MISSING)
+            if value is _MISSING:
+                raise AttributeError(name)
+            return value
+
+        self.load = load
+
+    def pop(self, instance, default=_MISSING) -> Any:
+        value = self.get(instance, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(self.name)
+            return default
+        self.delete(instance)
+        return value
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r}, mode={self.mode!r})"
+
+
+class InstanceStorageMeta(type):
+    """
+    为声明了 __slots__ 的类自动生成描述符的存储槽
+
+    类体中带有 __instance_storage__ (InstanceStorage) 属性的描述符会在 __slots__ 中追加 storage_key(name),
+    之后描述符 bind 时即可使用槽存储。没有声明 __slots__ 的类不受影响 (实例有 __dict__)。
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        slots = namespace.get('__slots__')
+        if slots is not None:
+            slots = (slots,) if isinstance(slots, str) else tuple(slots)
+            extra = tuple(
+                storage_key(attr) for attr, value in namespace.items()
+                if isinstance(getattr(value, '__instance_storage__', None), InstanceStorage)
+            )
+            namespace['__slots__'] = slots + tuple(key for key in extra if key not in slots)
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
@@ -1,2 +1,2 @@
-from .lz_property import lazy_property
-from .lz_data import LazyData
+from .lz_property import lazy_property, lazy_attribute, invalidate
+from .lz_data import LazyData, AsyncLazyData
@@ -1,14 +1,19 @@
-from typing import Callable
+import asyncio
+import threading
+from typing import Awaitable, Callable
+
+_MISSING = object()
 
 
 class LazyData[T, **P]:
     """
     Call me when you need to load data.
+    并发的首次调用只执行一次 loader, 其余调用等待并共享结果; loader 抛出异常时不缓存
     """
     def __init__(self, loader: Callable[P, T]):
         self._loader = loader
-        self._is_set = False
-        self._cache = None
+        self._cache = _MISSING
+        self._lock = threading.Lock()
 
     @property
     def loader(self):
@@ -19,11 +24,75 @@ class LazyData[T, **P]:
         if callable(v):
             self._loader = v
 
-    def __call__(self, *args, **kwargs):
-        if self._is_set:
+    @property
+    def loaded(self) -> bool:
+        return self._cache is not _MISSING
+
+    def reset(self):
+        """
+        丢弃缓存, 下次调用时重新加载
+        """
+        self._cache = _MISSING
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        cache = self._cache
+        if cache is not _MISSING:
+            return cache
+
+        with self._lock:
+            if self._cache is _MISSING:
+                self._cache = self._loader(*args, **kwargs)
             return self._cache
 
-        self._cache = self._loader(*args, **kwargs)
-        self._is_set = True
 
-        return self._cache
+class AsyncLazyData[T, **P]:
+    """
+    LazyData 的异步版本: loader 为协程函数, await data() 获取数据
+    同时等待的调用共享同一个加载任务; 某个等待者被取消不会取消加载, 加载失败时不缓存, 下次调用重新加载
+    """
+    def __init__(self, loader: Callable[P, Awaitable[T]]):
+        self._loader = loader
+        self._cache = _MISSING
+        self._task = None  # type: asyncio.Task | None
+
+    @property
+    def loader(self):
+        return self._loader
+
+    @loader.setter
+    def loader(self, v):
+        if callable(v):
+            self._loader = v
+
+    @property
+    def loaded(self) -> bool:
+        return self._cache is not _MISSING
+
+    @property
+    def loading(self) -> bool:
+        return self._task is not None
+
+    def reset(self):
+        """
+        丢弃缓存; 正在进行的加载完成后不会写入缓存
+        """
+        self._cache = _MISSING
+        self._task = None
+
+    def _finish(self, task: asyncio.Task):
+        if self._task is not task:
+            return  # 已被 reset
+        self._task = None
+        if not task.cancelled() and task.exception() is None:
+            self._cache = task.result()
+
+    async def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        cache = self._cache
+        if cache is not _MISSING:
+            return cache
+
+        task = self._task
+        if task is None:
+            self._task = task = asyncio.ensure_future(self._loader(*args, **kwargs))
+            task.add_done_callback(self._finish)
+        return await asyncio.shield(task)
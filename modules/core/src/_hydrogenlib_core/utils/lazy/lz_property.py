@@ -1,45 +1,222 @@
-from ..instance_mapping import InstanceMapping
+import threading
+from weakref import WeakKeyDictionary
+
+from ..instance_mapping import InstanceStorage
 from ...typefunc import alias
 
+_MISSING = object()
+
+
+class _OnceLocks:
+    """
+    按实例分配的初始化锁: 同一实例的并发首次访问只计算一次, 不同实例互不阻塞
+    锁只在计算期间存在, 计算完成后删除
+    """
+    __slots__ = ('_locks', '_lock')
+
+    def __init__(self):
+        self._locks = {}  # type: dict[int, list]  # id(实例) -> [锁, 引用数]
+        self._lock = threading.Lock()
+
+    def acquire(self, instance) -> threading.RLock:
+        key = id(instance)
+        with self._lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.RLock(), 0]
+            entry[1] += 1
+        entry[0].acquire()
+        return entry[0]
+
+    def release(self, instance, lock):
+        lock.release()
+        key = id(instance)
+        with self._lock:
+            entry = self._locks[key]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
 
-class lazy_property[T]:
+
+class _LazyBase:
+    """
+    lazy_property / lazy_attribute 的公共部分: 首次访问的加锁计算、分组
+    """
     fget = alias['_fget']
+
+    def __init__(self, fget=None, group: str | tuple[str, ...] = None):
+        self._fget = fget
+        self._name = getattr(fget, '__name__', None)
+        self.groups = (group,) if isinstance(group, str) else tuple(group or ())
+        self._once = _OnceLocks()
+        self.__doc__ = getattr(fget, '__doc__', None)
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def __call__(self, fget):
+        """
+        支持带参数的装饰器写法: @lazy_property(group='...')
+        """
+        if self._fget is not None:
+            raise TypeError(f"'{type(self).__name__}' object is not callable")
+        self._fget = fget
+        self._name = self._name or getattr(fget, '__name__', None)
+        self.__doc__ = getattr(fget, '__doc__', None)
+        return self
+
+    @property
+    def name(self):
+        return self._name
+
+    def _load(self, instance):
+        raise NotImplementedError
+
+    def _store(self, instance, value):
+        raise NotImplementedError
+
+    def _compute(self, instance):
+        if self._fget is None:
+            raise AttributeError(f"'{instance.__class__.__name__}' object has no attribute '{self._name}'")
+        lock = self._once.acquire(instance)
+        try:
+            value = self._load(instance)  # 等待期间可能已经由其他线程计算完成
+            if value is _MISSING:
+                value = self._fget(instance)
+                self._store(instance, value)
+            return value
+        finally:
+            self._once.release(instance, lock)
+
+    def cached(self, instance) -> bool:
+        return self._load(instance) is not _MISSING
+
+    def reset(self, instance) -> bool:
+        """
+        丢弃 instance 上缓存的值, 下次访问时重新计算; 返回是否有缓存被丢弃
+        """
+        raise NotImplementedError
+
+
+class lazy_property[T](_LazyBase):
+    """
+    首次访问时计算并缓存在实例上的属性 (数据描述符, 值通过 InstanceStorage 保存)
+
+    同一实例的并发首次访问只调用一次 fget; 赋值 / 删除时丢弃缓存并调用 fset / fdel。
+    group 为所属的失效分组, 可以用 invalidate(instance, group) 一起重置。
+    不需要 fset / fdel 时, lazy_attribute 的读取更快。
+    """
     fset = alias['_fset']
     fdel = alias['_fdel']
 
-    def __init__(self, fget=None, fset=None, fdel=None):
-        self._fget = fget
+    def __init__(self, fget=None, fset=None, fdel=None, *, group: str | tuple[str, ...] = None):
+        super().__init__(fget, group)
         self._fset = fset
         self._fdel = fdel
-        self._values = InstanceMapping()
+        self.__instance_storage__ = InstanceStorage(self._name)  # 缓存的值保存在实例上
+        self._read_cache = self.__instance_storage__.load  # 读取的快速路径, 没有缓存时抛出 AttributeError
+
+    def __set_name__(self, owner, name):
+        super().__set_name__(owner, name)
+        self._read_cache = self.__instance_storage__.bind(owner, name).load
+
+    def _copy(self, fget, fset, fdel):
+        # 和内置 property 一样返回新对象, 不修改父类上的描述符
+        prop = type(self)(fget, fset, fdel, group=self.groups)
+        prop._name = self._name
+        return prop
 
     def setter(self, fset):
-        self._fset = fset
+        return self._copy(self._fget, fset, self._fdel)
 
     def getter(self, fget):
-        self._fget = fget
+        return self._copy(fget, self._fset, self._fdel)
 
     def deleter(self, fdel):
-        self._fdel = fdel
+        return self._copy(self._fget, self._fset, fdel)
+
+    def _load(self, instance):
+        return self.__instance_storage__.get(instance, _MISSING)
+
+    def _store(self, instance, value):
+        self.__instance_storage__.set(instance, value)
+
+    def reset(self, instance) -> bool:
+        return self.__instance_storage__.pop(instance, _MISSING) is not _MISSING
 
     def __get__(self, instance, owner) -> T:
-        if instance in self._values:
-            return self._values[instance]
-        elif self._fget:
-            self._values[instance] = self._fget(instance)
-            return self._values[instance]
-        else:
-            raise AttributeError(f"'{instance.__class__.__name__}' object has no attribute '{self.__name__}'")
+        if instance is None:
+            return self
+        try:
+            return self._read_cache(instance)
+        except AttributeError:
+            return self._compute(instance)
 
     def __set__(self, instance, value):
-        if instance in self._values:
-            del self._values[instance]
+        if self._fset is None:
+            raise AttributeError(f"property '{self._name}' of '{instance.__class__.__name__}' object has no setter")
+        self.__instance_storage__.pop(instance, None)
 
         self._fset(instance, value)
 
     def __delete__(self, instance):
-        if instance in self._values:
-            del self._values[instance]
+        if self._fdel is None:
+            raise AttributeError(f"property '{self._name}' of '{instance.__class__.__name__}' object has no deleter")
+        self.__instance_storage__.pop(instance, None)
 
         self._fdel(instance)
 
+
+class lazy_attribute[T](_LazyBase):
+    """
+    非数据描述符版本的 lazy_property: 首次访问时把计算结果写入实例的 __dict__,
+    之后的读取是普通的属性访问, 不再经过描述符。赋值会直接覆盖缓存, del 会丢弃缓存。
+    实例必须有 __dict__。
+    """
+
+    def _load(self, instance):
+        return instance.__dict__.get(self._name, _MISSING)
+
+    def _store(self, instance, value):
+        instance.__dict__[self._name] = value
+
+    def reset(self, instance) -> bool:
+        return instance.__dict__.pop(self._name, _MISSING) is not _MISSING
+
+    def __get__(self, instance, owner) -> T:
+        if instance is None:
+            return self
+        if not hasattr(instance, '__dict__'):
+            raise TypeError(f"lazy_attribute '{self._name}' needs a __dict__ on '{type(instance).__name__}' instances")
+        return self._compute(instance)
+
+
+_class_groups = WeakKeyDictionary()  # type: WeakKeyDictionary[type, dict[str | None, tuple[_LazyBase, ...]]]
+
+
+def _groups_of(cls) -> dict[str | None, tuple[_LazyBase, ...]]:
+    groups = _class_groups.get(cls)
+    if groups is None:
+        found = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, _LazyBase):
+                    found[name] = value  # 子类的定义覆盖父类的同名属性
+                else:
+                    found.pop(name, None)
+        groups = {None: tuple(found.values())}
+        for lazy in found.values():
+            for group in lazy.groups:
+                groups[group] = groups.get(group, ()) + (lazy,)
+        _class_groups[cls] = groups
+    return groups
+
+
+def invalidate(instance, *groups: str) -> int:
+    """
+    重置 instance 上属于 groups 中任一分组的 lazy_property / lazy_attribute 缓存, 不指定分组时重置全部
+    :return: 被丢弃的缓存数量
+    """
+    table = _groups_of(type(instance))
+    targets = table[None] if not groups else {lazy: None for group in groups for lazy in table.get(group, ())}
+    return sum(lazy.reset(instance) for lazy in targets)
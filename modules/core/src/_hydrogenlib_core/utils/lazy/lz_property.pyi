@@ -1,27 +1,40 @@
-from typing import Callable, Any, overload
+from typing import Callable, Any, Self, overload
 
 type Getter[T] = Callable[[...], T]
 type Setter[T] = Callable[[Any, T], None]
 type Deleter = Callable[[...], None]
+type Group = str | tuple[str, ...] | None
 
 
 class lazy_property[T]:  # Copy from functools.cached_property
     fget: Getter[T]
     fset: Setter[T]
     fdel: Deleter
+    groups: tuple[str, ...]
 
-    def getter(self, fget: Getter[T]) -> T:
-        ...
+    def getter(self, fget: Getter[T]) -> Self: ...
 
-    def setter(self, fset: Setter[T]) -> None: ...
+    def setter(self, fset: Setter[T]) -> Self: ...
 
-    def deleter(self, fdel: Deleter) -> None: ...
+    def deleter(self, fdel: Deleter) -> Self: ...
 
     @overload
-    def __init__(self, fget: Getter[T]) -> None: ...
+    def __init__(self, fget: Getter[T], *, group: Group = None) -> None: ...
 
     @overload
-    def __init__(self, fget: Getter[T], fset: Setter[T], fdel: Deleter) -> None: ...
+    def __init__(self, fget: Getter[T], fset: Setter[T], fdel: Deleter, *, group: Group = None) -> None: ...
+
+    @overload
+    def __init__(self, *, group: Group = None) -> None: ...
+
+    def __call__(self, fget: Getter[T]) -> Self: ...
+
+    @property
+    def name(self) -> str | None: ...
+
+    def cached(self, instance: object) -> bool: ...
+
+    def reset(self, instance: object) -> bool: ...
 
     @overload
     def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
@@ -33,3 +46,36 @@ class lazy_property[T]:  # Copy from functools.cached_property
 
     def __set__(self, instance: object,
                 value: T) -> None: ...  # type: ignore[misc]  # pyright: ignore[reportGeneralTypeIssues]
+
+    def __delete__(self, instance: object) -> None: ...
+
+
+class lazy_attribute[T]:
+    fget: Getter[T]
+    groups: tuple[str, ...]
+
+    @overload
+    def __init__(self, fget: Getter[T], group: Group = None) -> None: ...
+
+    @overload
+    def __init__(self, *, group: Group = None) -> None: ...
+
+    def __call__(self, fget: Getter[T]) -> Self: ...
+
+    @property
+    def name(self) -> str | None: ...
+
+    def cached(self, instance: object) -> bool: ...
+
+    def reset(self, instance: object) -> bool: ...
+
+    @overload
+    def __get__(self, instance: None, owner: type[Any] | None = None) -> Self: ...
+
+    @overload
+    def __get__(self, instance: object, owner: type[Any] | None = None) -> T: ...
+
+    def __set_name__(self, owner: type[Any], name: str) -> None: ...
+
+
+def invalidate(instance: object, *groups: str) -> int: ...
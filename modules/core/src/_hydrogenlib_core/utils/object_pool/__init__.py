@@ -0,0 +1,4 @@
+from .item import PoolItem, PoolObject
+from .pool import Pool, PoolBase, PoolStats
+from .async_pool import AsyncPool
+from .buffer_pool import BufferLease, BufferPool, BufferPoolStats, get_buffer_pool
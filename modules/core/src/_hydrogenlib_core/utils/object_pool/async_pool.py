@@ -0,0 +1,226 @@
+import asyncio
+import contextlib
+import inspect
+import time
+from collections import deque
+from typing import Callable
+
+from .item import PoolItem
+from .pool import PoolBase, PoolStats
+
+_RESERVED = object()  # 交给等待者的新建名额
+
+
+async def _resolve(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+async def _check(obj, hook_name, args=(), kwargs=None) -> bool:
+    hook = getattr(obj, hook_name, None)
+    return hook is None or await _resolve(hook(*args, **(kwargs or {}))) is not False
+
+
+class AsyncPool[T](PoolBase):
+    """
+    asyncio 版本的对象池, 只能在同一个事件循环中使用 (不是线程安全的)
+
+    factory / destroy 可以是协程函数, __pool_reuse__ / __pool_keep__ 也可以返回 awaitable。
+    达到 max_size 时 acquire 按先来后到等待, 放回的对象直接交给最早的等待者; clean_up 可以用 reap 定期执行。
+    """
+
+    def __init__(self, factory: Callable = None, *, min_size: int = 0, max_size: int = 0,
+                 max_idle_time: float = None, max_uses: int = None, destroy: Callable = None):
+        super().__init__(factory, min_size=min_size, max_size=max_size, max_idle_time=max_idle_time,
+                         max_uses=max_uses, destroy=destroy)
+        self._waiters = deque()  # type: deque[asyncio.Future]
+
+    def _hand_off(self):
+        """
+        把空闲对象或空出的名额按顺序直接交给等待者, 新来的 acquire 无法插队
+        等待者收到 PoolItem (直接使用), _RESERVED (已预留名额, 自行创建) 或 None (池已关闭, 重试后抛出)
+        """
+        waiters = self._waiters
+        while waiters:
+            if waiters[0].done():  # 已超时或被取消
+                waiters.popleft()
+                continue
+            if self._idle:
+                result = self._idle.pop()
+            elif self._closed:
+                result = None
+            elif self.factory is not None and (not self.max_size or self._size < self.max_size):
+                self._size += 1
+                result = _RESERVED
+            else:
+                return
+            waiters.popleft().set_result(result)
+
+    def _give_back(self, result):
+        """
+        等待者拿到结果后没能继续 (被取消), 把对象或名额还回去
+        """
+        if result is _RESERVED:
+            self._unreserve()
+        elif result is not None:
+            self._idle.append(result)
+        self._hand_off()
+
+    async def _wait(self, deadline):
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            if deadline is None:
+                return await waiter
+            async with asyncio.timeout(deadline - time.monotonic()):
+                return await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self._give_back(waiter.result())
+            else:
+                waiter.cancel()
+            raise
+
+    async def _create(self) -> PoolItem:
+        try:
+            item = PoolItem(await _resolve(self.factory()))
+        except BaseException:
+            self._unreserve()
+            self._hand_off()
+            raise
+        self._stats.created += 1
+        return item
+
+    async def acquire(self, *args, timeout: float = None, block: bool = True, **kwargs) -> T:
+        """
+        取出一个对象, args / kwargs 传给 __pool_reuse__
+        :raise TimeoutError: 在限定时间内没有可用的对象
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            item, create = self._take()
+            if item is None and not create:
+                if not block or deadline is not None and deadline <= time.monotonic():
+                    self._stats.timeouts += 1
+                    raise TimeoutError("No object available in the pool")
+                if not waited:
+                    self._stats.waits += 1
+                    waited = True
+                try:
+                    result = await self._wait(deadline)
+                except TimeoutError:
+                    self._stats.timeouts += 1
+                    raise TimeoutError("No object available in the pool") from None
+                if result is None:
+                    continue
+                if result is _RESERVED:
+                    create = True
+                else:
+                    item = result
+
+            if create:
+                item = await self._create()
+
+            try:
+                usable = await _check(item.obj, '__pool_reuse__', args, kwargs)
+            except Exception:
+                if create:
+                    await self._discard(item)
+                    raise
+                usable = False
+            except BaseException:  # 取消等, 不能让条目丢失
+                await self._discard(item)
+                raise
+
+            if usable:
+                self._checked_out(item)
+                return item.obj
+
+            await self._discard(item)
+            if create:
+                raise RuntimeError(f"New object {item.obj!r} was rejected by __pool_reuse__")
+
+    async def release(self, obj: T):
+        item = self._returned(obj)
+        try:
+            keep = await _check(obj, '__pool_keep__')
+        except BaseException:
+            await self._discard(item)
+            raise
+        kept = self._put_back(item, keep)
+        self._hand_off()
+        if not kept:
+            await self._destroy_async(obj)
+
+    async def _discard(self, item: PoolItem):
+        self._dropped(rejected=True)
+        self._hand_off()
+        await self._destroy_async(item.obj)
+
+    async def _destroy_async(self, obj):
+        if self.destroy is not None:
+            await _resolve(self.destroy(obj))
+
+    @contextlib.asynccontextmanager
+    async def checkout(self, *args, timeout: float = None, **kwargs):
+        """
+        async with pool.checkout() as obj: ..., 退出时自动放回
+        """
+        obj = await self.acquire(*args, timeout=timeout, **kwargs)
+        try:
+            yield obj
+        finally:
+            await self.release(obj)
+
+    async def put(self, obj: T) -> bool:
+        if self._closed or self.max_size and self._size >= self.max_size:
+            await self._destroy_async(obj)
+            return False
+        self._size += 1
+        self._idle.append(PoolItem(obj))
+        self._hand_off()
+        return True
+
+    async def fill(self) -> int:
+        created = 0
+        while not self._closed and self._size < self.min_size:
+            self._size += 1
+            self._idle.appendleft(await self._create())
+            self._hand_off()
+            created += 1
+        return created
+
+    async def clean_up(self, now=None) -> int:
+        expired = self._expired(time.monotonic() if now is None else now)
+        self._hand_off()
+        for item in expired:
+            await self._destroy_async(item.obj)
+        return len(expired)
+
+    async def reap(self, period=1.0):
+        """
+        定期淘汰空闲对象, 用法: task = asyncio.create_task(pool.reap(1.0)), 取消 task 即停止
+        """
+        while True:
+            await asyncio.sleep(period)
+            await self.clean_up()
+
+    async def close(self):
+        self._closed = True
+        items = self._drain()
+        self._hand_off()  # 等待中的 acquire 醒来后抛出 RuntimeError
+        for item in items:
+            await self._destroy_async(item.obj)
+
+    @property
+    def stats(self) -> PoolStats:
+        return self._snapshot()
+
+    def reset_stats(self):
+        self._stats = PoolStats(peak_in_use=len(self._in_use))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,241 @@
+import dataclasses as dc
+import threading
+
+
+@dc.dataclass(slots=True)
+class BufferPoolStats:
+    arenas: int = 0
+    reserved: int = 0  # 所有 arena 占用的字节数
+    blocks: int = 0
+    in_use: int = 0  # 已借出未归还的块
+    oversize: int = 0  # 超过最大分级或超出 max_bytes, 临时分配的缓冲区
+
+
+class BufferLease:
+    """
+    缓冲区租约: 从 BufferPool 借出的一段内存
+
+    view 是长度为请求大小的可写 memoryview; 租约本身也支持缓冲区协议, 可以直接传给
+    socket.recv_into / struct.pack_into 等函数。release (或退出 with) 后 view 失效, 内存回到池中。
+    每次借出都创建新的租约, 重复 release 或对旧租约 release 不会影响块的下一个持有者。
+    借出本身有开销, 不分配的用法是长期持有一个租约, 反复把它 (或 view) 传给 recv_into / pack_into。
+    """
+    __slots__ = ('view', '_block', '_free')
+
+    def __init__(self, block: memoryview, size: int, free: list | None):
+        self.view = block[:size]  # type: memoryview | None
+        self._block = block
+        self._free = free  # 所属分级的空闲块列表, 临时分配的缓冲区为 None
+
+    @property
+    def capacity(self) -> int:
+        return len(self._block)
+
+    @property
+    def released(self) -> bool:
+        return self.view is None
+
+    def resize(self, size: int) -> memoryview:
+        """
+        调整 view 的长度 (不超过 capacity), 例如截取到实际收到的字节数
+        """
+        if self.view is None:
+            raise ValueError("Lease has been released")
+        if not 0 <= size <= len(self._block):
+            raise ValueError(f"size must be between 0 and {len(self._block)}")
+        self.view.release()
+        self.view = self._block[:size]
+        return self.view
+
+    def tobytes(self) -> bytes:
+        return self.view.tobytes()
+
+    def release(self):
+        """
+        归还缓冲区; 仍有对象引用着 view 导出的缓冲区时抛出 BufferError, 租约保持有效
+        """
+        view = self.view
+        if view is None:
+            return
+        view.release()  # 之后通过旧的 view 访问会抛出 ValueError
+        self.view = None
+        if self._free is not None:
+            self._free.append(self._block)
+
+    def __buffer__(self, flags):
+        if self.view is None:
+            raise ValueError("Lease has been released")
+        return self.view
+
+    def __len__(self):
+        return len(self.view) if self.view is not None else 0
+
+    def __enter__(self) -> memoryview:
+        return self.view
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def __repr__(self):
+        if self.view is None:
+            return f"<{self.__class__.__name__} released>"
+        return f"<{self.__class__.__name__} {len(self.view)}/{len(self._block)} bytes>"
+
+
+class BufferPool:
+    """
+    按大小分级的 bytearray 缓冲区池
+
+    大小分级为 min_size, 2*min_size, ... 直到 max_size; 每一级从 arena_size 字节的 bytearray (arena) 中切出等长的块,
+    空闲块按后进先出复用, 稳定运行时借出与归还都不分配新的缓冲区。
+    大于 max_size 的请求, 或 arena 总量达到 max_bytes 后的请求, 会临时分配一个 bytearray (不进入池)。
+    借出与归还只有一次列表 pop / append, 不加锁; 新建 arena 和 trim 时加锁。
+    """
+
+    def __init__(self, min_size: int = 256, max_size: int = 1 << 20, arena_size: int = 1 << 16,
+                 max_bytes: int = None):
+        if min_size <= 0 or min_size & (min_size - 1):
+            raise ValueError("min_size must be a power of two")
+        if max_size < min_size:
+            raise ValueError("max_size must not be less than min_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.arena_size = arena_size
+        self.max_bytes = max_bytes
+
+        self._shift = min_size.bit_length() - 1
+        self._classes = []  # type: list[int]  # 每一级的块大小
+        size = min_size
+        while size < max_size:
+            self._classes.append(size)
+            size <<= 1
+        self._classes.append(size)
+        self._largest = size
+        self._free = [[] for _ in self._classes]  # type: list[list[memoryview]]
+        self._blocks = [0] * len(self._classes)  # 每一级的块总数
+        self._arenas = []  # type: list[bytearray]
+        self._reserved = 0
+        self._oversize = 0
+        self._lock = threading.Lock()
+
+    def size_class(self, size: int) -> int:
+        """
+        size 所属的分级序号, 超出最大分级时为 -1
+        """
+        if size > self._largest:
+            return -1
+        return max((size - 1).bit_length() - self._shift, 0)
+
+    def _grow(self, index) -> memoryview | None:
+        with self._lock:
+            free = self._free[index]
+            if free:  # 其他线程已经补充过
+                try:
+                    return free.pop()
+                except IndexError:
+                    pass
+            block_size = self._classes[index]
+            arena_size = max(self.arena_size, block_size)
+            if self.max_bytes is not None and self._reserved + arena_size > self.max_bytes:
+                self._oversize += 1
+                return None
+            arena = bytearray(arena_size)
+            view = memoryview(arena)
+            blocks = [view[i:i + block_size] for i in range(0, arena_size - block_size + 1, block_size)]
+            free.extend(reversed(blocks[1:]))  # 倒序放入, 按 arena 中的顺序借出
+            self._arenas.append(arena)
+            self._reserved += arena_size
+            self._blocks[index] += len(blocks)
+            return blocks[0]
+
+    def acquire(self, size: int) -> BufferLease:
+        """
+        借出至少 size 字节的缓冲区, 返回的租约 view 长度为 size; 内容是上一次使用留下的数据, 不会清零
+        """
+        if size <= self._largest:
+            if size < 0:
+                raise ValueError("size must not be negative")
+            index = (size - 1).bit_length() - self._shift
+            if index < 0:
+                index = 0
+            free = self._free[index]
+            try:
+                block = free.pop()
+            except IndexError:
+                block = self._grow(index)
+            if block is not None:
+                return BufferLease(block, size, free)
+        else:
+            with self._lock:
+                self._oversize += 1
+        return BufferLease(memoryview(bytearray(size)), size, None)
+
+    def lease(self, size: int) -> BufferLease:
+        """
+        acquire 的别名, 配合 with 使用: with pool.lease(4096) as view: ...
+        """
+        return self.acquire(size)
+
+    def trim(self) -> int:
+        """
+        释放所有块都空闲的 arena, 返回释放的字节数
+        """
+        freed = set()
+        with self._lock:
+            for index, block_size in enumerate(self._classes):
+                free = self._free[index]
+                taken = []
+                while True:  # 逐个 pop 取走空闲块, 与不加锁的 acquire / release 互不干扰
+                    try:
+                        taken.append(free.pop())
+                    except IndexError:
+                        break
+                by_arena = {}
+                for block in taken:
+                    by_arena.setdefault(id(block.obj), []).append(block)
+                keep = []
+                for arena_id, blocks in by_arena.items():
+                    if len(blocks) == len(blocks[0].obj) // block_size:
+                        for block in blocks:
+                            block.release()
+                        freed.add(arena_id)
+                        self._blocks[index] -= len(blocks)
+                    else:
+                        keep.extend(blocks)
+                free.extend(reversed(keep))  # 期间 acquire 取不到块时会在 _grow 等待锁
+            released = [arena for arena in self._arenas if id(arena) in freed]
+            self._arenas = [arena for arena in self._arenas if id(arena) not in freed]
+            size = sum(map(len, released))
+            self._reserved -= size
+        return size
+
+    @property
+    def stats(self) -> BufferPoolStats:
+        with self._lock:
+            blocks = sum(self._blocks)
+            return BufferPoolStats(
+                arenas=len(self._arenas),
+                reserved=self._reserved,
+                blocks=blocks,
+                in_use=blocks - sum(map(len, self._free)),
+                oversize=self._oversize,
+            )
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.min_size}..{self._largest}, reserved={self._reserved})"
+
+
+_default_pool = None  # type: BufferPool | None
+_default_lock = threading.Lock()
+
+
+def get_buffer_pool() -> BufferPool:
+    """
+    进程共用的默认 BufferPool
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_lock:
+            if _default_pool is None:
+                _default_pool = BufferPool()
+    return _default_pool
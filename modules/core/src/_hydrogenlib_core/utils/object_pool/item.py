@@ -1,51 +1,46 @@
+import time
 import typing
-import weakref
-
-from ...typefunc.properties import alias
-
-if typing.TYPE_CHECKING:
-    from .pool import Pool
 
 
 class PoolObject(typing.Protocol if typing.TYPE_CHECKING else object):
     def __pool_reuse__(self, *args, **kwargs):
         """
-        对象被复用时调用
-        :param args: 复用传参
-        :param kwargs: 复用传参
-        :return: None
+        对象被取出 (acquire) 时调用, 可以用来检查对象是否仍然可用
+        :param args: acquire 传参
+        :param kwargs: acquire 传参
+        :return: 返回 False (或抛出异常) 表示对象已不可用, 对象池会丢弃它并换一个
         """
         pass
 
     def __pool_keep__(self):
         """
-        对象被放回对象池时调用
+        对象被放回对象池 (release) 时调用
         应当执行一些清理工作, 如果需要的话
-        :return: None
+        :return: 返回 False 表示不再保留, 对象池会丢弃它
         """
         pass
 
 
 class PoolItem:
-    obj = alias['obj']
-
-    def __init__(self, obj: PoolObject, pool: 'Pool'):
-        self._ref = None
-        self._obj = obj
-        self._pool = pool
-    
-    def keep(self, obj):
-        self._obj = obj
-        self._obj.__pool_keep__()
-        self._ref = None
-    
-    def pop(self):
-        self._ref = weakref.ref(self._obj, self.keep)  # 建立弱引用, 控制对象生命周期
-        self._obj = None
-
-    def reuse(self, *args, **kwargs):
-        if self._obj is None:
-            raise RuntimeError('对象正在使用中')
-
-        self._obj.__pool_reuse__(*args, **kwargs)
-        
\ No newline at end of file
+    """
+    对象池中的一个条目: 对象以及它的使用记录
+    """
+    __slots__ = ('obj', 'created', 'last_used', 'uses')
+
+    def __init__(self, obj: PoolObject, now: float = None):
+        self.obj = obj
+        self.created = self.last_used = time.monotonic() if now is None else now
+        self.uses = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.obj!r}, uses={self.uses})"
+
+
+def check_reuse(obj, args, kwargs) -> bool:
+    hook = getattr(obj, '__pool_reuse__', None)
+    return hook is None or hook(*args, **kwargs) is not False
+
+
+def check_keep(obj) -> bool:
+    hook = getattr(obj, '__pool_keep__', None)
+    return hook is None or hook() is not False
@@ -1,19 +1,341 @@
+import contextlib
+import dataclasses as dc
+import threading
+import time
 from collections import deque
-from .item import PoolItem
-
-
-class Pool:
-    def __init__(self, max_size=0):
-        self._max_size = max_size
-        self._deque = deque(maxlen=max_size)  # type: deque[PoolItem]
-    
-    def put(self, obj):
-        self._deque.append(PoolItem(obj, self))
-    
-    def request(self, *args, **kwargs):
-        item = self._deque.popleft()
-        item.reuse(*args, **kwargs)
-        self._deque.append(item)
-        return item.obj
-        
-            
\ No newline at end of file
+from typing import Callable
+
+from .item import PoolItem, check_keep, check_reuse
+from ..timed_data import Reaper
+
+
+@dc.dataclass(slots=True)
+class PoolStats:
+    created: int = 0
+    destroyed: int = 0  # 被丢弃的对象 (检查失败 / 空闲淘汰 / 关闭)
+    acquired: int = 0
+    released: int = 0
+    rejected: int = 0  # __pool_reuse__ / __pool_keep__ 检查失败
+    evicted: int = 0  # 空闲超时被淘汰
+    waits: int = 0  # acquire 需要等待的次数
+    timeouts: int = 0
+    # 以下为快照时的状态
+    size: int = 0
+    idle: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    max_size: int = 0
+
+    @property
+    def utilization(self) -> float:
+        """
+        正在使用的对象占容量 (无上限时占当前对象数) 的比例
+        """
+        capacity = self.max_size or self.size
+        return self.in_use / capacity if capacity else 0.0
+
+    @property
+    def reuse_rate(self) -> float:
+        """
+        acquire 直接复用已有对象 (而不是新建) 的比例
+        """
+        return max(self.acquired - self.created, 0) / self.acquired if self.acquired else 0.0
+
+
+class PoolBase:
+    """
+    对象池的簿记部分, 不加锁也不等待; Pool / AsyncPool 在此基础上实现同步方式
+
+    空闲对象按后进先出取用, 常用的对象保持活跃, 不常用的留在队首, 超过 max_idle_time 后被 clean_up 淘汰
+    (对象总数不低于 min_size)。对象池只在需要时调用 factory 创建对象, fill 可以预先创建 min_size 个。
+    """
+
+    def __init__(self, factory: Callable = None, *, min_size: int = 0, max_size: int = 0, max_idle_time: float = None,
+                 max_uses: int = None, destroy: Callable = None):
+        """
+        :param factory: 创建对象的函数, 无参数; 为 None 时只能复用 put 进来的对象
+        :param max_size: 对象总数上限 (包括正在使用的), 0 表示不限
+        :param max_idle_time: 空闲超过这么多秒的对象会被 clean_up 淘汰
+        :param max_uses: 对象被使用这么多次后不再放回
+        :param destroy: 丢弃对象时调用, 可以用来关闭连接等
+        """
+        if factory is not None and not callable(factory):
+            raise TypeError(f"factory must be callable, got {factory!r} (other arguments are keyword-only)")
+        if max_size and min_size > max_size:
+            raise ValueError("min_size must not exceed max_size")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.max_uses = max_uses
+        self.destroy = destroy
+
+        self._idle = deque()  # type: deque[PoolItem]
+        self._in_use = {}  # type: dict[int, PoolItem]
+        self._size = 0  # 空闲 + 使用中 + 正在创建
+        self._closed = False
+        self._stats = PoolStats()
+
+    # 簿记 (调用方负责加锁)
+
+    def _take(self) -> tuple[PoolItem | None, bool]:
+        """
+        :return: (空闲条目, 是否可以新建); 两者都没有时需要等待 (没有 factory 时只能等待其他对象放回)
+        """
+        if self._closed:
+            raise RuntimeError("Pool is closed")
+        if self._idle:
+            return self._idle.pop(), False
+        if self.factory is not None and (not self.max_size or self._size < self.max_size):
+            self._size += 1  # 预留位置, 在锁外创建
+            return None, True
+        return None, False
+
+    def _checked_out(self, item: PoolItem):
+        item.uses += 1
+        self._in_use[id(item.obj)] = item
+        stats = self._stats
+        stats.acquired += 1
+        if len(self._in_use) > stats.peak_in_use:
+            stats.peak_in_use = len(self._in_use)
+
+    def _returned(self, obj) -> PoolItem:
+        item = self._in_use.pop(id(obj), None)
+        if item is None:
+            raise ValueError(f"{obj!r} was not acquired from this pool")
+        self._stats.released += 1
+        return item
+
+    def _put_back(self, item: PoolItem, keep: bool) -> bool:
+        if keep and not self._closed and (self.max_uses is None or item.uses < self.max_uses):
+            item.last_used = time.monotonic()
+            self._idle.append(item)
+            return True
+        self._dropped()
+        return False
+
+    def _dropped(self, rejected=False):
+        self._size -= 1
+        self._stats.destroyed += 1
+        if rejected:
+            self._stats.rejected += 1
+
+    def _unreserve(self):
+        self._size -= 1
+
+    def _expired(self, now) -> list[PoolItem]:
+        if self.max_idle_time is None:
+            return []
+        expired = []
+        limit = now - self.max_idle_time
+        idle = self._idle
+        while idle and idle[0].last_used < limit and self._size > self.min_size:
+            expired.append(idle.popleft())
+            self._dropped()
+        self._stats.evicted += len(expired)
+        return expired
+
+    def _drain(self) -> list[PoolItem]:
+        items = list(self._idle)
+        self._idle.clear()
+        self._size -= len(items)
+        self._stats.destroyed += len(items)
+        return items
+
+    def _snapshot(self) -> PoolStats:
+        return dc.replace(
+            self._stats, size=self._size, idle=len(self._idle), in_use=len(self._in_use), max_size=self.max_size
+        )
+
+    def _destroy(self, obj):
+        if self.destroy is not None:
+            self.destroy(obj)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        return self._size
+
+
+class Pool[T](PoolBase, Reaper):
+    """
+    线程安全的对象池
+
+    acquire 取出一个对象 (没有空闲对象时新建, 达到 max_size 时阻塞等待), 用完后 release 放回;
+    checkout 是对应的上下文管理器。取出时调用对象的 __pool_reuse__, 放回时调用 __pool_keep__,
+    返回 False 的对象会被丢弃。factory / 钩子 / destroy 都在锁外调用。
+    clean_up 淘汰空闲超时的对象, 可以用 start_reaper / reap 定期执行。
+    """
+
+    def __init__(self, factory: Callable[[], T] = None, *, min_size: int = 0, max_size: int = 0,
+                 max_idle_time: float = None, max_uses: int = None, destroy: Callable[[T], None] = None):
+        super().__init__(factory, min_size=min_size, max_size=max_size, max_idle_time=max_idle_time,
+                         max_uses=max_uses, destroy=destroy)
+        self._cond = threading.Condition(threading.Lock())
+
+    def acquire(self, *args, timeout: float = None, block: bool = True, **kwargs) -> T:
+        """
+        取出一个对象, args / kwargs 传给 __pool_reuse__
+        :param timeout: 最多等待的秒数, None 表示一直等待
+        :param block: 为 False 时不等待
+        :raise TimeoutError: 在限定时间内没有可用的对象
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                item, create = self._take()
+                waited = False
+                while item is None and not create:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if not block or remaining is not None and remaining <= 0:
+                        self._stats.timeouts += 1
+                        raise TimeoutError("No object available in the pool")
+                    if not waited:
+                        self._stats.waits += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                    item, create = self._take()
+
+            if create:
+                try:
+                    item = PoolItem(self.factory())
+                except BaseException:
+                    with self._cond:
+                        self._unreserve()
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats.created += 1
+
+            try:
+                usable = check_reuse(item.obj, args, kwargs)
+            except Exception:
+                if create:
+                    self._discard(item)
+                    raise
+                usable = False  # 空闲对象检查出错视为不可用, 换一个
+            except BaseException:  # KeyboardInterrupt 等, 不能让条目丢失
+                self._discard(item)
+                raise
+
+            if usable:
+                with self._cond:
+                    self._checked_out(item)
+                return item.obj
+
+            self._discard(item)
+            if create:
+                raise RuntimeError(f"New object {item.obj!r} was rejected by __pool_reuse__")
+
+    request = acquire
+
+    def release(self, obj: T):
+        """
+        放回对象; __pool_keep__ 抛出的异常会在丢弃对象后继续抛出
+        """
+        with self._cond:
+            item = self._returned(obj)
+        try:
+            keep = check_keep(obj)
+        except BaseException:
+            self._discard(item)
+            raise
+        with self._cond:
+            kept = self._put_back(item, keep)
+            self._cond.notify()
+        if not kept:
+            self._destroy(obj)
+
+    def _discard(self, item: PoolItem):
+        with self._cond:
+            self._dropped(rejected=True)
+            self._cond.notify()
+        self._destroy(item.obj)
+
+    @contextlib.contextmanager
+    def checkout(self, *args, timeout: float = None, **kwargs):
+        """
+        with pool.checkout() as obj: ..., 退出时自动放回
+        """
+        obj = self.acquire(*args, timeout=timeout, **kwargs)
+        try:
+            yield obj
+        finally:
+            self.release(obj)
+
+    def put(self, obj: T) -> bool:
+        """
+        把外部创建的对象放入池中; 池已满时丢弃并返回 False
+        """
+        with self._cond:
+            if self._closed or self.max_size and self._size >= self.max_size:
+                accepted = False
+            else:
+                self._size += 1
+                self._idle.append(PoolItem(obj))
+                self._cond.notify()
+                accepted = True
+        if not accepted:
+            self._destroy(obj)
+        return accepted
+
+    def fill(self) -> int:
+        """
+        创建对象直到总数达到 min_size, 返回新建的数量
+        """
+        created = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return created
+                self._size += 1
+            try:
+                item = PoolItem(self.factory())
+            except BaseException:
+                with self._cond:
+                    self._unreserve()
+                raise
+            with self._cond:
+                self._stats.created += 1
+                self._idle.appendleft(item)
+                self._cond.notify()
+            created += 1
+
+    def clean_up(self, now=None) -> int:
+        """
+        淘汰空闲超过 max_idle_time 的对象, 返回淘汰的数量
+        """
+        with self._cond:
+            expired = self._expired(time.monotonic() if now is None else now)
+        for item in expired:
+            self._destroy(item.obj)
+        return len(expired)
+
+    def close(self):
+        """
+        丢弃所有空闲对象, 之后 acquire 会抛出 RuntimeError; 使用中的对象在放回时丢弃
+        """
+        self.stop_reaper()
+        with self._cond:
+            self._closed = True
+            items = self._drain()
+            self._cond.notify_all()
+        for item in items:
+            self._destroy(item.obj)
+
+    @property
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return self._snapshot()
+
+    def reset_stats(self):
+        with self._cond:
+            self._stats = PoolStats(peak_in_use=len(self._in_use))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
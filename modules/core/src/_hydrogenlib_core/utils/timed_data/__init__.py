@@ -0,0 +1,5 @@
+from .data import TimedData
+from .manager import Reaper, TimedDataManager
+from .policy import CacheStats, EvictionPolicy, LRUPolicy, LFUPolicy, TinyLFUPolicy, make_policy
+from .memoize import TimedMemoized, AsyncTimedMemoized, timed_memoize
+from .sharded import ShardedTimedDataManager
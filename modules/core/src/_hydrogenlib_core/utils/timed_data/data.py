@@ -0,0 +1,183 @@
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_refresh_lock = threading.Lock()  # 保护各 TimedData 的 _refreshing 标志
+_refresh_executor = None  # type: ThreadPoolExecutor | None
+_background_tasks = set()  # 保持后台刷新 Task 的引用
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    global _refresh_executor
+    if _refresh_executor is None:
+        with _refresh_lock:
+            if _refresh_executor is None:
+                _refresh_executor = ThreadPoolExecutor(thread_name_prefix='timed-data-refresh')
+    return _refresh_executor
+
+
+class TimedData:
+    def __init__(self, data, timeout=60, set_time=True, check_time=True, timeout_delete=True, now=None,
+                 loader=None, soft_timeout=None, refresh_ahead=None):
+        """
+        :param now: 设置时间时使用的当前时间, 批量创建时可以只读取一次时钟
+        :param loader: 重新加载数据的函数 (或协程函数), 无参数
+        :param soft_timeout: 软过期时间, 超过后 read 仍返回旧值, 同时在后台刷新 (stale-while-revalidate)
+        :param refresh_ahead: 距离过期不足这么多秒时, read 在后台提前刷新 (只有被读取的键才会刷新)
+        """
+
+        self.data = data
+        self.time = None
+        self._timeout = timeout
+
+        if set_time:
+            self.time = time.time() if now is None else now
+
+        self.set_time = set_time
+        self.check_time = check_time
+        self.timeout_delete = timeout_delete
+
+        self._is_timeout = False  # 缓存
+
+        self.loader = loader
+        self.soft_timeout = soft_timeout
+        self.refresh_ahead = refresh_ahead
+        self.refresh_error = None  # type: Exception | None  # 最近一次刷新失败的异常
+        self._refreshing = False
+
+    @property
+    def is_timeout(self):
+        return self.check()
+
+    @property
+    def deadline(self):
+        """
+        过期时刻, 不会过期时为 None
+        """
+        if self.time is None or self.check_time is False:
+            return None
+        return self.time + self._timeout
+
+    @property
+    def refresh_time(self):
+        """
+        设置后经过多少秒开始后台刷新, 没有 loader 时为 None
+        """
+        if self.loader is None:
+            return None
+        point = self._timeout
+        if self.soft_timeout is not None:
+            point = min(point, self.soft_timeout)
+        if self.refresh_ahead is not None:
+            point = min(point, self._timeout - self.refresh_ahead)
+        return point
+
+    @property
+    def is_stale(self):
+        """
+        已经软过期, 但还没有过期
+        """
+        if self.soft_timeout is None or self.time is None or self.check():
+            return False
+        return time.time() - self.time > self.soft_timeout
+
+    @property
+    def refreshing(self):
+        return self._refreshing
+
+    @property
+    def remain(self):
+        if self.check():
+            return 0
+        return self._timeout - (time.time() - self.time)
+
+    def delete(self):
+        """
+        Deletes the data.
+        """
+        if self.data is not None:
+            del self.data
+            self.data = None
+
+    def _check(self, now=None):
+        if self.time is None or self.check_time is False:
+            # If the time is not set, or if the check is disabled, return True.
+            return False
+
+        if (time.time() if now is None else now) - self.time > self._timeout:
+            if self.timeout_delete:
+                self.delete()
+
+            return True
+
+        return False
+
+    def check(self, now=None):
+        if self._is_timeout:
+            return self._is_timeout
+        self._is_timeout = self._check(now)
+        return self._is_timeout
+
+    def read(self, now=None):
+        """
+        返回数据; 设置了 loader 且已进入刷新区间 (软过期或提前刷新) 时启动一次后台刷新, 本次仍返回当前值, 不会阻塞
+        """
+        if self.loader is not None and not self._refreshing and self.time is not None:
+            age = (time.time() if now is None else now) - self.time
+            if self.refresh_time <= age <= self._timeout:
+                self.refresh()
+        return self.data
+
+    def refresh(self):
+        """
+        在后台调用 loader 重新加载数据, 同一时间只有一个刷新在进行
+        协程函数 loader 在当前事件循环中作为 Task 运行 (没有运行中的事件循环时在线程池中运行)
+        :return: 刷新的 Future / Task, 已经在刷新时返回 None
+        """
+        if self.loader is None:
+            raise ValueError("TimedData has no loader")
+        with _refresh_lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+
+        if inspect.iscoroutinefunction(self.loader):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return _get_refresh_executor().submit(asyncio.run, self._refresh_async())
+            task = loop.create_task(self._refresh_async())
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            return task
+        return _get_refresh_executor().submit(self._refresh_sync)
+
+    def _refresh_sync(self):
+        try:
+            self._loaded(self.loader())
+        except Exception as e:
+            self.refresh_error = e
+        finally:
+            self._refreshing = False
+
+    async def _refresh_async(self):
+        try:
+            self._loaded(await self.loader())
+        except Exception as e:
+            self.refresh_error = e
+        finally:
+            self._refreshing = False
+
+    def _loaded(self, value):
+        self.data = value
+        self.time = time.time()
+        self._is_timeout = False
+        self.refresh_error = None
+
+    def __get__(self, instance, owner):
+        if self.check():
+            return self.data
+        else:
+            raise TimeoutError("TimedData has timed out.")
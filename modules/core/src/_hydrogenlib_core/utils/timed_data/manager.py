@@ -0,0 +1,327 @@
+import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
+import threading
+import time
+
+from .data import TimedData
+from .policy import CacheStats, EvictionPolicy, make_policy
+
+
+_NO_LOCK = contextlib.nullcontext()
+
+
+def _unit_size(value):
+    return 1
+
+
+class Reaper:
+    """
+    后台清理: 定期调用 clean_up, 可以使用线程 (start_reaper) 或 asyncio 任务 (reap)
+    """
+    _reaper = None  # type: tuple[threading.Thread, threading.Event] | None
+
+    def clean_up(self, now=None) -> int:
+        raise NotImplementedError
+
+    def start_reaper(self, period=1.0):
+        """
+        启动后台线程, 每隔 period 秒调用一次 clean_up
+        """
+        if self._reaper is not None:
+            raise RuntimeError("Reaper is already running")
+        stop = threading.Event()
+        thread = threading.Thread(target=self._reap, args=(period, stop), name='timed-data-reaper', daemon=True)
+        self._reaper = (thread, stop)
+        thread.start()
+
+    def _reap(self, period, stop: threading.Event):
+        while not stop.wait(period):
+            self.clean_up()
+
+    def stop_reaper(self, timeout=None):
+        if self._reaper is None:
+            return
+        thread, stop = self._reaper
+        self._reaper = None
+        stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    async def reap(self, period=1.0):
+        """
+        asyncio 版本的后台清理, 用法: task = asyncio.create_task(manager.reap(1.0)), 取消 task 即停止
+        """
+        while True:
+            await asyncio.sleep(period)
+            self.clean_up()
+
+
+class TimedDataManager(Reaper):
+    """
+    带过期时间的键值存储
+
+    每个条目按过期时刻加入最小堆 (到期索引), clean_up 只弹出已经到期的条目, 不扫描全部数据。
+    被替换或删除的条目在堆中惰性失效, 失效条目过多时整体重建堆。
+
+    设置 max_entries 或 max_weight 后容量有限, 超出时按 policy ('lru' / 'lfu' / 'tinylfu' 或 EvictionPolicy 实例)
+    淘汰条目; 条目的权重由 sizer(value) 给出, 默认为 1。命中、未命中、淘汰和过期的次数记录在 stats 中。
+
+    设置 loader(key) 后, 条目在 soft_timeout / refresh_ahead 指定的刷新区间内被读取时在后台重新加载,
+    读取方继续得到旧值 (见 TimedData.read)。
+
+    *_threadsafe 方法总是加锁; 后台线程 (start_reaper) 运行期间, 普通方法也会加锁, 不会与 clean_up 同时修改数据。
+    """
+
+    def __init__(self, timeout=60, max_entries: int = None, max_weight: int = None, sizer=None,
+                 policy: str | EvictionPolicy = 'lru', loader=None, soft_timeout=None, refresh_ahead=None):
+        self.timeout = timeout
+        self.data = {}  # type: dict[str, TimedData]
+
+        self.loader = loader
+        self.soft_timeout = soft_timeout
+        self.refresh_ahead = refresh_ahead
+
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.sizer = sizer or _unit_size
+        self.weight = 0
+        self.stats = CacheStats()
+        self._weights = {} if max_weight is not None else None  # type: dict[str, int] | None
+        self._policy = None  # type: EvictionPolicy | None
+        if max_entries is not None or max_weight is not None:
+            self._policy = make_policy(policy, max_entries)
+
+        self._lock = threading.RLock()  # 可重入: *_threadsafe 方法持锁调用普通方法
+        self._expiry = []  # type: list[tuple[float, int, str, TimedData]]  # 到期索引 (过期时刻, 序号, 键, 条目)
+        self._counter = itertools.count()  # 过期时刻相同时按加入顺序排列, 避免比较键
+
+    def _index(self, key, item: TimedData):
+        deadline = item.deadline
+        if deadline is None:
+            return
+        heapq.heappush(self._expiry, (deadline, next(self._counter), key, item))
+        if len(self._expiry) > 2 * len(self.data) + 64:
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        counter = self._counter
+        self._expiry = [
+            (deadline, next(counter), key, item)
+            for key, item in self.data.items() if (deadline := item.deadline) is not None
+        ]
+        heapq.heapify(self._expiry)
+
+    def _guard(self):
+        """
+        后台线程在运行时返回锁, 否则不加锁 (单线程使用或调用方自己加锁)
+        """
+        return self._lock if self._reaper is not None else _NO_LOCK
+
+    @property
+    def policy(self) -> EvictionPolicy | None:
+        return self._policy
+
+    def _discard(self, key, notify=True) -> TimedData:
+        item = self.data.pop(key)
+        if self._weights is not None:
+            self.weight -= self._weights.pop(key, 0)
+        if notify and self._policy is not None:
+            self._policy.on_remove(key)
+        return item
+
+    def _expired(self, key):
+        self._discard(key)
+        self.stats.expirations += 1
+
+    def _hit(self, key):
+        self.stats.hits += 1
+        if self._policy is not None:
+            self._policy.on_hit(key)
+
+    def _miss(self, key):
+        self.stats.misses += 1
+        if self._policy is not None:
+            self._policy.on_miss(key)
+
+    def _over_capacity(self):
+        return (self.max_entries is not None and len(self.data) > self.max_entries or
+                self.max_weight is not None and self.weight > self.max_weight)
+
+    def _enforce_capacity(self):
+        while self.data and self._over_capacity():
+            self._discard(self._policy.evict(), notify=False).delete()
+            self.stats.evictions += 1
+
+    def check(self, key):
+        return self.data[key].check()
+
+    def delete(self, key):
+        with self._guard():
+            if key in self.data:
+                self._discard(key).delete()
+
+    def delete_threadsafe(self, key):
+        with self._lock:
+            self.delete(key)
+
+    def delete_multiple(self, keys):
+        for key in keys:
+            self.delete(key)
+
+    def delete_multiple_threadsafe(self, keys):
+        with self._lock:
+            self.delete_multiple(keys)
+
+    def extend(self, dic):
+        for key, value in dic._instances():
+            self.add(key, value)
+
+    def extend_threadsafe(self, dic):
+        with self._lock:
+            self.extend(dic)
+
+    def get_multiple(self, keys):
+        with self._guard():
+            return {key: self.get_data(key) for key in keys if self.exists(key)}
+
+    def get_multiple_threadsafe(self, keys):
+        with self._lock:
+            return self.get_multiple(keys)
+
+    def _new_data(self, key, value, timeout, now=None):
+        if self.loader is None:
+            return TimedData(value, timeout=self.timeout if timeout is None else timeout, now=now)
+        return TimedData(
+            value, timeout=self.timeout if timeout is None else timeout, now=now,
+            loader=functools.partial(self.loader, key), soft_timeout=self.soft_timeout,
+            refresh_ahead=self.refresh_ahead
+        )
+
+    def add(self, key, value, timeout=None):
+        self.add_data(key, self._new_data(key, value, timeout))
+
+    def get(self, key):
+        return self.get_data(key).read()
+
+    def add_data(self, key, data):
+        with self._guard():
+            replaced = key in self.data
+            self.data[key] = data
+            if self._weights is not None:
+                weight = self.sizer(data.data)
+                self.weight += weight - self._weights.get(key, 0)
+                self._weights[key] = weight
+            self._index(key, data)
+
+            if self._policy is not None:
+                if replaced:
+                    self._policy.on_hit(key)
+                else:
+                    self._policy.on_insert(key)
+                self._enforce_capacity()
+
+    def get_data(self, key):
+        with self._guard():
+            item = self.data.get(key)
+            if item is None:
+                self._miss(key)
+                raise KeyError(key)
+            if not item.check():
+                self._hit(key)
+                return item
+            self._expired(key)
+            self._miss(key)
+            raise KeyError(key)
+
+    def add_threadsafe(self, key, value, timeout=None):
+        with self._lock:
+            self.add(key, value, timeout=timeout)
+
+    def get_threadsafe(self, key):
+        with self._lock:
+            return self.get(key)
+
+    def add_data_threadsafe(self, key, data):
+        with self._lock:
+            self.add_data(key, data)
+
+    def add_many(self, items, timeout=None):
+        """
+        批量加入, 只读取一次时钟
+        :param items: 字典或 (键, 值) 序列
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        now = time.time()
+        with self._guard():
+            for key, value in items:
+                self.add_data(key, self._new_data(key, value, timeout, now))
+
+    def add_many_threadsafe(self, items, timeout=None):
+        with self._lock:
+            self.add_many(items, timeout)
+
+    def get_many(self, keys) -> dict:
+        """
+        批量读取未过期的值, 只读取一次时钟; 已过期的键被删除, 不出现在结果中
+        """
+        now = time.time()
+        data = self.data
+        result = {}
+        with self._guard():
+            for key in keys:
+                item = data.get(key)
+                if item is None:
+                    self._miss(key)
+                elif item.check(now):
+                    self._expired(key)
+                    self._miss(key)
+                else:
+                    self._hit(key)
+                    result[key] = item.read(now)
+        return result
+
+    def get_many_threadsafe(self, keys) -> dict:
+        with self._lock:
+            return self.get_many(keys)
+
+    def exists(self, key):
+        return key in self.data and not self.check(key)
+
+    def clear(self):
+        with self._guard():
+            self.data.clear()
+            self._expiry.clear()
+            self.weight = 0
+            if self._weights is not None:
+                self._weights.clear()
+            if self._policy is not None:
+                self._policy.clear()
+
+    def clean_up(self, now=None) -> int:
+        """
+        删除已过期的数据, 只访问到期索引中已经到期的条目
+        :return: 删除的条目数
+        """
+        if now is None:
+            now = time.time()
+        removed = 0
+        with self._lock:
+            expiry, data = self._expiry, self.data
+            while expiry and expiry[0][0] < now:
+                _, _, key, item = heapq.heappop(expiry)
+                if data.get(key) is not item:
+                    continue  # 跳过已被替换或删除的条目
+                if item.check(now):
+                    item.delete()
+                    self._expired(key)
+                    removed += 1
+                elif (deadline := item.deadline) is not None:  # 被刷新后过期时刻推迟了
+                    heapq.heappush(expiry, (deadline, next(self._counter), key, item))
+        return removed
+
+    def __len__(self):
+        return len(self.data)
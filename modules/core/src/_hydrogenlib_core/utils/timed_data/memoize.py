@@ -0,0 +1,196 @@
+import asyncio
+import functools
+import inspect
+import threading
+import types
+from concurrent.futures import Future
+
+from .manager import TimedDataManager
+
+_KWARGS_MARK = object()  # 分隔位置参数与关键字参数
+
+
+class _Failure:
+    """
+    被缓存的异常 (负缓存), 命中时重新抛出
+    """
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class TimedMemoized:
+    """
+    timed_memoize 装饰同步函数得到的对象
+
+    同一个键同时只有一个调用者执行函数, 其他线程等待同一个 Future 并得到相同的结果 (或异常)。
+    调用时可以用关键字参数 cache_ttl 单独指定这次结果的有效期, cache_ttl=0 表示不缓存。
+    """
+
+    def __init__(self, func, manager: TimedDataManager, timeout=60, error_timeout=0, typed=False):
+        self.func = func
+        self.cache = manager
+        self.timeout = timeout
+        self.error_timeout = error_timeout
+        self.typed = typed
+        self._in_flight = {}  # type: dict
+        self._lock = threading.Lock()
+        try:
+            self._signature = inspect.signature(func)
+        except (TypeError, ValueError):  # 部分内置函数没有签名
+            self._signature = None
+        functools.update_wrapper(self, func)
+
+    def make_key(self, args, kwargs):
+        """
+        规范化参数: 按签名绑定并补全默认值, f(1) 与 f(x=1) 得到相同的键
+        """
+        if self._signature is not None:
+            bound = self._signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            args, kwargs = bound.args, bound.kwargs
+        key = args
+        if kwargs:
+            key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+        if self.typed:
+            key += tuple(type(v) for v in args) + tuple(type(v) for v in kwargs.values())
+        return key
+
+    def _ttl(self, value, cache_ttl):
+        if cache_ttl is not None:
+            return cache_ttl
+        return self.timeout(value) if callable(self.timeout) else self.timeout
+
+    def _peek(self, key):
+        # 不计入统计的快速检查
+        item = self.cache.data.get(key)
+        if item is not None and not item.check():
+            return True, item.data
+        return False, None
+
+    @staticmethod
+    def _unwrap(value):
+        if type(value) is _Failure:
+            raise value.error
+        return value
+
+    def _store(self, key, value, ttl):
+        self.cache.add_threadsafe(key, value, ttl)
+
+    def _remember(self, key, value, cache_ttl):
+        ttl = self._ttl(value, cache_ttl)
+        if ttl is None or ttl > 0:  # 有效期 <= 0 表示不缓存这次的结果
+            self._store(key, value, ttl)
+
+    def _store_error(self, key, error):
+        if self.error_timeout and isinstance(error, Exception):
+            self._store(key, _Failure(error), self.error_timeout)
+
+    def __call__(self, *args, cache_ttl=None, **kwargs):
+        key = self.make_key(args, kwargs)
+        found = self.cache.get_many_threadsafe((key,))
+        if key in found:
+            return self._unwrap(found[key])
+
+        with self._lock:
+            hit, value = self._peek(key)  # 另一个线程可能刚刚完成计算
+            if hit:
+                return self._unwrap(value)
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self.func(*args, **kwargs)
+        except BaseException as e:
+            self._store_error(key, e)
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        self._remember(key, value, cache_ttl)  # 先写入缓存再移除 Future, 中间不会出现空档
+        with self._lock:
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def invalidate(self, *args, **kwargs):
+        self.cache.delete_threadsafe(self.make_key(args, kwargs))
+
+    def cache_clear(self):
+        with self.cache._lock:
+            self.cache.clear()
+
+
+class AsyncTimedMemoized(TimedMemoized):
+    """
+    timed_memoize 装饰协程函数得到的对象
+
+    同一个键同时只有一个 Task 在计算, 其他调用者等待同一个 Task;
+    等待者被取消不会取消计算本身, 计算完成后结果照常写入缓存。
+    """
+
+    def _store(self, key, value, ttl):
+        self.cache.add(key, value, ttl)
+
+    async def __call__(self, *args, cache_ttl=None, **kwargs):
+        key = self.make_key(args, kwargs)
+        found = self.cache.get_many((key,))
+        if key in found:
+            return self._unwrap(found[key])
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(self.func(*args, **kwargs))
+            task.add_done_callback(functools.partial(self._finish, key, cache_ttl))
+        return await asyncio.shield(task)
+
+    def _finish(self, key, cache_ttl, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        if (error := task.exception()) is not None:
+            self._store_error(key, error)
+        else:
+            self._remember(key, task.result(), cache_ttl)
+
+    def invalidate(self, *args, **kwargs):
+        self.cache.delete(self.make_key(args, kwargs))
+
+    def cache_clear(self):
+        self.cache.clear()
+
+
+def timed_memoize(func=None, *, timeout=60, error_timeout=0, typed=False, manager: TimedDataManager = None,
+                  **options):
+    """
+    带过期时间的单飞 (single-flight) 记忆化装饰器, 可用于同步函数和协程函数
+
+    :param timeout: 结果的有效期 (秒), 也可以是根据结果返回有效期的函数
+    :param error_timeout: 大于 0 时把抛出的异常缓存这么多秒 (负缓存), 期间直接重新抛出
+    :param typed: 为 True 时 f(1) 与 f(1.0) 分开缓存
+    :param manager: 存放结果的 TimedDataManager, 默认新建一个; options 传给新建的 TimedDataManager (如 max_entries)
+    """
+
+    def decorator(func):
+        cache = manager if manager is not None else TimedDataManager(60 if callable(timeout) else timeout, **options)
+        cls = AsyncTimedMemoized if inspect.iscoroutinefunction(func) else TimedMemoized
+        return cls(func, cache, timeout, error_timeout, typed)
+
+    return decorator if func is None else decorator(func)
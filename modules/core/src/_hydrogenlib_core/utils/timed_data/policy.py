@@ -0,0 +1,231 @@
+import dataclasses as dc
+from collections import OrderedDict
+from typing import Hashable
+
+from ...data_structures.count_min_sketch import CountMinSketch
+
+
+@dc.dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # 因容量限制被淘汰
+    expirations: int = 0  # 因过期被删除
+
+    @property
+    def requests(self):
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def reset(self):
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+class EvictionPolicy:
+    """
+    淘汰策略: 由 TimedDataManager 在访问、加入和删除时通知, 超出容量时调用 evict 选出要淘汰的键
+    """
+
+    def on_insert(self, key: Hashable):
+        raise NotImplementedError
+
+    def on_hit(self, key: Hashable):
+        raise NotImplementedError
+
+    def on_miss(self, key: Hashable):
+        pass
+
+    def on_remove(self, key: Hashable):
+        raise NotImplementedError
+
+    def evict(self) -> Hashable:
+        """
+        选出并移除一个要淘汰的键
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class LRUPolicy(EvictionPolicy):
+    """
+    最近最少使用, 所有操作 O(1)
+    """
+
+    def __init__(self):
+        self._order = OrderedDict()  # 最早访问的在前
+
+    def on_insert(self, key):
+        self._order[key] = None
+
+    def on_hit(self, key):
+        self._order.move_to_end(key)
+
+    def on_remove(self, key):
+        self._order.pop(key, None)
+
+    def evict(self):
+        return self._order.popitem(last=False)[0]
+
+    def clear(self):
+        self._order.clear()
+
+    def __len__(self):
+        return len(self._order)
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    最不经常使用, 频率相同时淘汰最早的; 按频率分桶, 访问和淘汰 O(1)
+    """
+
+    def __init__(self):
+        self._freq = {}  # type: dict[Hashable, int]
+        self._buckets = {}  # type: dict[int, dict[Hashable, None]]  # 频率 -> 按加入顺序排列的键
+        self._min = 0
+
+    def _unlink(self, key, freq):
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def on_insert(self, key):
+        self._freq[key] = 1
+        self._buckets.setdefault(1, {})[key] = None
+        self._min = 1
+
+    def on_hit(self, key):
+        freq = self._freq[key]
+        self._unlink(key, freq)
+        if self._min == freq and freq not in self._buckets:
+            self._min = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, {})[key] = None
+
+    def on_remove(self, key):
+        freq = self._freq.pop(key, None)
+        if freq is not None:
+            self._unlink(key, freq)
+
+    def evict(self):
+        if self._min not in self._buckets:  # 最小频率的桶因删除而变空, 只有这时才需要查找
+            self._min = min(self._buckets)
+        bucket = self._buckets[self._min]
+        key = next(iter(bucket))
+        self._unlink(key, self._min)
+        del self._freq[key]
+        return key
+
+    def clear(self):
+        self._freq.clear()
+        self._buckets.clear()
+        self._min = 0
+
+    def __len__(self):
+        return len(self._freq)
+
+
+class TinyLFUPolicy(EvictionPolicy):
+    """
+    W-TinyLFU: 新键先进入小的 LRU 窗口, 超出窗口的键进入主区 (分段 LRU: 试用区 + 保护区) 的试用区;
+    需要淘汰时, 最近从窗口进入试用区的候选键与试用区最久未用的键比较 Count-Min 草图估计的访问频率,
+    频率更高者留下。一次性扫描的大量新键无法挤掉热点数据。
+
+    :param capacity: 预计的条目数, 决定草图的大小
+    :param window_ratio: 窗口占全部条目的比例
+    :param protected_ratio: 保护区占主区的比例
+    """
+
+    def __init__(self, capacity: int = 1024, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        self.window_ratio = window_ratio
+        self.protected_ratio = protected_ratio
+        self.sketch = CountMinSketch(capacity)
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._candidates = []  # type: list[Hashable]  # 从窗口进入试用区、还未经过比较的键
+
+    def on_insert(self, key):
+        self.sketch.increment(key)
+        window = self._window
+        window[key] = None
+        if len(window) > max(1, int(len(self) * self.window_ratio)):
+            candidate, _ = window.popitem(last=False)
+            self._probation[candidate] = None
+            self._candidates.append(candidate)
+            if len(self._candidates) > 2 * len(self._probation) + 64:  # 去掉已晋升或删除的候选键
+                self._candidates = [c for c in self._candidates if c in self._probation]
+
+    def on_miss(self, key):
+        self.sketch.increment(key)
+
+    def on_hit(self, key):
+        self.sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None  # 试用区中再次被访问的键晋升到保护区
+            if len(self._protected) > self.protected_ratio * (len(self._probation) + len(self._protected)):
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        else:
+            self._protected.move_to_end(key)
+
+    def on_remove(self, key):
+        for segment in (self._window, self._probation, self._protected):
+            if segment.pop(key, 0) is None:
+                return
+
+    def evict(self):
+        probation = self._probation
+        candidates = self._candidates
+        while candidates:
+            candidate = candidates.pop()
+            if candidate not in probation:
+                continue  # 已被访问晋升或删除
+            victim = next(iter(probation))
+            if victim != candidate and self.sketch.estimate(candidate) <= self.sketch.estimate(victim):
+                victim = candidate  # 候选者不比试用区最久未用的键更热, 拒绝进入
+            del probation[victim]
+            return victim
+
+        for segment in (probation, self._protected, self._window):
+            if segment:
+                return segment.popitem(last=False)[0]
+        raise KeyError("evict from an empty policy")
+
+    def clear(self):
+        self.sketch.clear()
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._candidates.clear()
+
+    def __len__(self):
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+
+_POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'tinylfu': TinyLFUPolicy,
+}
+
+
+def make_policy(policy: str | EvictionPolicy, capacity: int = None) -> EvictionPolicy:
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy not in _POLICIES:
+        raise ValueError(f"Unknown eviction policy {policy!r}")
+    if policy == 'tinylfu':
+        return TinyLFUPolicy(capacity or 1024)
+    return _POLICIES[policy]()
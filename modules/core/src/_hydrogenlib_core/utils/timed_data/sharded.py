@@ -0,0 +1,115 @@
+from typing import Callable
+
+from .manager import Reaper, TimedDataManager
+from .policy import CacheStats, EvictionPolicy
+
+
+class ShardedTimedDataManager(Reaper):
+    """
+    分片的 TimedDataManager: 按键的哈希分到 shards 个独立的分片, 每个分片有自己的锁和到期索引,
+    不同分片上的操作互不阻塞。所有方法都是线程安全的。
+
+    容量限制 (max_entries / max_weight) 平均分给各分片; policy 为策略名或返回 EvictionPolicy 的工厂函数。
+    其余参数 (loader / soft_timeout / refresh_ahead) 原样传给每个分片。
+    clean_up / clear / stats 会遍历所有分片。
+    """
+
+    def __init__(self, shards: int = 16, timeout=60, max_entries: int = None, max_weight: int = None, sizer=None,
+                 policy: str | Callable[[], EvictionPolicy] = 'lru', **options):
+        if shards < 1:
+            raise ValueError("shards must be positive")
+        self.timeout = timeout
+        self.shards = [
+            TimedDataManager(
+                timeout,
+                max_entries=None if max_entries is None else -(-max_entries // shards),
+                max_weight=None if max_weight is None else -(-max_weight // shards),
+                sizer=sizer,
+                policy=policy if isinstance(policy, str) else policy(),
+                **options
+            ) for _ in range(shards)
+        ]
+
+    def shard_for(self, key) -> TimedDataManager:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def _group(self, keys) -> dict[int, list]:
+        groups = {}
+        n = len(self.shards)
+        for key in keys:
+            groups.setdefault(hash(key) % n, []).append(key)
+        return groups
+
+    def add(self, key, value, timeout=None):
+        self.shard_for(key).add_threadsafe(key, value, timeout)
+
+    def add_data(self, key, data):
+        self.shard_for(key).add_data_threadsafe(key, data)
+
+    def get(self, key):
+        return self.shard_for(key).get_threadsafe(key)
+
+    def get_data(self, key):
+        shard = self.shard_for(key)
+        with shard._lock:
+            return shard.get_data(key)
+
+    def delete(self, key):
+        self.shard_for(key).delete_threadsafe(key)
+
+    def exists(self, key):
+        shard = self.shard_for(key)
+        with shard._lock:
+            return shard.exists(key)
+
+    def add_many(self, items, timeout=None):
+        if hasattr(items, 'items'):
+            items = items.items()
+        groups = {}
+        n = len(self.shards)
+        for key, value in items:
+            groups.setdefault(hash(key) % n, []).append((key, value))
+        for index, group in groups.items():
+            self.shards[index].add_many_threadsafe(group, timeout)
+
+    def get_many(self, keys) -> dict:
+        result = {}
+        for index, group in self._group(keys).items():
+            result.update(self.shards[index].get_many_threadsafe(group))
+        return result
+
+    def delete_multiple(self, keys):
+        for index, group in self._group(keys).items():
+            self.shards[index].delete_multiple_threadsafe(group)
+
+    def clean_up(self, now=None) -> int:
+        return sum(shard.clean_up(now) for shard in self.shards)
+
+    def clear(self):
+        for shard in self.shards:
+            with shard._lock:
+                shard.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        各分片统计的总和 (快照)
+        """
+        total = CacheStats()
+        for shard in self.shards:
+            stats = shard.stats
+            total.hits += stats.hits
+            total.misses += stats.misses
+            total.evictions += stats.evictions
+            total.expirations += stats.expirations
+        return total
+
+    def reset_stats(self):
+        for shard in self.shards:
+            shard.stats.reset()
+
+    def __contains__(self, key):
+        return self.exists(key)
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
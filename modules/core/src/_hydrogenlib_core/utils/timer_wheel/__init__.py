@@ -1,3 +1,6 @@
 from .core import get_current_ms, TaskType as TaskKind
 from .task import Task
-from .wheel import Wheel, MultiWheel
+from .dispatch import Dispatcher, InlineDispatcher, ExecutorDispatcher, AsyncioDispatcher, BatchDispatcher, call_key
+from .compact import CompactWheelCore, CompactTask
+from .wheel import Wheel, HierarchicalWheel, MultiWheel
+from .driver import WheelDriver, ThreadWheelDriver, AsyncioWheelDriver
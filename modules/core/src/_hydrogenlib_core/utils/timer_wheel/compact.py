@@ -0,0 +1,394 @@
+from array import array
+from typing import Callable, Hashable, Sequence
+
+from .core import WheelBase, get_current_ms
+
+# flags 中的标志位
+_VALID = 1  # 记录已分配且未取消
+_CYCLE = 2  # 周期任务
+_PAUSED = 4  # 已暂停, 暂停的时刻记录在 _paused_at 中
+_STAR = 8  # key 是参数元组, 以 callback(*key) 调用
+
+_INDEX_MASK = 0xFFFFFFFF
+
+
+class CompactWheelCore(WheelBase):
+    """
+    结构数组 (SoA) 存储的时间轮, 用于同时挂起上百万个定时器
+
+    每个任务只占用并行数组中的一行: 截止时间、延迟、链表前后指针、所在槽、回调编号、标志位和 key,
+    不为每个任务创建对象。回调保存在共享的回调表中, 适合 "同一个回调, 不同的 key" 的场景,
+    到期时以 callback(key) 调用。释放的行通过空闲链表复用。
+
+    任务由整数句柄标识 (行号 | 代数 << 32), 行被复用后旧句柄自动失效。
+    """
+
+    def __init__(self, slots: int | Sequence[int], granularity_ms: int, clock: Callable[[], int] = get_current_ms,
+                 dispatcher=None):
+        super().__init__(slots, granularity_ms, clock, dispatcher)
+
+        self.slot_offsets = [0]  # 每层第一个槽的全局编号
+        for n in self.levels:
+            self.slot_offsets.append(self.slot_offsets[-1] + n)
+        total = self.slot_offsets[-1]
+        self.heads = array('q', [-1]) * total
+        self.tails = array('q', [-1]) * total
+        self._slot_level = array('b', [level for level, n in enumerate(self.levels) for _ in range(n)])
+
+        self.deadlines = array('q')
+        self.delays = array('q')
+        self.prev = array('q')
+        self.next = array('q')
+        self.where = array('q')  # 所在的全局槽编号, -1 表示不在槽中
+        self.callback_ids = array('I')
+        self.generations = array('I')
+        self.flags = bytearray()
+        self.keys = []  # type: list
+
+        self.callbacks = []  # type: list[Callable]
+        self._callback_ids = {}  # type: dict[Callable, int]
+        self.tasks_by_id = {}  # type: dict[Hashable, int]
+        self._row_ids = {}  # type: dict[int, Hashable]
+        self._paused_at = {}  # type: dict[int, int]  # 暂停中的行 -> 暂停的时刻
+        self._free = -1
+        self._count = 0
+
+    # 回调表
+
+    def register_callback(self, callback: Callable) -> int:
+        """
+        把回调加入共享的回调表, 返回它的编号 (同一个回调只登记一次)
+        """
+        index = self._callback_ids.get(callback)
+        if index is None:
+            index = self._callback_ids[callback] = len(self.callbacks)
+            self.callbacks.append(callback)
+        return index
+
+    # 行的分配与释放
+
+    def _alloc(self) -> int:
+        i = self._free
+        if i >= 0:
+            self._free = self.next[i]
+            return i
+
+        i = len(self.flags)
+        self.deadlines.append(0)
+        self.delays.append(0)
+        self.prev.append(-1)
+        self.next.append(-1)
+        self.where.append(-1)
+        self.callback_ids.append(0)
+        self.generations.append(0)
+        self.flags.append(0)
+        self.keys.append(None)
+        return i
+
+    def _release(self, i):
+        if self._row_ids and (task_id := self._row_ids.pop(i, None)) is not None:
+            self.tasks_by_id.pop(task_id, None)
+        if self.flags[i] & _PAUSED:
+            del self._paused_at[i]
+        self.keys[i] = None
+        self.flags[i] = 0
+        self.generations[i] = (self.generations[i] + 1) & _INDEX_MASK
+        self.where[i] = -1
+        self.next[i] = self._free
+        self._free = i
+        self._count -= 1
+
+    def _row(self, handle: int) -> int:
+        i = handle & _INDEX_MASK
+        if i < len(self.flags) and self.flags[i] & _VALID and self.generations[i] == handle >> 32:
+            return i
+        raise KeyError(f"invalid or expired timer handle {handle}")
+
+    # 链表操作
+
+    def _place(self, i, earliest=None):
+        level, index = self._locate(self.deadlines[i], earliest)
+        slot = self.slot_offsets[level] + index
+        tail = self.tails[slot]
+        self.prev[i] = tail
+        self.next[i] = -1
+        if tail < 0:
+            self.heads[slot] = i
+        else:
+            self.next[tail] = i
+        self.tails[slot] = i
+        self.where[i] = slot
+        self.occupied[level] |= 1 << index
+
+    def _unlink(self, i):
+        slot = self.where[i]
+        if slot < 0:
+            return
+        prev, next = self.prev[i], self.next[i]
+        if prev < 0:
+            self.heads[slot] = next
+        else:
+            self.next[prev] = next
+        if next < 0:
+            self.tails[slot] = prev
+        else:
+            self.prev[next] = prev
+        self.where[i] = -1
+        if self.heads[slot] < 0:
+            level = self._slot_level[slot]
+            self.occupied[level] &= ~(1 << (slot - self.slot_offsets[level]))
+
+    def _take(self, level, index) -> list[int]:
+        slot = self.slot_offsets[level] + index
+        rows = []
+        i = self.heads[slot]
+        while i >= 0:
+            rows.append(i)
+            self.where[i] = -1
+            i = self.next[i]
+        self.heads[slot] = self.tails[slot] = -1
+        self.occupied[level] &= ~(1 << index)
+        return rows
+
+    # 任务接口
+
+    def add(self, callback: Callable | int, key=None, delay: int = 0, cycle=False, id: Hashable = None,
+            star=False) -> int:
+        """
+        加入任务, 到期时调用 callback(key) (star 为 True 时调用 callback(*key))
+        :param callback: 回调, 或 register_callback 返回的编号
+        :return: 任务句柄
+        """
+        callback_id = callback if isinstance(callback, int) else self.register_callback(callback)
+        i = self._alloc()
+        self.deadlines[i] = self.clock() + delay
+        self.delays[i] = delay
+        self.callback_ids[i] = callback_id
+        self.flags[i] = _VALID | (_CYCLE if cycle else 0) | (_STAR if star else 0)
+        self.keys[i] = key
+        self._count += 1
+        self._place(i)
+
+        handle = self.generations[i] << 32 | i
+        if id is not None:
+            if (old := self.tasks_by_id.get(id)) is not None:
+                self._row_ids.pop(old & _INDEX_MASK, None)
+            self.tasks_by_id[id] = handle
+            self._row_ids[i] = id
+        return handle
+
+    def is_pending(self, handle: int) -> bool:
+        i = handle & _INDEX_MASK
+        return i < len(self.flags) and bool(self.flags[i] & _VALID) and self.generations[i] == handle >> 32
+
+    def remove(self, handle: int):
+        """
+        取消任务, 它所在的行立即被释放
+        """
+        i = self._row(handle)
+        self._unlink(i)
+        self._release(i)
+
+    def cancel(self, task_id):
+        handle = self.tasks_by_id.get(task_id)
+        if handle is not None:
+            self.remove(handle)
+
+    def pause(self, handle: int):
+        i = self._row(handle)
+        if self.flags[i] & _PAUSED:
+            return
+        self._unlink(i)
+        self._paused_at[i] = self.clock()
+        self.flags[i] |= _PAUSED
+
+    def resume(self, handle: int):
+        i = self._row(handle)
+        if not self.flags[i] & _PAUSED:
+            return
+        self.flags[i] &= ~_PAUSED
+        now = self.clock()
+        self.deadlines[i] = now + max(0, self.deadlines[i] - self._paused_at.pop(i))  # 剩余时间从现在开始计算
+        self._place(i)
+
+    def reschedule(self, handle: int, delay: int = None, restart=True):
+        """
+        原地移动任务: 修改延迟 (delay 不为 None 时), restart 为 True 时从现在开始重新计时,
+        否则保留已经过的时间, 只按新的延迟调整到期时刻
+        """
+        i = self._row(handle)
+        self._unlink(i)
+        old = self.delays[i]
+        if delay is not None:
+            self.delays[i] = delay
+        if restart:
+            now = self.clock()
+            self.deadlines[i] = now + self.delays[i]
+            if self.flags[i] & _PAUSED:
+                self._paused_at[i] = now
+        else:
+            self.deadlines[i] += self.delays[i] - old
+        if not self.flags[i] & _PAUSED:
+            self._place(i)
+
+    def remaining(self, handle: int) -> int:
+        i = self._row(handle)
+        if self.flags[i] & _PAUSED:
+            return max(0, self.deadlines[i] - self._paused_at[i])
+        return self.deadlines[i] - self.clock()
+
+    def start_time(self, handle: int) -> int:
+        """
+        开始计时的时刻; 恢复暂停的任务时会按暂停的时长推后
+        """
+        i = self._row(handle)
+        return self.deadlines[i] - self.delays[i]
+
+    # 时间轮推进
+
+    def _cascade(self, tick):
+        for level in range(len(self.levels) - 1, 0, -1):
+            unit = self.units[level]
+            if tick % unit:
+                continue
+            for i in self._take(level, (tick // unit) % self.levels[level]):
+                self._place(i, tick)
+
+    def _expire(self, tick):
+        dispatcher = self.dispatcher
+        if dispatcher is not None and not dispatcher.inline:
+            return dispatcher.dispatch(self._calls(self._due_rows(tick)))
+        return self._run(self._due_rows(tick))
+
+    def _due_rows(self, tick) -> list[int]:
+        """
+        取出第 0 层当前槽中已经到期的行, 未到期 (超出最高层范围) 的行重新放入
+        """
+        due = []
+        limit = tick * self.granularity_ms
+        for i in self._take(0, tick % self.levels[0]):
+            if self.deadlines[i] > limit:
+                self._place(i)
+            else:
+                due.append(i)
+        return due
+
+    def _run(self, rows) -> list[Exception]:
+        errors = []
+        flags, keys, callbacks, callback_ids = self.flags, self.keys, self.callbacks, self.callback_ids
+        for i in rows:
+            if self.where[i] >= 0 or not flags[i] & _VALID or flags[i] & _PAUSED:
+                continue  # 被前面的回调移动、取消或暂停
+
+            generation = self.generations[i]
+            try:
+                if flags[i] & _STAR:
+                    callbacks[callback_ids[i]](*keys[i])
+                else:
+                    callbacks[callback_ids[i]](keys[i])
+            except Exception as e:
+                errors.append(e)
+
+            if self.generations[i] != generation or self.where[i] >= 0 or flags[i] & _PAUSED:
+                continue  # 回调中取消 / 重设 / 暂停了自己
+            if flags[i] & _CYCLE:
+                self.deadlines[i] = self.clock() + self.delays[i]
+                self._place(i)
+            else:
+                self._release(i)
+        return errors
+
+    def _calls(self, rows) -> list[tuple]:
+        """
+        先完成到期行的状态更新 (周期任务重新放入, 单次任务释放), 再返回待派发的调用;
+        单次任务的句柄在回调执行前就已失效
+        """
+        calls = []
+        flags, keys, callbacks, callback_ids = self.flags, self.keys, self.callbacks, self.callback_ids
+        for i in rows:
+            key = keys[i]
+            calls.append((callbacks[callback_ids[i]], key if flags[i] & _STAR else (key,), {}))
+            if flags[i] & _CYCLE:
+                self.deadlines[i] = self.clock() + self.delays[i]
+                self._place(i)
+            else:
+                self._release(i)
+        return calls
+
+    @property
+    def pending(self) -> int:
+        """
+        未取消、未执行完的任务数
+        """
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """
+        并行数组占用的字节数 (不含 keys 中的对象本身)
+        """
+        arrays = (self.deadlines, self.delays, self.prev, self.next, self.where, self.callback_ids, self.generations)
+        return sum(a.itemsize * len(a) for a in arrays) + len(self.flags) + 8 * len(self.keys)
+
+
+class CompactTask:
+    """
+    CompactWheelCore 中任务的句柄包装, 接口与 Task 相同
+    创建时记下回调、参数和延迟, 任务执行或取消 (行被释放) 后 delay 仍返回原来的延迟, reset 会重新加入任务
+    """
+    __slots__ = ('_core', '_handle', 'id', '_callback_id', '_key', '_flags', '_delay')
+
+    def __init__(self, core: CompactWheelCore, handle: int, id=None):
+        i = core._row(handle)
+        self._core = core
+        self._handle = handle
+        self.id = id
+        self._callback_id = core.callback_ids[i]
+        self._key = core.keys[i]
+        self._flags = core.flags[i]
+        self._delay = core.delays[i]
+
+    @property
+    def handle(self) -> int:
+        return self._handle
+
+    def activity(self, activity: bool = None):
+        core, i = self._core, self._handle & _INDEX_MASK
+        if activity is None:
+            return not core.flags[i] & _PAUSED if core.is_pending(self._handle) else True
+        if activity:
+            core.resume(self._handle)
+        else:
+            core.pause(self._handle)
+
+    def cancel(self):
+        if self._core.is_pending(self._handle):
+            self._core.remove(self._handle)
+
+    def is_canceled(self):
+        return not self._core.is_pending(self._handle)
+
+    def delay(self, delay: int = None):
+        if delay is None:
+            return self._delay
+        self._delay = delay
+        if self._core.is_pending(self._handle):
+            self._core.reschedule(self._handle, delay, restart=False)
+
+    def reset(self, delay: int = None):
+        """
+        从现在开始重新计时 (可同时修改延迟); 已执行或已取消的任务会被重新加入, 得到新的句柄
+        """
+        if delay is not None:
+            self._delay = delay
+        core = self._core
+        if core.is_pending(self._handle):
+            core.reschedule(self._handle, delay)
+            return
+        flags = self._flags
+        self._handle = core.add(self._callback_id, self._key, self._delay, bool(flags & _CYCLE), self.id,
+                                star=bool(flags & _STAR))
+
+    @property
+    def start_time(self):
+        return self._core.start_time(self._handle)
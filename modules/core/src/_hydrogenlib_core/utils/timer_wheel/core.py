@@ -1,8 +1,7 @@
 import dataclasses as dc
 import enum
 import time
-from collections import deque
-from typing import Callable
+from typing import Callable, Sequence
 
 
 class MultiError(Exception):
@@ -18,7 +17,7 @@ class MultiError(Exception):
 
 
 def get_current_ms():
-    return int(time.monotonic())
+    return time.monotonic_ns() // 1_000_000
 
 
 class TaskType(str, enum.Enum):
@@ -27,8 +26,8 @@ class TaskType(str, enum.Enum):
     cycle = "cycle"
 
 
-@dc.dataclass
-class TaskData[A, R]:
+@dc.dataclass(slots=True)
+class TaskData[*A, R]:
     callback: Callable[[*A], R]
     args: tuple
     kwargs: dict
@@ -40,10 +39,20 @@ class TaskData[A, R]:
     round: int = 0
     type: str = TaskType.single
     activity: bool = True
+    remaining: int | None = dc.field(default=None, repr=False)  # 暂停时剩余的毫秒数
+
+    # 侵入式双向链表的指针, 由 Slot 维护
+    _prev: 'TaskData | None' = dc.field(default=None, init=False, repr=False, compare=False)
+    _next: 'TaskData | None' = dc.field(default=None, init=False, repr=False, compare=False)
+    _slot: 'Slot | None' = dc.field(default=None, init=False, repr=False, compare=False)
 
     def __call__(self) -> R:
         return self.callback(*self.args, **self.kwargs)
 
+    @property
+    def deadline(self):
+        return self.start_time + self.delay
+
     @property
     def remaining_time(self):
         return self.delay - (get_current_ms() - self.start_time)
@@ -54,82 +63,349 @@ class TaskData[A, R]:
 
 
 class Slot:
-    def __init__(self):
-        self.tasks = deque()  # type: deque[TaskData]
+    """
+    侵入式双向链表, 任务自身保存前后指针, 加入和移除都是 O(1) 且不分配内存
+    """
+    __slots__ = ('head', 'tail', 'size', 'level', 'index')
+
+    def __init__(self, level=0, index=0):
+        self.head = None  # type: TaskData | None
+        self.tail = None  # type: TaskData | None
+        self.size = 0
+        self.level = level
+        self.index = index
 
     def push(self, task):
-        self.tasks.append(task)
+        task._slot = self
+        task._prev = self.tail
+        task._next = None
+        if self.tail is None:
+            self.head = task
+        else:
+            self.tail._next = task
+        self.tail = task
+        self.size += 1
+
+    def remove(self, task):
+        prev, next = task._prev, task._next
+        if prev is None:
+            self.head = next
+        else:
+            prev._next = next
+        if next is None:
+            self.tail = prev
+        else:
+            next._prev = prev
+        task._prev = task._next = task._slot = None
+        self.size -= 1
 
     def pop(self):
-        return self.tasks.popleft()
+        task = self.head
+        if task is None:
+            raise IndexError("pop from an empty slot")
+        self.remove(task)
+        return task
+
+    def take(self) -> list[TaskData]:
+        """
+        取出槽中的所有任务 (断开链接), 槽被清空
+        """
+        tasks = []
+        task = self.head
+        while task is not None:
+            next = task._next
+            task._prev = task._next = task._slot = None
+            tasks.append(task)
+            task = next
+        self.head = self.tail = None
+        self.size = 0
+        return tasks
+
+    def __iter__(self):
+        task = self.head
+        while task is not None:
+            yield task
+            task = task._next
 
     def __len__(self):
-        return len(self.tasks)
+        return self.size
 
 
-class WheelCore:
-    def __init__(self, slots: int, granularity_ms: int):
-        self.slots: list[Slot] = [Slot() for i in range(slots)]  # 创建 slots 个槽
-        self.granularity_ms = granularity_ms or 1000
-        self.current_slot = 0
-        self.last_update_time = None
-        self.cancel_tasks = set()
+class WheelBase:
+    """
+    分层时间轮 (Varghese-Lauck)
 
-    def add_task(self, task: TaskData):
-        ticks = task.delay // self.granularity_ms
-        slot = (self.current_slot + ticks) % len(self)
-        task.round = ticks // len(self)
+    slots 为整数时是单层时间轮; 为序列时, 第 i 层的每个槽覆盖前 i 层的全部刻度,
+    例如 granularity_ms=1, slots=(1000, 60, 60, 24) 对应毫秒/秒/分钟/小时四层。
+    任务按到期刻度放入能容纳它的最低一层, 时间推进到高层槽的边界时, 该槽中的任务被重新放入
+    (逐层下沉), 最终在第 0 层到期执行。超出最高层范围的任务在最高层轮转, 直到进入范围。
+    加入和到期都是 O(1), 延迟不要求能被粒度整除。
 
-        self.slots[slot].push(task)
+    WheelBase 只负责层级、刻度与非空槽位图, 任务的存储由子类实现 (_cascade / _expire)。
+    到期回调的执行方式由 dispatcher 决定 (见 dispatch 模块), 为 None 时在推进线程中逐个执行。
+    """
 
-    def process_slot(self, slot: Slot):
-        errors = []
-        count = 0
-        length = len(slot)
-        while count < length:
-            task = slot.pop()  # 获取一个任务
-
-            if task.id in self.cancel_tasks or not task.is_vaild:
-                self.cancel_tasks.remove(task.id)
-                length -= 1  # 减去一个任务
-                continue
-
-            if task.activity:
-                if task.is_expired:
-                    # Run task
-                    try:
-                        task()
-                    except Exception as e:
-                        errors.append(e)
-
-                    if task.type == TaskType.cycle:
-                        task.start_time = get_current_ms()  # 重新设置开始时间
-                        slot.push(task)
+    def __init__(self, slots: int | Sequence[int], granularity_ms: int, clock: Callable[[], int] = get_current_ms,
+                 dispatcher=None):
+        self.dispatcher = dispatcher
+        self.levels = [slots] if isinstance(slots, int) else list(slots)
+        self.granularity_ms = granularity_ms or 1000
+        self.clock = clock
 
-                else:
-                    slot.push(task)  # 未超时的任务重新加入槽
-            # else:
-            # 暂停的任务不处理
+        self.units = [1]  # 每层一个槽对应的基本刻度数
+        for n in self.levels[:-1]:
+            self.units.append(self.units[-1] * n)
 
-            count += 1  # 记得统计处理次数
+        self.occupied = [0] * len(self.levels)  # 每层一个位图, 第 j 位表示第 j 个槽非空
+        self.current_tick = clock() // self.granularity_ms  # 已经处理到的刻度
+        self.last_update_time = self.current_tick * self.granularity_ms
 
-        return errors
+    @property
+    def current_slot(self):
+        return self.current_tick % self.levels[0]
+
+    def _locate(self, deadline: int, earliest: int = None) -> tuple[int, int]:
+        """
+        返回截止时间 deadline (毫秒) 对应的 (层, 槽)
+        earliest 为还未处理的最早刻度, 已经到期的任务放到这个刻度执行
+        """
+        if earliest is None:
+            earliest = self.current_tick + 1
+        expire = max(-(-deadline // self.granularity_ms), earliest)  # 向上取整, 不会提前执行
+        delta = expire - self.current_tick
+
+        level = len(self.levels) - 1
+        for i, unit in enumerate(self.units):
+            if delta < unit * self.levels[i]:
+                level = i
+                break
+
+        return level, (expire // self.units[level]) % self.levels[level]
+
+    def next_tick(self) -> int | None:
+        """
+        下一个需要处理的刻度 (第 0 层的非空槽到期, 或高层的非空槽需要下沉), 没有任务时返回 None
+        通过每层的位图直接定位, 不需要逐槽扫描
+        """
+        best = None
+        for level, bits in enumerate(self.occupied):
+            if not bits:
+                continue
+            n, unit = self.levels[level], self.units[level]
+            boundary = (self.current_tick // unit + 1) * unit  # 该层下一次被处理的刻度
+            start = (boundary // unit) % n
+            rotated = ((bits >> start) | (bits << (n - start))) & ((1 << n) - 1)
+            tick = boundary + ((rotated & -rotated).bit_length() - 1) * unit
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def next_deadline(self) -> int | None:
+        """
+        下一个需要推进时间轮的时刻 (毫秒, 与 clock 同一时间基准)
+        """
+        tick = self.next_tick()
+        return None if tick is None else tick * self.granularity_ms
+
+    def _cascade(self, tick: int):
+        raise NotImplementedError
+
+    def _expire(self, tick: int) -> list[Exception]:
+        raise NotImplementedError
 
     def advance(self):
-        current_time = get_current_ms()
-        # 计算需要推进的槽数
-        ticks = (current_time - self.last_update_time) // self.granularity_ms
+        current_time = self.clock()
+        # 直接跳到下一个有任务的刻度: 先下沉高层的任务, 再执行第 0 层的槽
+        target = current_time // self.granularity_ms
         total_errors = []
 
-        for i in range(ticks):
-            index = (self.current_slot + i) % len(self)
-            errors = self.process_slot(self.slots[index])
-            total_errors.extend(errors)
+        while (tick := self.next_tick()) is not None and tick <= target:
+            self.current_tick = tick
+            self._cascade(tick)
+            total_errors.extend(self._expire(tick))
+        if self.dispatcher is not None:
+            total_errors.extend(self.dispatcher.collect())  # 异步执行的回调在此期间抛出的异常
 
+        self.current_tick = max(self.current_tick, target)
         self.last_update_time = current_time
 
         if total_errors:
             raise MultiError(*total_errors)  # 一次性抛出所有错误
 
     def __len__(self):
-        return len(self.slots)
+        return self.levels[0]
+
+
+class WheelCore(WheelBase):
+    """
+    以 TaskData 对象为任务的时间轮, 每个槽是一个侵入式链表
+    """
+
+    def __init__(self, slots: int | Sequence[int], granularity_ms: int, clock: Callable[[], int] = get_current_ms,
+                 dispatcher=None):
+        super().__init__(slots, granularity_ms, clock, dispatcher)
+        self.wheels = [
+            [Slot(level, index) for index in range(n)] for level, n in enumerate(self.levels)
+        ]  # type: list[list[Slot]]
+        self.slots = self.wheels[0]
+        self.tasks_by_id = {}  # type: dict[str, TaskData]
+
+    def _expire_tick(self, task: TaskData):
+        return -(-task.deadline // self.granularity_ms)
+
+    def _place(self, task: TaskData, earliest: int = None):
+        level, index = self._locate(task.deadline, earliest)
+        self.wheels[level][index].push(task)
+        self.occupied[level] |= 1 << index
+
+    def _take(self, level, index):
+        self.occupied[level] &= ~(1 << index)
+        return self.wheels[level][index].take()
+
+    def _unlink(self, task: TaskData):
+        slot = task._slot
+        if slot is not None:
+            slot.remove(task)
+            if not slot.size:
+                self.occupied[slot.level] &= ~(1 << slot.index)
+
+    def _forget(self, task: TaskData):
+        if task.id is not None and self.tasks_by_id.get(task.id) is task:
+            del self.tasks_by_id[task.id]
+
+    def add_task(self, task: TaskData):
+        if task.id is not None:
+            self.tasks_by_id[task.id] = task
+        if task.activity:
+            self._place(task)
+        else:
+            task.remaining = task.delay
+
+    def remove(self, task: TaskData):
+        """
+        取消任务并立即从槽中移除, O(1)
+        """
+        self._unlink(task)
+        self._forget(task)
+        task.is_vaild = False
+        task.remaining = None
+
+    def cancel(self, task_id):
+        if (task := self.tasks_by_id.get(task_id)) is not None:
+            self.remove(task)
+
+    def pause(self, task: TaskData):
+        """
+        暂停任务: 从槽中移除并记录剩余时间
+        """
+        if not task.activity:
+            return
+        task.activity = False
+        if task._slot is not None:
+            self._unlink(task)
+            task.remaining = max(0, task.deadline - self.clock())
+
+    def resume(self, task: TaskData):
+        """
+        恢复任务, 剩余时间从现在开始重新计算
+        """
+        if task.activity:
+            return
+        task.activity = True
+        if task.remaining is not None and task.is_vaild:
+            task.start_time = self.clock() - task.delay + task.remaining
+            task.remaining = None
+            self._place(task)
+
+    def reschedule(self, task: TaskData, delay: int = None, restart=True):
+        """
+        原地移动任务, 不分配新对象: 修改延迟 (delay 不为 None 时),
+        restart 为 True 时从现在开始重新计时; 已取消或已执行的任务会被重新加入
+        """
+        self._unlink(task)
+        if delay is not None:
+            task.delay = delay
+        if restart:
+            task.start_time = self.clock()
+        task.is_vaild = True
+        if task.id is not None:
+            self.tasks_by_id[task.id] = task
+
+        if task.activity:
+            task.remaining = None
+            self._place(task)
+        else:
+            task.remaining = max(0, task.deadline - self.clock())
+
+    def _cascade(self, tick):
+        # 从高层到低层依次下沉, 同一刻度内可以跨越多层
+        for level in range(len(self.levels) - 1, 0, -1):
+            unit = self.units[level]
+            if tick % unit:
+                continue
+            for task in self._take(level, (tick // unit) % self.levels[level]):
+                self._place(task, tick)
+
+    def _due_calls(self, slot: Slot, tick: int) -> list[tuple]:
+        """
+        取出槽中到期的任务, 先完成它们的状态更新 (周期任务重新放入, 单次任务移除), 再返回待派发的调用
+        """
+        calls = []
+        for task in self._take(slot.level, slot.index):
+            if not task.is_vaild:
+                continue
+            if not task.activity:
+                if task.remaining is None:
+                    task.remaining = max(0, task.deadline - self.clock())
+                continue
+            if self._expire_tick(task) > tick:
+                self._place(task)
+                continue
+
+            calls.append((task.callback, task.args, task.kwargs))
+            if task.type == TaskType.cycle:
+                task.start_time = self.clock()
+                self._place(task)
+            else:
+                self._forget(task)
+        return calls
+
+    def process_slot(self, slot: Slot, tick: int = None):
+        if tick is None:
+            tick = self.current_tick
+
+        dispatcher = self.dispatcher
+        if dispatcher is not None and not dispatcher.inline:
+            return dispatcher.dispatch(self._due_calls(slot, tick))
+
+        errors = []
+        for task in self._take(slot.level, slot.index):
+            if task._slot is not None or not task.is_vaild:
+                continue  # 被前面的回调移动或取消
+            if not task.activity:  # 被前面的回调暂停, 此时它已不在槽中
+                if task.remaining is None:
+                    task.remaining = max(0, task.deadline - self.clock())
+                continue
+
+            if self._expire_tick(task) > tick:
+                self._place(task)  # 未到期 (超出最高层范围) 的任务重新放入
+                continue
+
+            # Run task
+            try:
+                task()
+            except Exception as e:
+                errors.append(e)
+
+            if task._slot is not None or not task.activity:
+                continue  # 回调中调用了 reset / pause
+            if task.type == TaskType.cycle and task.is_vaild:
+                task.start_time = self.clock()  # 重新设置开始时间
+                self._place(task)
+            else:
+                self._forget(task)
+
+        return errors
+
+    def _expire(self, tick):
+        return self.process_slot(self.slots[tick % self.levels[0]], tick)
@@ -0,0 +1,229 @@
+import asyncio
+import collections
+import inspect
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable
+
+from .core import MultiError
+
+type Call = tuple[Callable, tuple, dict]
+
+
+def call_key(call: Call):
+    """
+    一次调用对应的 key: 只有一个位置参数时是这个参数, 否则是参数元组
+    """
+    _, args, _ = call
+    return args[0] if len(args) == 1 else args
+
+
+class Dispatcher:
+    """
+    到期回调的派发策略
+
+    时间轮在每个刻度把到期任务的状态 (周期任务重新放入 / 单次任务移除) 处理完之后,
+    把这一刻度的全部调用 [(callback, args, kwargs), ...] 交给 dispatch。
+    dispatch 返回同步产生的异常; 异步执行的回调抛出的异常暂存起来, 由 collect 取出,
+    WheelBase.advance 在每次推进结束时把两者一起汇总为 MultiError。
+    """
+    inline = False  # 为 True 时时间轮逐个执行回调, 回调中对其他任务的修改在同一刻度内立即生效
+
+    def dispatch(self, calls: list[Call]) -> list[Exception]:
+        raise NotImplementedError
+
+    def collect(self) -> list[Exception]:
+        """
+        取出上次调用以来异步回调抛出的异常
+        """
+        return []
+
+
+class InlineDispatcher(Dispatcher):
+    """
+    在推进时间轮的线程中依次执行回调 (默认)
+    """
+    inline = True
+
+    def dispatch(self, calls):
+        errors = []
+        for callback, args, kwargs in calls:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+
+class ExecutorDispatcher(Dispatcher):
+    """
+    把回调提交到线程池执行, 慢回调不会拖慢时间轮
+
+    max_in_flight 限制同时在执行器中的回调数, 超出的调用在本地排队, 有回调完成时再提交;
+    推进时间轮的线程永远不会因此阻塞 (回调中可以安全地通过驱动器加入任务)。
+    """
+
+    def __init__(self, executor: Executor = None, max_workers: int = None, max_in_flight: int = None):
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers, thread_name_prefix='timer-wheel')
+        self.max_in_flight = max_in_flight
+        self._lock = threading.RLock()  # 已完成的 future 会在 add_done_callback 中同步回调
+        self._idle = threading.Condition(self._lock)
+        self._backlog = collections.deque()  # type: collections.deque[Call]
+        self._in_flight = 0
+        self._pumping = False
+        self._errors = []
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def backlog(self) -> int:
+        return len(self._backlog)
+
+    def dispatch(self, calls):
+        with self._lock:
+            self._backlog.extend(calls)
+            self._pump()
+        return []
+
+    def _pump(self):
+        with self._lock:
+            if self._pumping:
+                return  # 由外层的循环继续提交
+            self._pumping = True
+            try:
+                limit = self.max_in_flight
+                while self._backlog and (limit is None or self._in_flight < limit):
+                    callback, args, kwargs = self._backlog.popleft()
+                    try:
+                        future = self.executor.submit(callback, *args, **kwargs)
+                    except Exception as e:  # 例如执行器已关闭
+                        self._errors.append(e)
+                        continue
+                    self._in_flight += 1
+                    future.add_done_callback(self._done)
+            finally:
+                self._pumping = False
+            if not self._in_flight and not self._backlog:
+                self._idle.notify_all()
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled() and (e := future.exception()) is not None:
+                self._errors.append(e)
+            self._pump()
+
+    def collect(self):
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def join(self, timeout: float = None):
+        """
+        等待所有已派发的回调执行完, 期间的异常汇总为 MultiError 抛出
+        :return: 是否在超时前全部完成
+        """
+        with self._idle:
+            done = self._idle.wait_for(lambda: not self._in_flight and not self._backlog, timeout)
+        if errors := self.collect():
+            raise MultiError(*errors)
+        return done
+
+    def shutdown(self, wait=True):
+        """
+        丢弃排队中的调用; 执行器由本对象创建时将其关闭
+        """
+        with self._lock:
+            self._backlog.clear()
+        if self._owns_executor:
+            self.executor.shutdown(wait)
+
+
+class AsyncioDispatcher(Dispatcher):
+    """
+    在 asyncio 事件循环中派发回调: 回调返回可等待对象 (协程函数) 时将其作为 Task 调度,
+    普通回调直接执行。可以在其他线程中推进时间轮, 此时 Task 通过 call_soon_threadsafe 创建。
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self._tasks = set()  # type: set[asyncio.Future]  # 保持引用, 避免 Task 被回收
+        self._lock = threading.Lock()
+        self._errors = []
+
+    def _in_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def dispatch(self, calls):
+        errors = []
+        in_loop = self._in_loop_thread()
+        for callback, args, kwargs in calls:
+            try:
+                result = callback(*args, **kwargs)
+            except Exception as e:
+                errors.append(e)
+                continue
+            if inspect.isawaitable(result):
+                if in_loop:
+                    self._schedule(result)
+                else:
+                    self.loop.call_soon_threadsafe(self._schedule, result)
+        return errors
+
+    def _schedule(self, awaitable):
+        task = asyncio.ensure_future(awaitable, loop=self.loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            with self._lock:
+                self._errors.append(e)
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def collect(self):
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    async def join(self):
+        """
+        等待所有已调度的 Task 完成, 期间的异常汇总为 MultiError 抛出
+        """
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if errors := self.collect():
+            raise MultiError(*errors)
+
+    def cancel(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+
+class BatchDispatcher(Dispatcher):
+    """
+    每个刻度只调用一次 handler(keys), keys 为这一刻度到期的全部 key (见 call_key), 各任务自身的回调不会被调用
+    适合同一类大量定时器 (例如会话过期) 需要批量处理的场景
+    """
+
+    def __init__(self, handler: Callable[[list], object]):
+        self.handler = handler
+
+    def dispatch(self, calls):
+        if not calls:
+            return []
+        try:
+            self.handler([call_key(call) for call in calls])
+        except Exception as e:
+            return [e]
+        return []
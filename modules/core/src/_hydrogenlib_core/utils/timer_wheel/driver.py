@@ -0,0 +1,187 @@
+import asyncio
+import threading
+import traceback
+
+from .core import MultiError
+from .wheel import Wheel
+
+
+class WheelDriver:
+    """
+    时间轮驱动器的基类: 代替调用方轮询 Wheel.advance, 只在下一个非空槽到期时推进
+
+    add_task / cancel 可以在任意线程调用, 对时间轮的所有访问都在同一把锁内进行。
+    回调抛出的异常汇总为 MultiError 后交给 on_error (默认打印到 stderr)。
+    """
+
+    def __init__(self, wheel: Wheel, on_error=None):
+        self.wheel = wheel
+        self.on_error = on_error
+        self._lock = threading.RLock()  # 回调中可以再加入任务
+        self._armed = None  # 当前等待的推进时刻 (毫秒), None 表示没有等待
+
+    def add_task(self, callback, args=(), kwargs=None, delay=None, id=None, cycle=False):
+        with self._lock:
+            task = self.wheel.add_task(callback, args, kwargs, delay, id, cycle)
+        armed = self._armed
+        if armed is None or task.start_time + task.delay() < armed:  # 只有更早的任务才需要重新等待
+            self._rearm()
+        return task
+
+    def cancel(self, id):
+        with self._lock:
+            self.wheel.cancel(id)
+
+    def reset(self, task, delay=None):
+        """
+        线程安全地调用 task.reset
+        """
+        with self._lock:
+            task.reset(delay)
+        armed = self._armed
+        if armed is None or task.start_time + task.delay() < armed:
+            self._rearm()
+
+    def _advance(self):
+        with self._lock:
+            try:
+                self.wheel.advance()
+            except MultiError as e:
+                self._report(e)
+
+    def _report(self, error: MultiError):
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            traceback.print_exception(error)
+
+    def _next_delay(self) -> float | None:
+        """
+        距离下一次推进的秒数, 没有任务时返回 None
+        """
+        with self._lock:
+            deadline = self._armed = self.wheel.core.next_deadline()
+            if deadline is None:
+                return None
+            return max(0, deadline - self.wheel.core.clock()) / 1000
+
+    def _rearm(self):
+        raise NotImplementedError
+
+
+class ThreadWheelDriver(WheelDriver):
+    """
+    在独立线程中驱动时间轮, 线程在条件变量上等待到下一个非空槽的到期时间
+    """
+
+    def __init__(self, wheel: Wheel, on_error=None, name=None, daemon=True):
+        super().__init__(wheel, on_error)
+        self._wakeup = threading.Condition(threading.Lock())
+        self._changed = False
+        self._running = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=daemon)
+
+    def start(self):
+        self._running = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _rearm(self):
+        with self._wakeup:
+            self._changed = True
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if not self._running:
+                    return
+                if not self._changed:
+                    self._wakeup.wait(self._next_delay())
+                self._changed = False
+                self._armed = None
+                if not self._running:
+                    return
+            self._advance()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class AsyncioWheelDriver(WheelDriver):
+    """
+    在 asyncio 事件循环中驱动时间轮, 始终只保留一个指向下一个非空槽的 loop.call_at 句柄
+    可以代替大量的 loop.call_later 句柄; 在其他线程中加入任务时通过 call_soon_threadsafe 重新设置句柄
+    创建时已在时间轮中的任务同样会被驱动; 绕过驱动器直接调用 task.reset 后需要调用 rearm (或改用 driver.reset)
+    """
+
+    def __init__(self, wheel: Wheel, loop: asyncio.AbstractEventLoop = None, on_error=None):
+        super().__init__(wheel, on_error)
+        self.loop = loop or asyncio.get_running_loop()
+        self._handle = None  # type: asyncio.TimerHandle | None
+        self._closed = False
+        self.loop.call_soon_threadsafe(self._arm)  # 驱动创建前已经加入的任务
+
+    def _report(self, error: MultiError):
+        if self.on_error is not None:
+            self.on_error(error)
+        else:
+            self.loop.call_exception_handler({
+                'message': 'timer wheel callbacks raised exceptions',
+                'exception': error,
+            })
+
+    def _in_loop_thread(self):
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def rearm(self):
+        """
+        按时间轮当前的状态重新设置句柄, 可以在任意线程调用
+        """
+        self._rearm()
+
+    def _rearm(self):
+        if self._in_loop_thread():
+            self._arm()
+        else:
+            self.loop.call_soon_threadsafe(self._arm)
+
+    def _arm(self):
+        if self._closed:
+            return
+        delay = self._next_delay()
+        if delay is None:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+            return
+
+        when = self.loop.time() + delay
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.loop.call_at(when, self._fire)
+
+    def _fire(self):
+        self._handle = None
+        self._armed = None
+        self._advance()
+        self._arm()
+
+    def close(self):
+        self._closed = True
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
@@ -1,33 +1,57 @@
+import dataclasses as dc
 from copy import deepcopy
 
-from .core import TaskData, TaskType
+from .core import TaskData, TaskType, WheelCore
 
 
 class Task:
-    def __init__(self, task_data: TaskData):
+    __slots__ = ('_data', '_core')
+
+    def __init__(self, task_data: TaskData, core: WheelCore = None):
         self._data = task_data
+        self._core = core
 
     @property
     def id(self):
         return self._data.id
 
     def activity(self, activity: bool = None):
-        if activity is not None:
+        """
+        暂停 (False) / 恢复 (True) 任务, 暂停的任务立即离开时间轮, 恢复时按剩余时间重新加入
+        """
+        if activity is None:
+            return self._data.activity
+        if self._core is None:
             self._data.activity = activity
+        elif activity:
+            self._core.resume(self._data)
         else:
-            return self._data.activity
+            self._core.pause(self._data)
 
     def cancel(self):
-        self._data.is_vaild = False
+        if self._core is None:
+            self._data.is_vaild = False
+        else:
+            self._core.remove(self._data)
 
     def is_canceled(self):
-        return self._data.is_vaild
+        return not self._data.is_vaild
 
     def delay(self, delay: int = None):
-        if delay is not None:
+        if delay is None:
+            return self._data.delay
+        if self._core is None or self._data._slot is None:
             self._data.delay = delay
         else:
-            return self._data.delay
+            self._core.reschedule(self._data, delay, restart=False)
+
+    def reset(self, delay: int = None):
+        """
+        从现在开始重新计时 (可同时修改延迟), 原地移动任务, 不分配新对象
+        """
+        if self._core is None:
+            raise RuntimeError("task is not attached to a wheel")
+        self._core.reschedule(self._data, delay)
 
     @property
     def start_time(self):
@@ -40,4 +64,4 @@ class Task:
             return self._data.type
 
     def export(self):
-        return deepcopy(self._data)
+        return deepcopy(dc.replace(self._data))  # 不复制链表指针
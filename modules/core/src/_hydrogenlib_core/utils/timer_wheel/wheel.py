@@ -1,43 +1,108 @@
 import warnings
+from typing import Sequence
 
+from .compact import CompactTask, CompactWheelCore
 from .core import get_current_ms, TaskType, TaskData, WheelCore
+from .dispatch import Dispatcher
 from .task import Task
 
 
 class Wheel:
     @property
     def current_slot(self):
-        return self.current_slot
+        return self.core.current_slot
 
     @property
     def slots_length(self):
         return len(self.core)
 
-    def __init__(self, slots: int, granularity_ms: int):
-        self.core = WheelCore(slots, granularity_ms)
+    def __init__(self, slots: int | Sequence[int], granularity_ms: int, storage: str = 'object',
+                 dispatcher: Dispatcher = None):
+        """
+        :param storage: 'object' 每个任务一个 TaskData 对象;
+                        'compact' 使用结构数组存储 (CompactWheelCore), 适合上百万个定时器
+        :param dispatcher: 到期回调的派发策略 (InlineDispatcher / ExecutorDispatcher / AsyncioDispatcher / BatchDispatcher),
+                           默认在推进线程中逐个执行
+        """
+        match storage:
+            case 'object':
+                self.core = WheelCore(slots, granularity_ms, dispatcher=dispatcher)
+            case 'compact':
+                self.core = CompactWheelCore(slots, granularity_ms, dispatcher=dispatcher)
+            case _:
+                raise ValueError(f"Unknown storage {storage!r}")
+
+    @property
+    def compact(self) -> bool:
+        return isinstance(self.core, CompactWheelCore)
 
     def add_task(self, callback, args=(), kwargs=None, delay=None, id=None, cycle=False):
+        if self.compact:
+            if kwargs:
+                raise TypeError("compact storage does not support kwargs")
+            if len(args) == 1:
+                handle = self.core.add(callback, args[0], delay or 0, cycle, id)
+            else:
+                handle = self.core.add(callback, tuple(args), delay or 0, cycle, id, star=True)
+            return CompactTask(self.core, handle, id)
+
         if kwargs is None:
             kwargs = {}
 
         data = TaskData(
             callback, args, kwargs,
             id,
-            get_current_ms(), delay,
+            self.core.clock(), delay or 0,
             True, 0,
             TaskType.cycle if cycle else TaskType.single
         )
         self.core.add_task(
             data
         )
-        return Task(data)
+        return Task(data, self.core)
+
+    def add_keyed(self, callback, key, delay=0, cycle=False, id=None):
+        """
+        加入到期时调用 callback(key) 的任务
+        compact 存储下不创建任何包装对象, 直接返回整数句柄 (用于 core.remove / core.reschedule);
+        object 存储下返回 Task
+        """
+        if self.compact:
+            return self.core.add(callback, key, delay, cycle, id)
+        return self.add_task(callback, (key,), delay=delay, id=id, cycle=cycle)
+
+    def cancel(self, id):
+        self.core.cancel(id)
 
     def advance(self):
         self.core.advance()
 
+    def next_deadline(self):
+        return self.core.next_deadline()
+
+    @property
+    def dispatcher(self):
+        return self.core.dispatcher
+
+
+class HierarchicalWheel(Wheel):
+    """
+    分层时间轮, 默认为 毫秒 / 秒 / 分钟 / 小时 / 天 五层, 覆盖 1ms 到 30 天的延迟,
+    更长的延迟在最高层轮转
+    """
+
+    def __init__(self, levels: Sequence[int] = (1000, 60, 60, 24, 30), granularity_ms: int = 1, storage='object',
+                 dispatcher: Dispatcher = None):
+        super().__init__(levels, granularity_ms, storage, dispatcher)
+
 
 class MultiWheel:
+    """
+    已弃用, 请使用 HierarchicalWheel: 一个分层时间轮即可按最小粒度处理任意延迟, 不需要按粒度挑选时间轮
+    """
+
     def __init__(self, *wheels):
+        warnings.warn("MultiWheel is deprecated, use HierarchicalWheel instead", DeprecationWarning, stacklevel=2)
         self.wheels = sorted(wheels, key=lambda w: w.core.granularity_ms)  # 按粒度排序(升序)
 
     def add_task(self, callback, args=(), kwargs=None, delay=None, id=None, cycle=False):
@@ -0,0 +1,29 @@
+from graphlib import CycleError
+
+import pytest
+
+from _hydrogenlib_core.data_structures.graph import GraphBase
+
+
+def test_would_create_cycle_does_not_add_vertices():
+    graph = GraphBase()
+    order = graph.enable_incremental_order()
+    graph.add_edge(1, 2)
+
+    assert order.would_create_cycle(2, 1)
+    assert not order.would_create_cycle(1, 99)
+    assert not order.would_create_cycle(99, 100)
+    assert order.would_create_cycle(99, 99)
+
+    assert sorted(order.order()) == sorted(graph.graph) == [1, 2]
+
+
+def test_rejected_self_loop_leaves_graph_unchanged():
+    graph = GraphBase()
+    order = graph.enable_incremental_order()
+    graph.add_edge(1, 2)
+
+    with pytest.raises(CycleError):
+        graph.add_edge('x', 'x')
+
+    assert sorted(order.order()) == sorted(graph.graph) == [1, 2]
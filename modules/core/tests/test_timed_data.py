@@ -0,0 +1,39 @@
+import time
+
+import pytest
+
+from _hydrogenlib_core.utils.timed_data import TimedDataManager, timed_memoize
+
+
+def test_expired_key_raises_key_error():
+    manager = TimedDataManager(timeout=0.01)
+    manager.add('a', 1)
+    time.sleep(0.02)
+
+    with pytest.raises(KeyError):
+        manager.get('a')
+    with pytest.raises(KeyError):
+        manager.get_threadsafe('a')
+    assert 'a' not in manager.data
+
+
+def test_cache_ttl_zero_is_not_cached():
+    calls = []
+
+    @timed_memoize(timeout=60)
+    def f(x):
+        calls.append(x)
+        return x
+
+    f(1, cache_ttl=0)
+    f(1, cache_ttl=0)
+    assert calls == [1, 1]
+    f(1)
+    f(1)
+    assert calls == [1, 1, 1]
+
+
+def test_add_with_zero_timeout_is_not_replaced_by_default():
+    manager = TimedDataManager(timeout=60)
+    manager.add('a', 1, timeout=0)
+    assert manager.data['a'].deadline == manager.data['a'].time
@@ -0,0 +1,58 @@
+import asyncio
+
+from _hydrogenlib_core.utils.timer_wheel import AsyncioWheelDriver, CompactWheelCore, Wheel
+
+
+def make_wheel():
+    now = [0]
+    wheel = Wheel(16, 10, storage='compact')
+    wheel.core = CompactWheelCore(16, 10, clock=lambda: now[0])
+    return wheel, now
+
+
+def test_compact_task_reset_after_fire():
+    wheel, now = make_wheel()
+    fired = []
+    task = wheel.add_task(fired.append, ('a',), delay=30)
+
+    now[0] = 40
+    wheel.advance()
+    assert fired == ['a'] and task.is_canceled()
+
+    other = wheel.add_task(fired.append, ('b',), delay=500)  # 复用已释放的行
+    assert task.delay() == 30 and other.delay() == 500
+
+    task.reset()
+    assert not task.is_canceled()
+    now[0] = 80
+    wheel.advance()
+    assert fired == ['a', 'a']
+
+
+def test_compact_task_delay_keeps_elapsed_time():
+    wheel, now = make_wheel()
+    fired = []
+    task = wheel.add_task(fired.append, ('a',), delay=100)
+    now[0] = 40
+    wheel.advance()
+    task.delay(60)
+    assert wheel.core.remaining(task.handle) == 20
+    assert task.start_time == 0
+
+
+def test_asyncio_driver_fires_tasks_added_before_it():
+    async def main():
+        wheel = Wheel(16, 10, storage='compact')
+        fired = []
+        task = wheel.add_task(fired.append, ('a',), delay=20)
+        driver = AsyncioWheelDriver(wheel)
+        await asyncio.sleep(0.1)
+        assert fired == ['a']
+
+        task.reset()  # 绕过驱动器, 之后需要 rearm
+        driver.rearm()
+        await asyncio.sleep(0.1)
+        assert fired == ['a', 'a']
+        driver.close()
+
+    asyncio.run(main())
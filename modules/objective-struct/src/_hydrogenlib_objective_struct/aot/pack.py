@@ -12,6 +12,8 @@ if typing.TYPE_CHECKING:
 def create_pack_methods(cls: struct_type.Struct):
     """
     Generate `pack` and `pack_into` method
+    `pack_into` returns the offset just past the packed data, so a caller holding one buffer
+    (e.g. a BufferLease) can pack repeatedly without allocating
     """
     with (
         function_def('pack(self)') as pack,
@@ -51,6 +53,7 @@ def create_pack_methods(cls: struct_type.Struct):
         expression = to_tuple_expression(flat_fields, prefix='')
         pack.add_return(f"xpack({expression})")  # 返回打包的结果，将所有字段参数展开传递
         pack_into.add_code(f"xpack_into(buffer, offset, {expression})")
+        pack_into.add_return(f"offset + {cls.__cstruct__.size}")
         # print(pack.generate_code())  # Debug
         return (
             pack.exec({'xpack': cls.__cstruct__.pack, 'array': array.array}),
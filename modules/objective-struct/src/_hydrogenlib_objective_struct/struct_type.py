@@ -23,7 +23,11 @@ class Struct(CType):
     def pack(self) -> bytes:
         ...
 
-    def pack_into(self, buffer: Buffer, offset=0) -> None:
+    def pack_into(self, buffer: Buffer, offset=0) -> int:
+        """
+        打包到 buffer 的 offset 处, 返回打包后的结束位置
+        buffer 可以是一直持有的 BufferLease 或它的 view (更快), 反复打包时不分配新的缓冲区
+        """
         ...
 
     @classmethod